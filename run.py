@@ -14,7 +14,7 @@ sys.stdout.reconfigure(line_buffering=True) if hasattr(sys.stdout, 'reconfigure'
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.app import app, load_config, iniciar_monitoramento_automatico
+from src.app import app, load_config, iniciar_monitoramento_automatico, servir
 
 if __name__ == '__main__':
     # Configura logging para exibir informações do Flask
@@ -40,13 +40,5 @@ if __name__ == '__main__':
     print("=" * 80, flush=True)
     print("", flush=True)
 
-    # Inicia o monitoramento automaticamente ao iniciar a aplicação
-    iniciar_monitoramento_automatico()
-
-    app.run(
-        host=config['servidor_host'],
-        port=config['servidor_porta'],
-        debug=False,
-        threaded=True,
-        use_reloader=False  # Desabilita reloader para evitar duplicação de logs
-    )
+    # Inicia o monitoramento assim que o socket do servidor estiver aberto
+    servir(config['servidor_host'], config['servidor_porta'], ao_iniciar=iniciar_monitoramento_automatico)
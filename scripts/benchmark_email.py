@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Envio de Notificações
+Mede a vazão do EmailNotifier contra um servidor SMTP local (sem provedor real)
+
+Uso:
+    python3 scripts/benchmark_email.py
+    python3 scripts/benchmark_email.py --inscritos 10,1000,50000 --conexoes 4 --modo bcc
+    python3 scripts/benchmark_email.py --latencia-ms 5 --taxa-falha 0.01 --json resultados.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.email_notifier import EmailNotifier, SessaoSMTP
+from smtp_local import ServidorSMTPLocal
+
+
+class _MedidorLatencia:
+    """Envolve SessaoSMTP.enviar para registrar a latência de cada mensagem"""
+
+    def __init__(self):
+        self.latencias = []
+        self._lock = threading.Lock()
+        self._original = SessaoSMTP.enviar
+
+    def __enter__(self):
+        medidor = self
+        original = self._original
+
+        def enviar_medido(sessao, destinatarios, dados):
+            inicio = time.perf_counter()
+            try:
+                return original(sessao, destinatarios, dados)
+            finally:
+                duracao = time.perf_counter() - inicio
+                with medidor._lock:
+                    medidor.latencias.append(duracao)
+
+        SessaoSMTP.enviar = enviar_medido
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        SessaoSMTP.enviar = self._original
+        return False
+
+
+def percentil(valores, p: float) -> float:
+    """Percentil por ordenação (valores em segundos)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def executar_cenario(smtp: ServidorSMTPLocal, inscritos: int, config_extra: dict) -> dict:
+    """Executa um fan-out para `inscritos` destinatários sintéticos e coleta métricas"""
+    notifier = EmailNotifier({
+        'enabled': True,
+        'smtp_server': smtp.host,
+        'smtp_port': smtp.porta,
+        'from_email': 'monitor@benchmark.local',
+        'use_tls': False,
+        **config_extra
+    })
+    destinatarios = [f"inscrito{i}@benchmark.local" for i in range(inscritos)]
+    conteudo_resumo = "Resultado preliminar da seleção " * 10
+
+    smtp.zerar_contadores()
+    tracemalloc.start()
+    with _MedidorLatencia() as medidor:
+        inicio = time.perf_counter()
+        resultados = notifier.enviar_alerta_detalhado(
+            'https://exemplo.com/edital', ['resultado', 'classificados'], True,
+            destinatarios, conteudo_resumo
+        )
+        duracao = time.perf_counter() - inicio
+    _, pico_python = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    enviados = sum(1 for r in resultados.values() if r['enviado'])
+    return {
+        'inscritos': inscritos,
+        'enviados': enviados,
+        'falhas': inscritos - enviados,
+        'duracao_s': round(duracao, 4),
+        'destinatarios_por_s': round(enviados / duracao, 1) if duracao else 0,
+        'mensagens_smtp': smtp.contadores['mensagens'],
+        'mensagens_por_s': round(smtp.contadores['mensagens'] / duracao, 1) if duracao else 0,
+        'latencia_p50_ms': round(percentil(medidor.latencias, 50) * 1000, 3),
+        'latencia_p99_ms': round(percentil(medidor.latencias, 99) * 1000, 3),
+        'latencia_media_ms': round(statistics.fmean(medidor.latencias) * 1000, 3) if medidor.latencias else 0,
+        'conexoes': smtp.contadores['conexoes'],
+        'pico_alocado_python_kib': round(pico_python / 1024, 1),
+        'rss_maximo_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de fan-out do EmailNotifier')
+    parser.add_argument('--inscritos', default='10,100,1000,10000',
+                        help='Lista de tamanhos separados por vírgula (ex: 10,1000,50000)')
+    parser.add_argument('--conexoes', type=int, default=1, help='conexoes_simultaneas do notificador')
+    parser.add_argument('--modo', choices=['individual', 'bcc'], default='individual')
+    parser.add_argument('--por-mensagem', type=int, default=50, help='destinatarios_por_mensagem no modo bcc')
+    parser.add_argument('--max-por-conexao', type=int, default=100, help='max_mensagens_por_conexao')
+    parser.add_argument('--taxa', type=float, default=0, help='max_mensagens_por_segundo (0 = sem limite)')
+    parser.add_argument('--latencia-ms', type=float, default=0, help='Latência do servidor por mensagem')
+    parser.add_argument('--taxa-falha', type=float, default=0, help='Fração de mensagens com 451')
+    parser.add_argument('--taxa-recusa', type=float, default=0, help='Fração de RCPT TO com 550')
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    args = parser.parse_args()
+
+    config_extra = {
+        'conexoes_simultaneas': args.conexoes,
+        'modo_envio': args.modo,
+        'destinatarios_por_mensagem': args.por_mensagem,
+        'max_mensagens_por_conexao': args.max_por_conexao,
+        'max_mensagens_por_segundo': args.taxa
+    }
+    tamanhos = [int(t) for t in args.inscritos.split(',') if t.strip()]
+
+    print("=" * 80)
+    print("BENCHMARK DE NOTIFICAÇÕES POR EMAIL")
+    print("=" * 80)
+    print(f"Configuração: {config_extra}")
+    print(f"Servidor: latência {args.latencia_ms} ms, falha {args.taxa_falha}, recusa {args.taxa_recusa}\n")
+
+    resultados = []
+    with ServidorSMTPLocal(latencia_segundos=args.latencia_ms / 1000, taxa_falha=args.taxa_falha,
+                           taxa_recusa=args.taxa_recusa) as smtp:
+        for inscritos in tamanhos:
+            resultado = executar_cenario(smtp, inscritos, config_extra)
+            resultados.append(resultado)
+            print(f"{inscritos:>7} inscritos | {resultado['destinatarios_por_s']:>9} dest/s | "
+                  f"p50 {resultado['latencia_p50_ms']:>8} ms | p99 {resultado['latencia_p99_ms']:>8} ms | "
+                  f"{resultado['conexoes']:>5} conexões | falhas {resultado['falhas']:>5} | "
+                  f"pico {resultado['pico_alocado_python_kib']:>9} KiB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': config_extra, 'servidor': vars(args), 'resultados': resultados},
+                      f, indent=4, ensure_ascii=False)
+        print(f"\nResultados gravados em {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Extração e Comparação
+Mede cada etapa da análise de uma página (parsing, extração, palavras-chave, hash) sobre um corpus de editais
+
+O corpus tem páginas pequenas salvas em scripts/corpus_editais/ e páginas grandes
+(tabelas de resultado enormes) geradas de forma determinística na primeira execução,
+em scripts/corpus_editais/gerados/ (fora do git). A mesma semente gera sempre o
+mesmo HTML, então resultados de máquinas e versões diferentes são comparáveis.
+
+Uso:
+    python3 scripts/benchmark_extracao.py
+    python3 scripts/benchmark_extracao.py --gerados 2048,20480 --repeticoes 5 --json atual.json
+    python3 scripts/benchmark_extracao.py --json novo.json --comparar atual.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bs4
+import lxml.etree
+
+from src.monitor import MonitorEdital
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_editais')
+GERADOS_DIR = os.path.join(CORPUS_DIR, 'gerados')
+
+PALAVRAS_CHAVE = ['Resultado', 'Homologação', 'Classificados', 'Convocação', 'Retificação', 'Gabarito']
+
+ETAPAS = ('buscar_pagina', 'extrair_conteudo_relevante', 'verificar_palavras_chave', 'verificar_mudancas')
+ROTULOS = {'buscar_pagina': 'parsing', 'extrair_conteudo_relevante': 'extração',
+           'verificar_palavras_chave': 'palavras', 'verificar_mudancas': 'hash'}
+
+_NOMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Heitor', 'Isabela', 'João',
+          'Larissa', 'Marcos', 'Natália', 'Otávio', 'Patrícia', 'Rafael', 'Sabrina', 'Thiago', 'Vitória', 'Wesley']
+_SOBRENOMES = ['Almeida', 'Barbosa', 'Cardoso', 'Duarte', 'Esteves', 'Ferreira', 'Gonçalves', 'Henriques',
+               'Lima', 'Moura', 'Nogueira', 'Oliveira', 'Pereira', 'Queiroz', 'Ribeiro', 'Santos', 'Teixeira']
+_CARGOS = ['Analista Administrativo', 'Técnico em Enfermagem', 'Professor de Matemática', 'Agente Comunitário',
+           'Assistente Social', 'Engenheiro Civil', 'Auxiliar de Serviços Gerais', 'Médico Clínico Geral']
+_SITUACOES = ['Classificado', 'Classificado', 'Classificado', 'Eliminado', 'Ausente', 'Cadastro Reserva']
+
+
+def gerar_pagina_edital(tamanho_bytes: int, semente: int = 2025) -> bytes:
+    """
+    Gera uma página de edital com layout típico (seção principal, cronograma, avisos
+    e tabelas de resultado) crescendo as tabelas até atingir aproximadamente o tamanho pedido
+    """
+    aleatorio = random.Random(semente)
+    partes = [
+        '<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">',
+        '<title>Edital nº 001/2025 - Processo Seletivo Simplificado</title>',
+        '<script>window.dataLayer=window.dataLayer||[];</script></head><body>',
+        '<header><nav><ul>' + ''.join(f'<li><a href="/menu/{i}">Menu {i}</a></li>' for i in range(12)) + '</ul></nav></header>',
+        '<div class="wrapper"><section class="slice"><h1>EDITAL Nº 001/2025</h1>',
+        '<p>A Fundação torna pública a abertura de inscrições para o Processo Seletivo Simplificado '
+        'destinado à contratação temporária de profissionais, nos termos deste edital.</p>',
+        '<h2>Cronograma</h2><table class="cronograma"><tr><th>Etapa</th><th>Data</th></tr>',
+    ]
+    for i, etapa in enumerate(['Inscrições', 'Homologação das inscrições', 'Prova objetiva', 'Gabarito preliminar',
+                               'Resultado preliminar', 'Recursos', 'Resultado final', 'Convocação']):
+        partes.append(f'<tr><td>{etapa}</td><td>{10 + i:02d}/0{1 + i % 9}/2025</td></tr>')
+    partes.append('</table></section>')
+    partes.append('<div class="content"><h3>Avisos</h3><ul>'
+                  + ''.join(f'<li>Aviso {i}: publicação de retificação nº {i}/2025.</li>' for i in range(1, 6))
+                  + '</ul></div>')
+
+    tamanho_atual = sum(len(p.encode('utf-8')) for p in partes)
+    tabela = 0
+    while tamanho_atual < tamanho_bytes:
+        tabela += 1
+        cargo = _CARGOS[tabela % len(_CARGOS)]
+        cabecalho = (f'<h2>Resultado preliminar - {cargo} (lista {tabela})</h2>'
+                     '<table class="resultado"><thead><tr><th>Classificação</th><th>Inscrição</th><th>Nome</th>'
+                     '<th>CPF</th><th>Nota</th><th>Situação</th></tr></thead><tbody>')
+        partes.append(cabecalho)
+        tamanho_atual += len(cabecalho.encode('utf-8'))
+        for posicao in range(1, 2001):
+            nome = f"{aleatorio.choice(_NOMES)} {aleatorio.choice(_SOBRENOMES)} {aleatorio.choice(_SOBRENOMES)}"
+            linha = (f'<tr><td>{posicao}</td><td>{aleatorio.randint(10 ** 7, 10 ** 8 - 1)}</td><td>{nome}</td>'
+                     f'<td>***.{aleatorio.randint(100, 999)}.{aleatorio.randint(100, 999)}-**</td>'
+                     f'<td>{aleatorio.uniform(0, 100):.2f}</td><td>{aleatorio.choice(_SITUACOES)}</td></tr>')
+            partes.append(linha)
+            tamanho_atual += len(linha.encode('utf-8'))
+            if tamanho_atual >= tamanho_bytes:
+                break
+        partes.append('</tbody></table>')
+
+    partes.append('</div><footer><p>Fundação - Todos os direitos reservados</p></footer></body></html>')
+    return ''.join(partes).encode('utf-8')
+
+
+def carregar_corpus(gerados_kib) -> dict:
+    """Páginas salvas + páginas geradas (criadas e guardadas em disco na primeira execução)"""
+    paginas = {}
+    for caminho in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))):
+        with open(caminho, 'rb') as f:
+            paginas[os.path.basename(caminho)] = f.read()
+
+    os.makedirs(GERADOS_DIR, exist_ok=True)
+    for kib in gerados_kib:
+        nome = f'edital_gerado_{kib}kib.html'
+        caminho = os.path.join(GERADOS_DIR, nome)
+        if not os.path.exists(caminho):
+            print(f"Gerando {nome}...")
+            with open(caminho, 'wb') as f:
+                f.write(gerar_pagina_edital(kib * 1024))
+        with open(caminho, 'rb') as f:
+            paginas[nome] = f.read()
+    return paginas
+
+
+class _MonitorCorpus(MonitorEdital):
+    """MonitorEdital que 'baixa' a página do corpus em memória, para medir só o processamento"""
+
+    def __init__(self, html: bytes):
+        super().__init__('https://corpus.local/edital', PALAVRAS_CHAVE)
+        self.html = html
+
+    def baixar_pagina(self) -> bytes:
+        return self.html
+
+
+def _executar_etapas(monitor: _MonitorCorpus, medir) -> dict:
+    """Executa as quatro etapas em sequência, medindo cada uma com `medir(nome, funcao)`"""
+    soup = medir('buscar_pagina', monitor.buscar_pagina)
+    conteudo = medir('extrair_conteudo_relevante', lambda: monitor.extrair_conteudo_relevante(soup))
+    medir('verificar_palavras_chave', lambda: monitor.verificar_palavras_chave(conteudo))
+    # Compara contra o hash de uma verificação anterior (caminho comum: sem mudança)
+    monitor.hash_anterior = monitor.calcular_hash(conteudo)
+    medir('verificar_mudancas', lambda: monitor.verificar_mudancas(conteudo))
+    return {'caracteres_extraidos': len(conteudo)}
+
+
+def medir_pagina(nome: str, html: bytes, repeticoes: int) -> dict:
+    """Tempos (várias repetições, sem tracemalloc) e pico de memória (uma execução com tracemalloc)"""
+    tempos = {etapa: [] for etapa in ETAPAS}
+
+    def medir_tempo(etapa, funcao):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos[etapa].append(time.perf_counter() - inicio)
+        return resultado
+
+    info = {}
+    for _ in range(repeticoes):
+        info = _executar_etapas(_MonitorCorpus(html), medir_tempo)
+
+    picos = {}
+
+    def medir_memoria(etapa, funcao):
+        tracemalloc.reset_peak()
+        atual_antes, _ = tracemalloc.get_traced_memory()
+        resultado = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+        picos[etapa] = max(0, pico - atual_antes)
+        return resultado
+
+    tracemalloc.start()
+    try:
+        _executar_etapas(_MonitorCorpus(html), medir_memoria)
+    finally:
+        tracemalloc.stop()
+
+    megabytes = len(html) / (1024 * 1024)
+    etapas = {}
+    for etapa in ETAPAS:
+        mediana = statistics.median(tempos[etapa])
+        etapas[etapa] = {
+            'mediana_ms': round(mediana * 1000, 3),
+            'minimo_ms': round(min(tempos[etapa]) * 1000, 3),
+            'mb_por_s': round(megabytes / mediana, 2) if mediana else None,
+            'pico_memoria_kib': round(picos[etapa] / 1024, 1)
+        }
+    return {
+        'pagina': nome,
+        'bytes': len(html),
+        'repeticoes': repeticoes,
+        'total_mediana_ms': round(sum(e['mediana_ms'] for e in etapas.values()), 3),
+        'etapas': etapas,
+        **info
+    }
+
+
+def comparar(resultados: list, caminho_base: str):
+    """Imprime a razão novo/base da mediana de cada etapa (< 1 = mais rápido)"""
+    with open(caminho_base, 'r', encoding='utf-8') as f:
+        base = {r['pagina']: r for r in json.load(f)['resultados']}
+
+    print(f"\nComparação com {caminho_base} (tempo novo / tempo base):")
+    for resultado in resultados:
+        anterior = base.get(resultado['pagina'])
+        if not anterior:
+            continue
+        razoes = []
+        for etapa in ETAPAS:
+            novo = resultado['etapas'][etapa]['mediana_ms']
+            antigo = anterior['etapas'][etapa]['mediana_ms']
+            razoes.append(f"{ROTULOS[etapa]} {novo / antigo:.2f}x" if antigo else f"{ROTULOS[etapa]} -")
+        print(f"  {resultado['pagina']:<32} " + ' | '.join(razoes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das etapas de extração e comparação')
+    parser.add_argument('--gerados', default='2048,20480',
+                        help='Tamanhos (KiB) das páginas geradas, separados por vírgula ("" = só o corpus salvo)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições de cada página (mediana)')
+    parser.add_argument('--paginas', help='Filtra páginas cujo nome contém este texto')
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior para comparação')
+    args = parser.parse_args()
+
+    gerados = [int(t) for t in args.gerados.split(',') if t.strip()]
+    paginas = carregar_corpus(gerados)
+    if args.paginas:
+        paginas = {n: h for n, h in paginas.items() if args.paginas in n}
+
+    print("=" * 80)
+    print("BENCHMARK DE EXTRAÇÃO E COMPARAÇÃO")
+    print("=" * 80)
+
+    resultados = []
+    for nome, html in sorted(paginas.items(), key=lambda item: len(item[1])):
+        resultado = medir_pagina(nome, html, args.repeticoes)
+        resultados.append(resultado)
+        etapas = resultado['etapas']
+        print(f"{nome:<32} {len(html) / 1024:>9.0f} KiB | "
+              + ' | '.join(f"{ROTULOS[etapa]} {etapas[etapa]['mediana_ms']:>8.1f} ms "
+                           f"({etapas[etapa]['pico_memoria_kib'] / 1024:.1f} MiB)" for etapa in ETAPAS))
+
+    if args.comparar:
+        comparar(resultados, args.comparar)
+
+    if args.json:
+        ambiente = {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'beautifulsoup4': bs4.__version__,
+            'lxml': '.'.join(str(v) for v in lxml.etree.LXML_VERSION)
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'ambiente': ambiente, 'palavras_chave': PALAVRAS_CHAVE, 'resultados': resultados},
+                      f, indent=4, ensure_ascii=False)
+        print(f"\nResultados gravados em {args.json}")
+
+
+if __name__ == '__main__':
+    main()
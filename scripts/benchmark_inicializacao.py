@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Inicialização
+Mede o tempo de importação de src.app e quanto um restart leva para servir o dashboard
+
+Para cada execução, inicia run.py (cópia temporária do projeto, com o monitor apontado
+para uma página local) e mede, a partir do spawn do processo:
+    - dashboard: primeira resposta 200 de GET /
+    - status: primeira resposta 200 de /api/status
+    - primeira verificação: /api/status com current_check >= 1
+
+Sai com código 1 se a mediana do tempo até o dashboard passar de --limite-segundos.
+
+Uso:
+    python3 scripts/benchmark_inicializacao.py
+    python3 scripts/benchmark_inicializacao.py --execucoes 10 --json inicializacao.json
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+# Adiciona o diretório raiz e o de scripts ao path
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carga_alvos import FazendaEditais, config_para_fazenda, copiar_projeto, encerrar_app, porta_livre
+
+# Módulos pesados que não devem ser carregados só para servir o dashboard
+MODULOS_ADIADOS = ['requests', 'bs4', 'lxml', 'smtplib', 'email.mime.multipart']
+
+
+def medir_importacao(top_n: int = 10) -> Dict:
+    """Executa `python -X importtime -c 'import src.app'` e resume o resultado"""
+    codigo = ("import json, sys; sys.path.insert(0, '.'); import src.app; "
+              f"print(json.dumps([m for m in {MODULOS_ADIADOS!r} if m in sys.modules]))")
+    processo = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=RAIZ,
+                              capture_output=True, text=True, check=True)
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        casamento = re.match(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)', linha)
+        if casamento:
+            proprio, acumulado, recuo, nome = casamento.groups()
+            modulos.append({'modulo': nome, 'proprio_ms': int(proprio) / 1000,
+                            'acumulado_ms': int(acumulado) / 1000, 'nivel': len(recuo) // 2})
+
+    # O importtime lista os filhos antes do pai: as dependências diretas de src.app são
+    # as de nível 1 entre a entrada de nível 0 anterior e a dele
+    app = None
+    diretas = []
+    candidatas = []
+    for modulo in modulos:
+        if modulo['nivel'] == 1:
+            candidatas.append(modulo)
+        elif modulo['nivel'] == 0:
+            if modulo['modulo'] == 'src.app':
+                app, diretas = modulo, candidatas
+            candidatas = []
+    diretas = sorted(diretas, key=lambda m: m['acumulado_ms'], reverse=True)
+    return {
+        'src_app_ms': app['acumulado_ms'] if app else None,
+        'maiores_dependencias': [{'modulo': m['modulo'], 'acumulado_ms': m['acumulado_ms']}
+                                 for m in diretas[:top_n]],
+        'pesados_carregados': json.loads(processo.stdout)
+    }
+
+
+def _aguardar(condicao, inicio: float, processo: subprocess.Popen, timeout: float) -> Optional[float]:
+    """Segundos desde `inicio` até condicao() ser verdadeira (None se o processo morrer ou estourar o prazo)"""
+    while time.perf_counter() - inicio < timeout:
+        if processo.poll() is not None:
+            return None
+        try:
+            if condicao():
+                return time.perf_counter() - inicio
+        except requests.RequestException:
+            pass
+        time.sleep(0.005)
+    return None
+
+
+def medir_inicio(diretorio: str, run_py: str, porta: int, timeout: float) -> Dict:
+    url = f"http://127.0.0.1:{porta}"
+    sessao = requests.Session()
+    inicio = time.perf_counter()
+    processo = subprocess.Popen([sys.executable, run_py], cwd=diretorio,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        dashboard = _aguardar(lambda: sessao.get(url + '/', timeout=1).status_code == 200,
+                              inicio, processo, timeout)
+        status = _aguardar(lambda: sessao.get(url + '/api/status', timeout=1).status_code == 200,
+                           inicio, processo, timeout)
+        verificacao = _aguardar(lambda: sessao.get(url + '/api/status', timeout=1).json()['current_check'] >= 1,
+                                inicio, processo, timeout)
+    finally:
+        encerrar_app(processo)
+    return {'dashboard': dashboard, 'status': status, 'primeira_verificacao': verificacao}
+
+
+def resumir(valores: List[Optional[float]]) -> Dict:
+    validos = [v for v in valores if v is not None]
+    if not validos:
+        return {'mediana_ms': None, 'minimo_ms': None, 'maximo_ms': None, 'falhas': len(valores)}
+    return {
+        'mediana_ms': round(statistics.median(validos) * 1000, 1),
+        'minimo_ms': round(min(validos) * 1000, 1),
+        'maximo_ms': round(max(validos) * 1000, 1),
+        'falhas': len(valores) - len(validos)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de importação e inicialização do servidor')
+    parser.add_argument('--execucoes', type=int, default=5, help='Inicializações medidas')
+    parser.add_argument('--timeout', type=float, default=30, help='Prazo de cada etapa (segundos)')
+    parser.add_argument('--limite-segundos', type=float, default=1.0,
+                        help='Mediana máxima até o dashboard responder')
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK DE INICIALIZAÇÃO")
+    print("=" * 80)
+
+    importacao = medir_importacao()
+    print(f"Importação de src.app: {importacao['src_app_ms']:.1f} ms")
+    for dependencia in importacao['maiores_dependencias']:
+        print(f"  {dependencia['modulo']:<30} {dependencia['acumulado_ms']:>8.1f} ms")
+    if importacao['pesados_carregados']:
+        print(f"Módulos pesados carregados na importação: {', '.join(importacao['pesados_carregados'])}")
+
+    medicoes = []
+    with FazendaEditais(1, 50 * 1024) as fazenda:
+        diretorio = tempfile.mkdtemp(prefix='benchmark_inicio_')
+        porta = porta_livre()
+        try:
+            run_py = copiar_projeto(diretorio, config_para_fazenda(fazenda, 1, None, porta, 60))
+            for i in range(args.execucoes):
+                medicao = medir_inicio(diretorio, run_py, porta, args.timeout)
+                medicoes.append(medicao)
+                print(f"Execução {i + 1}: " + ' | '.join(
+                    f"{etapa} {valor * 1000:.0f} ms" if valor is not None else f"{etapa} -"
+                    for etapa, valor in medicao.items()))
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    resumo = {etapa: resumir([m[etapa] for m in medicoes]) for etapa in ('dashboard', 'status', 'primeira_verificacao')}
+    print("=" * 80)
+    for etapa, valores in resumo.items():
+        print(f"{etapa:<22} mediana {valores['mediana_ms']} ms | mín {valores['minimo_ms']} ms | "
+              f"máx {valores['maximo_ms']} ms | falhas {valores['falhas']}")
+
+    mediana = resumo['dashboard']['mediana_ms']
+    aprovado = mediana is not None and mediana <= args.limite_segundos * 1000
+    print(f"Dashboard {'dentro' if aprovado else 'FORA'} do limite de {args.limite_segundos} s")
+    print("=" * 80)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'importacao': importacao, 'inicializacao': resumo, 'execucoes': medicoes,
+                       'limite_segundos': args.limite_segundos}, f, indent=4, ensure_ascii=False)
+        print(f"Resultados gravados em {args.json}")
+
+    sys.exit(0 if aprovado else 1)
+
+
+if __name__ == '__main__':
+    main()
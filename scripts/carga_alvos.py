@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Teste de Carga Ponta a Ponta
+Sobe uma fazenda local de páginas de edital, aponta o monitor para ela e mede o conjunto
+
+A fazenda simula N páginas com tamanho, latência, taxa de mudança, suporte a ETag e
+injeção de erros configuráveis; nenhum site real é acessado. O monitor roda como
+processo separado (run.py) em uma cópia temporária do projeto, com config, data e
+logs próprios, e avisa cada mudança por webhook para um receptor local.
+
+Mede:
+    - verificações/s (requisições atendidas pela fazenda) e respostas por status
+    - latência de detecção: da mutação da página até a chegada do alerta
+    - CPU e RSS do processo do monitor (e de seus subprocessos), via /proc
+
+Uso:
+    python3 scripts/carga_alvos.py
+    python3 scripts/carga_alvos.py --paginas 500 --tamanho-kib 100 --intervalo-segundos 10 --duracao 120
+    python3 scripts/carga_alvos.py --taxa-erros 0.05 --latencia-ms 200 --json carga.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+
+# Adiciona o diretório raiz e o de scripts ao path
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_extracao import gerar_pagina_edital
+from webhook_local import ReceptorWebhookLocal
+
+PALAVRAS_CHAVE = ['Resultado', 'Homologação', 'Classificados']
+MARCADOR = '<p class="atualizacao">MARCADOR</p>'
+
+
+class _HandlerFazenda(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_HEAD(self):
+        self._atender(com_corpo=False)
+
+    def do_GET(self):
+        self._atender(com_corpo=True)
+
+    def _atender(self, com_corpo: bool):
+        fazenda: 'FazendaEditais' = self.server.dono
+        indice = fazenda.indice_da_rota(self.path)
+        if indice is None:
+            self._responder(404)
+            return
+
+        if fazenda.latencia_segundos:
+            time.sleep(fazenda.latencia_segundos)
+
+        sorteio = fazenda.aleatorio.random()
+        if sorteio < fazenda.taxa_erros:
+            fazenda.contar(503)
+            self._responder(503)
+            return
+        if sorteio < fazenda.taxa_erros + fazenda.taxa_429:
+            fazenda.contar(429)
+            self._responder(429, {'Retry-After': '5'})
+            return
+
+        corpo, etag = fazenda.conteudo(indice)
+        if fazenda.etag and self.headers.get('If-None-Match') == etag:
+            fazenda.contar(304)
+            self._responder(304, {'ETag': etag})
+            return
+
+        fazenda.contar(200)
+        cabecalhos = {'Content-Type': 'text/html; charset=utf-8'}
+        if fazenda.etag:
+            cabecalhos['ETag'] = etag
+        self._responder(200, cabecalhos, corpo if com_corpo else b'', len(corpo))
+
+    def _responder(self, status: int, cabecalhos: Optional[Dict] = None, corpo: bytes = b'',
+                   tamanho: Optional[int] = None):
+        self.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo) if tamanho is None else tamanho))
+        self.end_headers()
+        if corpo:
+            self.wfile.write(corpo)
+
+
+class FazendaEditais:
+    """
+    Servidor HTTP local com N páginas de edital em /edital/<n>
+
+    Todas as páginas partem do mesmo HTML gerado; cada uma tem um parágrafo próprio
+    (número da página e versão) dentro da seção principal, então uma mutação muda o
+    conteúdo extraído pelo monitor. Com `mudancas_por_minuto`, uma thread muta
+    páginas sorteadas e guarda o instante da primeira mutação ainda não alertada.
+    """
+
+    def __init__(self, paginas: int, tamanho_bytes: int, latencia_segundos: float = 0,
+                 mudancas_por_minuto: float = 0, etag: bool = True, taxa_erros: float = 0,
+                 taxa_429: float = 0, semente: int = 2025, host: str = '127.0.0.1', porta: int = 0):
+        """
+        Args:
+            paginas: Número de páginas simuladas
+            tamanho_bytes: Tamanho aproximado de cada página
+            latencia_segundos: Atraso antes de cada resposta
+            mudancas_por_minuto: Mutações por minuto no conjunto das páginas
+            etag: Envia ETag e responde 304 a If-None-Match
+            taxa_erros: Fração das respostas com 503
+            taxa_429: Fração das respostas com 429 e Retry-After
+        """
+        self.latencia_segundos = latencia_segundos
+        self.mudancas_por_minuto = mudancas_por_minuto
+        self.etag = etag
+        self.taxa_erros = taxa_erros
+        self.taxa_429 = taxa_429
+        self.aleatorio = random.Random(semente)
+
+        base = gerar_pagina_edital(tamanho_bytes, semente).decode('utf-8')
+        posicao = base.index('</section>')
+        base = base[:posicao] + MARCADOR + base[posicao:]
+        antes, depois = base.split(MARCADOR)
+        self._antes = antes.encode('utf-8')
+        self._depois = depois.encode('utf-8')
+
+        self.versoes = [0] * paginas
+        self.pendentes: Dict[int, float] = {}  # página -> instante da primeira mutação não alertada
+        self.mutacoes = 0
+        self.status: Dict[int, int] = {}
+        self.tempos_requisicoes: List[float] = []
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+
+        self._servidor = ThreadingHTTPServer((host, porta), _HandlerFazenda)
+        self._servidor.daemon_threads = True
+        self._servidor.dono = self
+        # Conexões encerradas pelo cliente no meio da resposta (ex: download abortado) não são erro aqui
+        self._servidor.handle_error = lambda requisicao, endereco: None
+        self.url_base = f"http://{host}:{self._servidor.server_address[1]}"
+
+    def url(self, indice: int) -> str:
+        return f"{self.url_base}/edital/{indice}"
+
+    def indice_da_rota(self, caminho: str) -> Optional[int]:
+        prefixo = '/edital/'
+        if not caminho.startswith(prefixo):
+            return None
+        try:
+            indice = int(caminho[len(prefixo):])
+        except ValueError:
+            return None
+        return indice if 0 <= indice < len(self.versoes) else None
+
+    def conteudo(self, indice: int):
+        with self._lock:
+            versao = self.versoes[indice]
+        trecho = f'<p class="atualizacao">Página {indice} - atualização nº {versao}</p>'.encode('utf-8')
+        return self._antes + trecho + self._depois, f'"{indice}-{versao}"'
+
+    def contar(self, status: int):
+        with self._lock:
+            self.status[status] = self.status.get(status, 0) + 1
+            self.tempos_requisicoes.append(time.monotonic())
+
+    def mutar(self, indice: int):
+        with self._lock:
+            self.versoes[indice] += 1
+            self.mutacoes += 1
+            self.pendentes.setdefault(indice, time.monotonic())
+
+    def _mutar_loop(self):
+        intervalo = 60 / self.mudancas_por_minuto
+        while not self._parar.wait(self.aleatorio.expovariate(1 / intervalo)):
+            self.mutar(self.aleatorio.randrange(len(self.versoes)))
+
+    def iniciar_mutacoes(self):
+        if self.mudancas_por_minuto > 0:
+            threading.Thread(target=self._mutar_loop, name='mutacoes', daemon=True).start()
+
+    def __enter__(self):
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._parar.set()
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        return False
+
+
+class AmostradorProcesso:
+    """Amostra CPU e RSS de um processo e de seus descendentes (Linux, /proc)"""
+
+    def __init__(self, pid: int, intervalo_segundos: float = 0.5):
+        self.pid = pid
+        self.intervalo = intervalo_segundos
+        self.amostras: List[Dict] = []
+        self._tique = os.sysconf('SC_CLK_TCK')
+        self._parar = threading.Event()
+
+    def _descendentes(self, pid: int) -> List[int]:
+        pids = [pid]
+        try:
+            for tarefa in os.listdir(f'/proc/{pid}/task'):
+                with open(f'/proc/{pid}/task/{tarefa}/children') as f:
+                    for filho in f.read().split():
+                        pids.extend(self._descendentes(int(filho)))
+        except OSError:
+            pass
+        return pids
+
+    def _ler(self) -> Optional[Dict]:
+        cpu = 0.0
+        rss = 0
+        for pid in self._descendentes(self.pid):
+            try:
+                with open(f'/proc/{pid}/stat') as f:
+                    campos = f.read().rsplit(')', 1)[1].split()
+                cpu += (int(campos[11]) + int(campos[12])) / self._tique
+                with open(f'/proc/{pid}/status') as f:
+                    for linha in f:
+                        if linha.startswith('VmRSS:'):
+                            rss += int(linha.split()[1]) * 1024
+            except (OSError, IndexError, ValueError):
+                continue
+        return {'tempo': time.monotonic(), 'cpu_segundos': cpu, 'rss_bytes': rss}
+
+    def amostrar(self):
+        self.amostras.append(self._ler())
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo):
+            self.amostrar()
+
+    def iniciar(self):
+        self.amostrar()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def parar(self) -> Dict:
+        self._parar.set()
+        self.amostrar()
+        primeira, ultima = self.amostras[0], self.amostras[-1]
+        duracao = ultima['tempo'] - primeira['tempo']
+        return {
+            'cpu_percentual_medio': round(100 * (ultima['cpu_segundos'] - primeira['cpu_segundos']) / duracao, 1)
+            if duracao else None,
+            'rss_final_mib': round(ultima['rss_bytes'] / (1024 * 1024), 1),
+            'rss_pico_mib': round(max(a['rss_bytes'] for a in self.amostras) / (1024 * 1024), 1)
+        }
+
+
+def percentil(valores: List[float], p: float) -> Optional[float]:
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def copiar_projeto(diretorio: str, config: Dict) -> str:
+    """Copia o código para um diretório temporário com o config.json dado (config, data e logs isolados)"""
+    for pasta in ('src', 'templates', 'static'):
+        shutil.copytree(os.path.join(RAIZ, pasta), os.path.join(diretorio, pasta),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+    shutil.copy(os.path.join(RAIZ, 'run.py'), diretorio)
+    os.makedirs(os.path.join(diretorio, 'config'))
+    with open(os.path.join(diretorio, 'config', 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=4, ensure_ascii=False)
+    return os.path.join(diretorio, 'run.py')
+
+
+def config_para_fazenda(fazenda: FazendaEditais, paginas: int, webhook_url: Optional[str], porta: int,
+                        intervalo_segundos: float, verificacoes_simultaneas: int = 8,
+                        extracao_workers: int = 0, max_mib: Optional[float] = None) -> Dict:
+    """config.json que aponta o monitor para as páginas da fazenda"""
+    config = {
+        'url': fazenda.url(0),
+        'palavras_chave': PALAVRAS_CHAVE,
+        'alvos': [{'url': fazenda.url(i)} for i in range(1, paginas)],
+        'intervalo_minutos': intervalo_segundos / 60,
+        'servidor_host': '127.0.0.1',
+        'servidor_porta': porta,
+        'verificacoes_simultaneas': verificacoes_simultaneas,
+        # Todas as páginas estão no mesmo host: os limites de cortesia não podem ser o gargalo
+        'cortesia': {
+            'max_concorrencia_por_host': verificacoes_simultaneas,
+            'intervalo_minimo_segundos': 0
+        },
+        'extracao_processos': {'workers': extracao_workers}
+    }
+    if max_mib:
+        config['memoria_limitada'] = {'enabled': True, 'max_bytes': int(max_mib * 1024 * 1024)}
+    if webhook_url:
+        config['webhooks'] = {'enabled': True, 'endpoints': [{'url': webhook_url, 'max_concorrencia': 8}]}
+    return config
+
+
+def aguardar_servidor(url: str, processo: subprocess.Popen, timeout: float = 30):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"O monitor encerrou durante a inicialização (código {processo.returncode})")
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("O monitor não respondeu dentro do prazo")
+
+
+def iniciar_app(diretorio: str, run_py: str, porta: int) -> subprocess.Popen:
+    """Inicia run.py no diretório (saída em monitor.log) e aguarda o servidor responder"""
+    with open(os.path.join(diretorio, 'monitor.log'), 'w') as saida:
+        processo = subprocess.Popen([sys.executable, run_py], cwd=diretorio, stdout=saida,
+                                    stderr=subprocess.STDOUT)
+    try:
+        aguardar_servidor(f"http://127.0.0.1:{porta}/api/status", processo)
+    except Exception:
+        encerrar_app(processo)
+        raise
+    return processo
+
+
+def encerrar_app(processo: subprocess.Popen):
+    processo.terminate()
+    try:
+        processo.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+
+
+def executar(args) -> Dict:
+    latencias: List[float] = []
+    alertas_sem_mutacao = [0]
+    lock = threading.Lock()
+
+    with FazendaEditais(args.paginas, args.tamanho_kib * 1024, args.latencia_ms / 1000,
+                        args.mudancas_por_minuto, not args.sem_etag, args.taxa_erros, args.taxa_429) as fazenda:
+
+        def ao_receber(evento: Dict):
+            indice = fazenda.indice_da_rota(evento['url'][len(fazenda.url_base):])
+            with fazenda._lock:
+                mutado_em = fazenda.pendentes.pop(indice, None)
+            with lock:
+                if mutado_em is None:
+                    alertas_sem_mutacao[0] += 1
+                else:
+                    latencias.append(time.monotonic() - mutado_em)
+
+        with ReceptorWebhookLocal(ao_receber=ao_receber) as receptor:
+            diretorio = tempfile.mkdtemp(prefix='carga_monitor_')
+            porta = porta_livre()
+            config = config_para_fazenda(fazenda, args.paginas, receptor.url, porta, args.intervalo_segundos,
+                                         args.verificacoes_simultaneas, args.extracao_workers, args.max_mib)
+            run_py = copiar_projeto(diretorio, config)
+            processo = None
+            try:
+                processo = iniciar_app(diretorio, run_py, porta)
+
+                # Aquecimento: a primeira verificação de cada página só grava o hash de referência
+                print(f"Aquecimento ({args.aquecimento} s)...")
+                time.sleep(args.aquecimento)
+
+                amostrador = AmostradorProcesso(processo.pid)
+                amostrador.iniciar()
+                with fazenda._lock:
+                    requisicoes_antes = len(fazenda.tempos_requisicoes)
+                    status_antes = dict(fazenda.status)
+                inicio = time.monotonic()
+                fazenda.iniciar_mutacoes()
+                print(f"Medindo ({args.duracao} s)...")
+                time.sleep(args.duracao)
+                fazenda._parar.set()
+                recursos = amostrador.parar()
+                janela = time.monotonic() - inicio
+                with fazenda._lock:
+                    requisicoes = len(fazenda.tempos_requisicoes) - requisicoes_antes
+                    status = {str(s): n - status_antes.get(s, 0) for s, n in fazenda.status.items()}
+
+                # Alertas de mutações feitas no fim da janela ainda podem chegar
+                time.sleep(min(args.intervalo_segundos * 2, 30))
+                with fazenda._lock:
+                    nao_detectadas = len(fazenda.pendentes)
+                    mutacoes = fazenda.mutacoes
+            finally:
+                if processo:
+                    encerrar_app(processo)
+                if args.manter:
+                    print(f"Projeto temporário mantido em {diretorio}")
+                else:
+                    shutil.rmtree(diretorio, ignore_errors=True)
+
+    return {
+        'parametros': {
+            'paginas': args.paginas,
+            'tamanho_kib': args.tamanho_kib,
+            'latencia_ms': args.latencia_ms,
+            'mudancas_por_minuto': args.mudancas_por_minuto,
+            'etag': not args.sem_etag,
+            'taxa_erros': args.taxa_erros,
+            'taxa_429': args.taxa_429,
+            'intervalo_segundos': args.intervalo_segundos,
+            'verificacoes_simultaneas': args.verificacoes_simultaneas,
+            'extracao_workers': args.extracao_workers,
+            'memoria_limitada_max_mib': args.max_mib,
+            'duracao_segundos': args.duracao
+        },
+        'verificacoes_por_segundo': round(requisicoes / janela, 2),
+        'respostas_por_status': status,
+        'mutacoes': mutacoes,
+        'alertas_recebidos': len(latencias),
+        'mutacoes_nao_detectadas': nao_detectadas,
+        'alertas_sem_mutacao': alertas_sem_mutacao[0],
+        'latencia_deteccao_segundos': {
+            'p50': round(percentil(latencias, 50), 2) if latencias else None,
+            'p95': round(percentil(latencias, 95), 2) if latencias else None,
+            'max': round(max(latencias), 2) if latencias else None,
+            'media': round(statistics.mean(latencias), 2) if latencias else None
+        },
+        'processo_monitor': recursos
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga ponta a ponta com fazenda local de páginas')
+    parser.add_argument('--paginas', type=int, default=100, help='Páginas simuladas (alvos do monitor)')
+    parser.add_argument('--tamanho-kib', type=int, default=50, help='Tamanho aproximado de cada página')
+    parser.add_argument('--latencia-ms', type=float, default=50, help='Latência de cada resposta')
+    parser.add_argument('--mudancas-por-minuto', type=float, default=20, help='Mutações por minuto no conjunto')
+    parser.add_argument('--sem-etag', action='store_true', help='Não envia ETag nem responde 304')
+    parser.add_argument('--taxa-erros', type=float, default=0, help='Fração de respostas 503')
+    parser.add_argument('--taxa-429', type=float, default=0, help='Fração de respostas 429 com Retry-After')
+    parser.add_argument('--intervalo-segundos', type=float, default=10, help='Intervalo de verificação do monitor')
+    parser.add_argument('--verificacoes-simultaneas', type=int, default=8, help='Workers do escalonador')
+    parser.add_argument('--extracao-workers', type=int, default=0, help='Processos de análise do HTML (0 = desligado)')
+    parser.add_argument('--max-mib', type=float, help='Ativa o modo de memória limitada com este limite por página')
+    parser.add_argument('--aquecimento', type=float, default=15, help='Segundos antes de começar a medir')
+    parser.add_argument('--duracao', type=float, default=60, help='Segundos de medição')
+    parser.add_argument('--manter', action='store_true', help='Mantém o projeto temporário (config, data, monitor.log)')
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("TESTE DE CARGA PONTA A PONTA")
+    print("=" * 80)
+    resultado = executar(args)
+
+    latencia = resultado['latencia_deteccao_segundos']
+    recursos = resultado['processo_monitor']
+    print("=" * 80)
+    print(f"Verificações/s:           {resultado['verificacoes_por_segundo']}")
+    print(f"Respostas por status:     {resultado['respostas_por_status']}")
+    print(f"Mutações:                 {resultado['mutacoes']} "
+          f"(alertadas: {resultado['alertas_recebidos']}, não detectadas: {resultado['mutacoes_nao_detectadas']})")
+    print(f"Latência de detecção (s): p50 {latencia['p50']} | p95 {latencia['p95']} | máx {latencia['max']}")
+    print(f"Monitor:                  CPU {recursos['cpu_percentual_medio']}% | "
+          f"RSS {recursos['rss_final_mib']} MiB (pico {recursos['rss_pico_mib']} MiB)")
+    print("=" * 80)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=4, ensure_ascii=False)
+        print(f"Resultados gravados em {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Teste de Carga do Dashboard
+Simula N navegadores com o dashboard aberto e mede a API contra um SLO de latência
+
+Cada cliente repete o ciclo de polling de static/js/app.js: a cada 2 segundos,
+/api/status, /api/logs?limit=50, /api/atividades?limit=20 e /api/subscribers.
+Os clientes começam com fases aleatórias dentro do ciclo, como navegadores abertos
+em momentos diferentes. Por padrão o app é iniciado localmente (cópia temporária do
+projeto, monitor verificando uma fazenda local de páginas, histórico e inscritos
+pré-populados); com --url o teste roda contra um app já em execução.
+
+Sai com código 1 se algum endpoint passar do SLO (p95, p99 ou taxa de erros).
+O gerador de carga roda em threads no mesmo processo: para milhares de clientes,
+confira o CPU desta máquina ou divida os clientes entre várias execuções.
+
+Uso:
+    python3 scripts/carga_dashboard.py
+    python3 scripts/carga_dashboard.py --clientes 500 --duracao 60 --slo-p95-ms 300 --slo-p99-ms 800
+    python3 scripts/carga_dashboard.py --url http://127.0.0.1:5000 --clientes 200 --json dashboard.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Adiciona o diretório raiz e o de scripts ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carga_alvos import (AmostradorProcesso, FazendaEditais, config_para_fazenda, copiar_projeto,
+                         encerrar_app, iniciar_app, percentil, porta_livre)
+
+# Ciclo de polling do dashboard (static/js/app.js)
+CICLO_SEGUNDOS = 2
+ENDPOINTS = ['/api/status', '/api/logs?limit=50', '/api/atividades?limit=20', '/api/subscribers']
+
+
+def popular_dados(diretorio: str, atividades: int, inscritos: int):
+    """Histórico e inscritos iniciais, para as respostas terem o tamanho de produção"""
+    dados = os.path.join(diretorio, 'data')
+    os.makedirs(dados, exist_ok=True)
+    historico = [{
+        'timestamp': f"2025-01-{1 + i % 28:02d} {i % 24:02d}:00:00",
+        'palavras_encontradas': ['resultado', 'classificados'],
+        'conteudo_resumo': 'EDITAL Nº 001/2025 Resultado preliminar da prova objetiva ' * 5,
+        'tipo': 'MUDANCA'
+    } for i in range(atividades)]
+    with open(os.path.join(dados, 'historico.json'), 'w', encoding='utf-8') as f:
+        json.dump({'atividades': historico}, f, indent=4, ensure_ascii=False)
+    with open(os.path.join(dados, 'subscribers.json'), 'w', encoding='utf-8') as f:
+        json.dump({'emails': [f"candidato{i}@exemplo.com" for i in range(inscritos)]}, f, indent=4)
+
+
+class ClienteDashboard(threading.Thread):
+    """Um navegador com o dashboard aberto"""
+
+    def __init__(self, url_base: str, fim: float, registrar):
+        super().__init__(daemon=True)
+        self.url_base = url_base
+        self.fim = fim
+        self.registrar = registrar
+        self.sessao = requests.Session()
+        self.sessao.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+    def run(self):
+        proximo = time.monotonic() + random.uniform(0, CICLO_SEGUNDOS)
+        while True:
+            espera = proximo - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+            if time.monotonic() >= self.fim:
+                return
+            # setInterval não espera o ciclo anterior: se o ciclo atrasou, o próximo começa na hora
+            proximo += CICLO_SEGUNDOS
+            for endpoint in ENDPOINTS:
+                inicio = time.perf_counter()
+                try:
+                    resposta = self.sessao.get(self.url_base + endpoint, timeout=30)
+                    resposta.content
+                    ok = resposta.status_code == 200
+                except requests.RequestException:
+                    ok = False
+                self.registrar(endpoint, time.perf_counter() - inicio, ok)
+
+
+def executar_clientes(url_base: str, clientes: int, duracao: float) -> Dict:
+    latencias: Dict[str, List[float]] = {e: [] for e in ENDPOINTS}
+    erros: Dict[str, int] = {e: 0 for e in ENDPOINTS}
+    lock = threading.Lock()
+
+    def registrar(endpoint: str, segundos: float, ok: bool):
+        with lock:
+            latencias[endpoint].append(segundos)
+            if not ok:
+                erros[endpoint] += 1
+
+    inicio = time.monotonic()
+    threads = [ClienteDashboard(url_base, inicio + duracao, registrar) for _ in range(clientes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    janela = time.monotonic() - inicio
+
+    resultados = {}
+    for endpoint in ENDPOINTS:
+        valores = latencias[endpoint]
+        resultados[endpoint] = {
+            'requisicoes': len(valores),
+            'requisicoes_por_segundo': round(len(valores) / janela, 1),
+            'taxa_erros': round(erros[endpoint] / len(valores), 4) if valores else None,
+            'p50_ms': round(percentil(valores, 50) * 1000, 1) if valores else None,
+            'p95_ms': round(percentil(valores, 95) * 1000, 1) if valores else None,
+            'p99_ms': round(percentil(valores, 99) * 1000, 1) if valores else None
+        }
+    return resultados
+
+
+def violacoes_slo(resultados: Dict, args) -> List[str]:
+    violacoes = []
+    for endpoint, r in resultados.items():
+        if not r['requisicoes']:
+            violacoes.append(f"{endpoint}: nenhuma requisição concluída")
+            continue
+        if r['p95_ms'] > args.slo_p95_ms:
+            violacoes.append(f"{endpoint}: p95 {r['p95_ms']} ms > {args.slo_p95_ms} ms")
+        if r['p99_ms'] > args.slo_p99_ms:
+            violacoes.append(f"{endpoint}: p99 {r['p99_ms']} ms > {args.slo_p99_ms} ms")
+        if r['taxa_erros'] > args.slo_taxa_erros:
+            violacoes.append(f"{endpoint}: erros {r['taxa_erros']:.2%} > {args.slo_taxa_erros:.2%}")
+    return violacoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga da API do dashboard com SLO de latência')
+    parser.add_argument('--clientes', type=int, default=100, help='Dashboards abertos simultaneamente')
+    parser.add_argument('--duracao', type=float, default=30, help='Segundos de medição')
+    parser.add_argument('--url', help='App já em execução (padrão: inicia uma cópia local)')
+    parser.add_argument('--atividades', type=int, default=50, help='Atividades no histórico do app local')
+    parser.add_argument('--inscritos', type=int, default=1000, help='Inscritos no app local')
+    parser.add_argument('--paginas', type=int, default=5, help='Páginas verificadas pelo monitor do app local')
+    parser.add_argument('--slo-p95-ms', type=float, default=250, help='p95 máximo por endpoint')
+    parser.add_argument('--slo-p99-ms', type=float, default=1000, help='p99 máximo por endpoint')
+    parser.add_argument('--slo-taxa-erros', type=float, default=0.001, help='Taxa máxima de erros por endpoint')
+    parser.add_argument('--json', help='Grava os resultados neste arquivo JSON')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("TESTE DE CARGA DO DASHBOARD")
+    print("=" * 80)
+
+    recursos = None
+    if args.url:
+        resultados = executar_clientes(args.url.rstrip('/'), args.clientes, args.duracao)
+    else:
+        # O monitor continua verificando (e gerando logs e atividades) durante o teste
+        with FazendaEditais(args.paginas, 30 * 1024, mudancas_por_minuto=6) as fazenda:
+            diretorio = tempfile.mkdtemp(prefix='carga_dashboard_')
+            porta = porta_livre()
+            run_py = copiar_projeto(diretorio, config_para_fazenda(fazenda, args.paginas, None, porta, 5))
+            popular_dados(diretorio, args.atividades, args.inscritos)
+            processo = None
+            try:
+                processo = iniciar_app(diretorio, run_py, porta)
+                fazenda.iniciar_mutacoes()
+                amostrador = AmostradorProcesso(processo.pid)
+                amostrador.iniciar()
+                print(f"{args.clientes} clientes por {args.duracao} s...")
+                resultados = executar_clientes(f"http://127.0.0.1:{porta}", args.clientes, args.duracao)
+                recursos = amostrador.parar()
+            finally:
+                if processo:
+                    encerrar_app(processo)
+                shutil.rmtree(diretorio, ignore_errors=True)
+
+    print(f"{'Endpoint':<26} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>8}")
+    for endpoint, r in resultados.items():
+        print(f"{endpoint:<26} {r['requisicoes_por_segundo']:>8} {r['p50_ms']!s:>9} {r['p95_ms']!s:>9} "
+              f"{r['p99_ms']!s:>9} {(r['taxa_erros'] or 0):>8.2%}")
+    if recursos:
+        print(f"App: CPU {recursos['cpu_percentual_medio']}% | RSS {recursos['rss_final_mib']} MiB "
+              f"(pico {recursos['rss_pico_mib']} MiB)")
+
+    violacoes = violacoes_slo(resultados, args)
+    print("=" * 80)
+    if violacoes:
+        print("SLO VIOLADO:")
+        for violacao in violacoes:
+            print(f"  - {violacao}")
+    else:
+        print("SLO atendido em todos os endpoints")
+    print("=" * 80)
+
+    if args.json:
+        slo = {'p95_ms': args.slo_p95_ms, 'p99_ms': args.slo_p99_ms, 'taxa_erros': args.slo_taxa_erros}
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'clientes': args.clientes, 'duracao_segundos': args.duracao, 'slo': slo,
+                       'endpoints': resultados, 'processo_app': recursos, 'violacoes': violacoes},
+                      f, indent=4, ensure_ascii=False)
+        print(f"Resultados gravados em {args.json}")
+
+    sys.exit(1 if violacoes else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Servidor SMTP Local para Testes e Benchmarks
+Aceita e descarta mensagens, com latência configurável e injeção de falhas
+"""
+
+import random
+import socketserver
+import threading
+import time
+from typing import Optional
+
+
+class _HandlerSMTP(socketserver.StreamRequestHandler):
+    """Implementa o subconjunto do SMTP usado pelo smtplib (sem STARTTLS/AUTH reais)"""
+
+    def _responder(self, linha: str):
+        self.wfile.write(linha.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        servidor: 'ServidorSMTPLocal' = self.server.dono
+        servidor._registrar('conexoes')
+        self._responder('220 smtp-local ESMTP pronto')
+
+        mensagens_nesta_conexao = 0
+        destinatarios = 0
+
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                return
+
+            comando = linha.decode('utf-8', errors='replace').strip()
+            verbo = comando.split(' ', 1)[0].upper()
+
+            if verbo == 'EHLO':
+                self.wfile.write(b'250-smtp-local\r\n250-8BITMIME\r\n250 AUTH PLAIN LOGIN\r\n')
+            elif verbo == 'HELO':
+                self._responder('250 smtp-local')
+            elif verbo == 'AUTH':
+                self._responder('235 Autenticado')
+            elif verbo == 'MAIL':
+                destinatarios = 0
+                self._responder('250 OK')
+            elif verbo == 'RCPT':
+                if servidor.taxa_recusa and random.random() < servidor.taxa_recusa:
+                    self._responder('550 Caixa inexistente')
+                else:
+                    destinatarios += 1
+                    self._responder('250 OK')
+            elif verbo == 'DATA':
+                if not destinatarios:
+                    self._responder('554 Nenhum destinatario valido')
+                    continue
+                self._responder('354 Termine com <CRLF>.<CRLF>')
+                tamanho = 0
+                while True:
+                    parte = self.rfile.readline()
+                    if not parte or parte == b'.\r\n':
+                        break
+                    tamanho += len(parte)
+
+                if servidor.latencia_segundos:
+                    time.sleep(servidor.latencia_segundos)
+
+                if servidor.taxa_falha and random.random() < servidor.taxa_falha:
+                    self._responder('451 Falha temporaria injetada')
+                    continue
+
+                mensagens_nesta_conexao += 1
+                servidor._registrar('mensagens')
+                servidor._registrar('destinatarios', destinatarios)
+                servidor._registrar('bytes', tamanho)
+                self._responder('250 Mensagem aceita')
+
+                # Simula provedores que derrubam a conexão após N mensagens
+                if servidor.derrubar_apos and mensagens_nesta_conexao >= servidor.derrubar_apos:
+                    return
+            elif verbo == 'RSET' or verbo == 'NOOP':
+                self._responder('250 OK')
+            elif verbo == 'QUIT':
+                self._responder('221 Ate logo')
+                return
+            else:
+                self._responder('502 Comando nao implementado')
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ServidorSMTPLocal:
+    """
+    Sumidouro SMTP em processo para medir o EmailNotifier sem provedor real
+
+    Uso:
+        with ServidorSMTPLocal(latencia_segundos=0.005) as smtp:
+            notifier = EmailNotifier({'smtp_server': smtp.host, 'smtp_port': smtp.porta, 'use_tls': False, ...})
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        porta: int = 0,
+        latencia_segundos: float = 0,
+        taxa_falha: float = 0,
+        taxa_recusa: float = 0,
+        derrubar_apos: int = 0
+    ):
+        """
+        Args:
+            host: Endereço de escuta
+            porta: Porta (0 = escolhe uma livre)
+            latencia_segundos: Atraso aplicado antes de aceitar cada mensagem
+            taxa_falha: Fração de mensagens respondidas com 451 (falha temporária)
+            taxa_recusa: Fração de RCPT TO recusados com 550 (falha permanente)
+            derrubar_apos: Derruba a conexão após N mensagens (0 = nunca)
+        """
+        self.latencia_segundos = latencia_segundos
+        self.taxa_falha = taxa_falha
+        self.taxa_recusa = taxa_recusa
+        self.derrubar_apos = derrubar_apos
+
+        self._servidor = _TCPServer((host, porta), _HandlerSMTP)
+        self._servidor.dono = self
+        self.host, self.porta = self._servidor.server_address[:2]
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.zerar_contadores()
+
+    def zerar_contadores(self):
+        """Zera os contadores de conexões, mensagens, destinatários e bytes"""
+        with self._lock:
+            self.contadores = {'conexoes': 0, 'mensagens': 0, 'destinatarios': 0, 'bytes': 0}
+
+    def _registrar(self, contador: str, quantidade: int = 1):
+        with self._lock:
+            self.contadores[contador] += quantidade
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.parar()
+        return False
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Servidor SMTP local que descarta mensagens')
+    parser.add_argument('--porta', type=int, default=2525)
+    parser.add_argument('--latencia-ms', type=float, default=0)
+    parser.add_argument('--taxa-falha', type=float, default=0)
+    parser.add_argument('--taxa-recusa', type=float, default=0)
+    args = parser.parse_args()
+
+    with ServidorSMTPLocal(porta=args.porta, latencia_segundos=args.latencia_ms / 1000,
+                           taxa_falha=args.taxa_falha, taxa_recusa=args.taxa_recusa) as smtp:
+        print(f"Servidor SMTP local em {smtp.host}:{smtp.porta} (Ctrl+C para parar)")
+        try:
+            while True:
+                time.sleep(5)
+                print(smtp.contadores, flush=True)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Verificação da Detecção de Mudanças
+Garante que a normalização do conteúdo não esconde mudanças reais do edital
+
+Usa a página de resultado do corpus (scripts/corpus_editais): altera um campo de uma
+linha e confere que o hash muda com a normalização ligada, e que linhas novas no
+resultado não são tratadas como mudança trivial pela significância (SimHash):
+    python3 scripts/verificar_deteccao.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.extracao import analisar_html
+from src.monitor import MonitorEdital
+from src.similaridade import mudanca_trivial
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_editais',
+                      'resultado_preliminar_200kib.html')
+
+# Seção 'normalizacao' com os padrões (máscaras predefinidas padrão)
+NORMALIZACAO = {'enabled': True, 'aprender_volateis': False}
+
+# Seção 'significancia' com o limiar padrão
+SIGNIFICANCIA = {'enabled': True}
+
+
+def _detecta(html_antigo: str, html_novo: str, normalizacao: dict) -> bool:
+    """Indica se a troca de html_antigo para html_novo é detectada como mudança"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        monitor = MonitorEdital('https://exemplo.gov.br/resultado', [], normalizacao=normalizacao,
+                                diretorio_conteudo=diretorio)
+        monitor.verificar_mudancas(analisar_html(html_antigo, [])['conteudo'])
+        mudanca, _ = monitor.verificar_mudancas(analisar_html(html_novo, [])['conteudo'])
+        return mudanca
+
+
+def _trivial(html_antigo: str, html_novo: str, palavras_chave: list) -> bool:
+    """Indica se a mudança seria tratada como trivial (sem alerta imediato), como no app"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        monitor = MonitorEdital('https://exemplo.gov.br/resultado', palavras_chave, diretorio_conteudo=diretorio)
+        antes = analisar_html(html_antigo, palavras_chave)
+        depois = analisar_html(html_novo, palavras_chave)
+        monitor.verificar_mudancas(antes['conteudo'])
+        mudanca, _ = monitor.verificar_mudancas(depois['conteudo'])
+        palavras_novas = [p for p in depois['palavras_encontradas'] if p not in antes['palavras_encontradas']]
+        return mudanca and mudanca_trivial(monitor.similaridade, SIGNIFICANCIA, palavras_novas)
+
+
+def _acrescentar_linhas(html: str, quantidade: int) -> str:
+    """Página com `quantidade` linhas novas no fim da última tabela de resultado"""
+    linhas = re.findall(r'<tr><td>\d+</td><td>\d+</td>.*?</tr>', html)
+    novas = []
+    for i in range(quantidade):
+        # Linhas existentes com inscrição nova, escolhidas de forma determinística
+        linha = linhas[(i * 37) % len(linhas)]
+        novas.append(re.sub(r'<td>\d{8}</td>', f'<td>{90000000 + i * 7919:08d}</td>', linha, count=1))
+    fim = html.rfind('</tr>') + len('</tr>')
+    return html[:fim] + ''.join(novas) + html[fim:]
+
+
+def verificar_deteccao() -> bool:
+    """Executa a bateria de verificações e imprime o resultado de cada uma"""
+    with open(CORPUS, encoding='utf-8') as f:
+        html = f.read()
+
+    resultados = []
+
+    # 1. Número de inscrição de um candidato: na extração as células ficam coladas às
+    #    vizinhas ("18Classificado3178652548Gabriela"), uma sequência longa de letras e dígitos
+    inscricao = html.replace('<td>78652548</td>', '<td>78652549</td>', 1)
+    resultados.append(('inscrição alterada detectada', inscricao != html
+                       and _detecta(html, inscricao, NORMALIZACAO)))
+
+    # 2. Situação de um candidato
+    situacao = html.replace('<td>Eliminado</td>', '<td>Classificado</td>', 1)
+    resultados.append(('situação alterada detectada', situacao != html
+                       and _detecta(html, situacao, NORMALIZACAO)))
+
+    # 3. Com todas as máscaras predefinidas, uma linha do resultado continua protegida
+    todas = {**NORMALIZACAO, 'predefinidas': ['contador', 'geracao', 'token']}
+    resultados.append(('inscrição detectada com a máscara token', _detecta(html, inscricao, todas)))
+
+    # 4. Contador e token CSRF trocados: sem mudança
+    volatil = html.replace('</body>', '<p>Visitas: 1.234</p><p>csrf_token: 9f86d081884c7d659a2feaa0c55ad015</p></body>', 1)
+    volatil_novo = volatil.replace('1.234', '1.301').replace('9f86d081884c7d659a2feaa0c55ad015',
+                                                             '2c26b46b68ffc68ff99b453c1d304134')
+    resultados.append(('contador e token mascarados', not _detecta(volatil, volatil_novo, todas)))
+
+    # 5-6. Linhas novas no resultado: nunca triviais com o limiar padrão
+    for quantidade in (20, 50):
+        resultados.append((f'{quantidade} linhas novas não são triviais',
+                           not _trivial(html, _acrescentar_linhas(html, quantidade), [])))
+
+    # 7. Uma palavra corrigida no texto de abertura: trivial
+    edicao = html.replace('contratação temporária de profissionais', 'contratação temporária dos profissionais', 1)
+    resultados.append(('edição pequena é trivial', _trivial(html, edicao, [])))
+
+    # 8. A mesma edição, mas com uma palavra-chave que passou a aparecer: nunca trivial
+    com_palavra = html.replace('contratação temporária de profissionais', 'contratação temporária dos convocados', 1)
+    resultados.append(('palavra-chave nova não é trivial', not _trivial(html, com_palavra, ['convocados'])))
+
+    for nome, ok in resultados:
+        print(f"[{'OK' if ok else 'FALHA'}] {nome}")
+    return all(ok for _, ok in resultados)
+
+
+if __name__ == '__main__':
+    sys.exit(0 if verificar_deteccao() else 1)
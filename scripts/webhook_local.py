@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Receptor de Webhooks Local para Testes
+Servidor HTTP que valida a assinatura HMAC, conta eventos e injeta falhas
+
+Executado diretamente, roda uma bateria de verificações do WebhookNotifier:
+    python3 scripts/webhook_local.py
+"""
+
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.webhook_notifier import WebhookNotifier, assinar_payload
+
+
+class _HandlerWebhook(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_POST(self):
+        servidor: 'ReceptorWebhookLocal' = self.server.dono
+        corpo = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        with servidor._lock:
+            servidor.requisicoes += 1
+            servidor.concorrencia_atual += 1
+            servidor.concorrencia_maxima = max(servidor.concorrencia_maxima, servidor.concorrencia_atual)
+            falhar = servidor.falhas_restantes > 0
+            if falhar:
+                servidor.falhas_restantes -= 1
+
+        try:
+            if servidor.latencia_segundos:
+                time.sleep(servidor.latencia_segundos)
+
+            if servidor.segredo:
+                esperado = assinar_payload(servidor.segredo, self.headers.get('X-Monitor-Timestamp', ''), corpo)
+                if not hmac.compare_digest(esperado, self.headers.get('X-Monitor-Assinatura', '')):
+                    with servidor._lock:
+                        servidor.assinaturas_invalidas += 1
+                    self._responder(401)
+                    return
+
+            if falhar:
+                self._responder(503)
+                return
+
+            payload = json.loads(corpo)
+            eventos = payload.get('eventos', [payload])
+            with servidor._lock:
+                servidor.eventos.extend(eventos)
+                servidor.conexoes.add(self.client_address)
+            if servidor.ao_receber:
+                for evento in eventos:
+                    servidor.ao_receber(evento)
+            self._responder(204)
+        finally:
+            with servidor._lock:
+                servidor.concorrencia_atual -= 1
+
+    def _responder(self, status: int):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class ReceptorWebhookLocal:
+    """Servidor HTTP local que recebe webhooks do monitor"""
+
+    def __init__(self, segredo: str = '', latencia_segundos: float = 0, falhas_iniciais: int = 0,
+                 host: str = '127.0.0.1', porta: int = 0, ao_receber=None):
+        """
+        Args:
+            segredo: Segredo HMAC esperado (vazio = não valida)
+            latencia_segundos: Atraso antes de responder cada requisição
+            falhas_iniciais: Quantidade de requisições iniciais respondidas com 503
+            ao_receber: Função opcional ao_receber(evento), chamada na chegada de cada evento
+        """
+        self.segredo = segredo
+        self.ao_receber = ao_receber
+        self.latencia_segundos = latencia_segundos
+        self.falhas_restantes = falhas_iniciais
+
+        self.eventos = []
+        self.conexoes = set()
+        self.requisicoes = 0
+        self.assinaturas_invalidas = 0
+        self.concorrencia_atual = 0
+        self.concorrencia_maxima = 0
+        self._lock = threading.Lock()
+
+        self._servidor = ThreadingHTTPServer((host, porta), _HandlerWebhook)
+        self._servidor.daemon_threads = True
+        self._servidor.dono = self
+        self.url = f"http://{host}:{self._servidor.server_address[1]}/webhook"
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        return False
+
+
+def _aguardar(condicao, timeout: float = 10) -> bool:
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicao():
+            return True
+        time.sleep(0.05)
+    return condicao()
+
+
+def _evento(i: int) -> dict:
+    return {'tipo': 'mudanca', 'id': f'evento-{i}', 'url': 'https://exemplo.com/edital',
+            'palavras_encontradas': ['resultado'], 'conteudo_resumo': 'Resultado final'}
+
+
+def verificar_notifier():
+    """Executa cenários do WebhookNotifier contra o receptor local"""
+    resultados = []
+
+    # 1. Entrega individual assinada, com limite de concorrência por endpoint
+    with ReceptorWebhookLocal(segredo='s3gredo', latencia_segundos=0.05) as receptor:
+        notifier = WebhookNotifier({'enabled': True, 'endpoints': [
+            {'url': receptor.url, 'segredo': 's3gredo', 'max_concorrencia': 3}
+        ]})
+        for i in range(30):
+            notifier.notificar(_evento(i))
+        ok = _aguardar(lambda: len(receptor.eventos) == 30)
+        notifier.parar()
+        resultados.append(('entrega individual assinada', ok and receptor.assinaturas_invalidas == 0))
+        resultados.append(('limite de concorrência respeitado', receptor.concorrencia_maxima <= 3))
+        resultados.append(('conexões keep-alive reutilizadas', len(receptor.conexoes) <= 3))
+
+    # 2. Modo lote: vários eventos por requisição
+    with ReceptorWebhookLocal() as receptor:
+        notifier = WebhookNotifier({'enabled': True, 'endpoints': [
+            {'url': receptor.url, 'modo_lote': True, 'tamanho_lote': 10, 'intervalo_lote_segundos': 0.5}
+        ]})
+        for i in range(25):
+            notifier.notificar(_evento(i))
+        ok = _aguardar(lambda: len(receptor.eventos) == 25)
+        notifier.parar()
+        resultados.append(('modo lote (25 eventos em 3 requisições)', ok and receptor.requisicoes == 3))
+
+    # 3. Retentativa com backoff após 503
+    with ReceptorWebhookLocal(falhas_iniciais=2) as receptor:
+        notifier = WebhookNotifier({'enabled': True, 'backoff_base_segundos': 0.1, 'endpoints': [
+            {'url': receptor.url, 'max_concorrencia': 1}
+        ]})
+        notifier.notificar(_evento(0))
+        ok = _aguardar(lambda: len(receptor.eventos) == 1)
+        notifier.parar()
+        resultados.append(('retentativa após 503', ok and receptor.requisicoes == 3))
+
+    # 4. Assinatura inválida é rejeitada pelo receptor
+    with ReceptorWebhookLocal(segredo='correto') as receptor:
+        notifier = WebhookNotifier({'enabled': True, 'endpoints': [
+            {'url': receptor.url, 'segredo': 'errado'}
+        ]}, log=lambda mensagem, tipo="INFO": None)
+        notifier.notificar(_evento(0))
+        _aguardar(lambda: receptor.assinaturas_invalidas == 1)
+        notifier.parar()
+        resultados.append(('assinatura inválida rejeitada', receptor.assinaturas_invalidas == 1 and not receptor.eventos))
+
+    # 5. parar() não espera o backoff das retentativas
+    with ReceptorWebhookLocal(falhas_iniciais=100) as receptor:
+        logs = []
+        notifier = WebhookNotifier({'enabled': True, 'backoff_base_segundos': 30, 'endpoints': [
+            {'url': receptor.url}
+        ]}, log=lambda mensagem, tipo="INFO": logs.append(mensagem))
+        notifier.notificar(_evento(0))
+        _aguardar(lambda: receptor.requisicoes == 1)
+        inicio = time.monotonic()
+        notifier.parar(timeout=2)
+        resultados.append(('parar() interrompe o backoff', time.monotonic() - inicio < 2
+                           and any('após 1 tentativa(s)' in mensagem for mensagem in logs)))
+
+    print("=" * 80)
+    print("VERIFICAÇÃO DO NOTIFICADOR DE WEBHOOKS")
+    print("=" * 80)
+    for nome, ok in resultados:
+        print(f"[{'OK' if ok else 'FALHA'}] {nome}")
+    print("=" * 80)
+    return all(ok for _, ok in resultados)
+
+
+if __name__ == '__main__':
+    sys.exit(0 if verificar_notifier() else 1)
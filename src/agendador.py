@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Módulo de Agendamento Adaptativo
+Ajusta o intervalo de verificação de cada alvo conforme o histórico de mudanças
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+# Timezone de Brasília
+BRASILIA_TZ = ZoneInfo("America/Sao_Paulo")
+
+# Quantidade de mudanças lembradas por alvo para estimar a taxa de mudança
+HISTORICO_MUDANCAS = 20
+
+# Segundos entre gravações do estado após verificações sem mudança (mudanças são gravadas na hora)
+INTERVALO_GRAVACAO = 30
+
+
+class AgendadorAdaptativo:
+    """
+    Calcula o intervalo até a próxima verificação de cada alvo
+
+    Regras (com adaptativo ativo):
+        - Após uma mudança, o intervalo cai para o mínimo
+        - A cada verificação sem mudança, o intervalo cresce por `fator_recuo`
+        - Com histórico suficiente, o intervalo não passa do intervalo médio entre
+          mudanças dividido por `amostras_por_mudanca`
+        - Dentro (ou perto) de uma janela de publicação esperada, usa o intervalo da janela
+        - O resultado sempre respeita [intervalo_min, intervalo_max]
+
+    O estado é persistido em JSON para que o aprendizado sobreviva a reinícios. Com milhares
+    de alvos, regravar o arquivo a cada verificação custaria O(N) por verificação: as
+    verificações sem mudança são gravadas no máximo a cada INTERVALO_GRAVACAO segundos e
+    ao parar o monitoramento (salvar()). Com o modo adaptativo desligado nada é registrado.
+    """
+
+    def __init__(self, caminho_estado: str, intervalo_base_minutos: float, config: Optional[Dict] = None):
+        """
+        Args:
+            caminho_estado: Arquivo JSON com o estado aprendido (ex: data/agendamento.json)
+            intervalo_base_minutos: Intervalo fixo usado quando o modo adaptativo está desligado
+            config: Seção 'agendamento' do config.json
+                {
+                    'adaptativo': bool,
+                    'intervalo_min_minutos': float,
+                    'intervalo_max_minutos': float,
+                    'fator_recuo': float,
+                    'amostras_por_mudanca': int,
+                    'janelas_publicacao': [
+                        {'inicio': 'AAAA-MM-DD HH:MM', 'fim': 'AAAA-MM-DD HH:MM', 'intervalo_minutos': float}
+                    ]
+                }
+        """
+        config = config or {}
+        self.caminho_estado = caminho_estado
+        self.intervalo_base = intervalo_base_minutos * 60
+        self.adaptativo = config.get('adaptativo', False)
+        self.intervalo_min = config.get('intervalo_min_minutos', min(2, intervalo_base_minutos)) * 60
+        self.intervalo_max = config.get('intervalo_max_minutos', max(120, intervalo_base_minutos)) * 60
+        self.fator_recuo = config.get('fator_recuo', 1.5)
+        self.amostras_por_mudanca = config.get('amostras_por_mudanca', 10)
+        self.janelas = [self._parse_janela(j) for j in config.get('janelas_publicacao', [])]
+
+        self._lock = threading.Lock()
+        self._lock_gravacao = threading.Lock()
+        self._alterado = False
+        self._ultima_gravacao = time.monotonic()
+        self.estado: Dict[str, Dict] = self._carregar()
+
+    @staticmethod
+    def _parse_janela(janela: Dict) -> Dict:
+        formato = "%Y-%m-%d %H:%M"
+        return {
+            'inicio': datetime.strptime(janela['inicio'], formato).replace(tzinfo=BRASILIA_TZ).timestamp(),
+            'fim': datetime.strptime(janela['fim'], formato).replace(tzinfo=BRASILIA_TZ).timestamp(),
+            'intervalo': janela.get('intervalo_minutos', 1) * 60
+        }
+
+    def _carregar(self) -> Dict[str, Dict]:
+        if os.path.exists(self.caminho_estado):
+            try:
+                with open(self.caminho_estado, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Erro ao carregar estado do agendador: {e}", flush=True)
+        return {}
+
+    def salvar(self):
+        """Grava o estado, se houver alterações pendentes (também chamado ao parar o monitoramento)"""
+        with self._lock_gravacao:
+            # Serializa sob a trava do estado e grava fora dela: as verificações não esperam o disco
+            with self._lock:
+                if not self._alterado:
+                    return
+                dados = json.dumps(self.estado, ensure_ascii=False)
+                self._alterado = False
+                self._ultima_gravacao = time.monotonic()
+            temporario = self.caminho_estado + '.tmp'
+            try:
+                with open(temporario, 'w', encoding='utf-8') as f:
+                    f.write(dados)
+                os.replace(temporario, self.caminho_estado)
+            except Exception:
+                with self._lock:
+                    self._alterado = True
+                raise
+
+    def _estado_alvo(self, alvo: str) -> Dict:
+        return self.estado.setdefault(alvo, {
+            'intervalo_atual': self.intervalo_base,
+            'mudancas': [],
+            'verificacoes_sem_mudanca': 0
+        })
+
+    def _limitar(self, intervalo: float) -> float:
+        return max(self.intervalo_min, min(self.intervalo_max, intervalo))
+
+    def registrar_verificacao(self, alvo: str, mudanca: bool, agora: Optional[float] = None):
+        """Atualiza o aprendizado do alvo com o resultado de uma verificação bem-sucedida"""
+        if not self.adaptativo:
+            return
+        agora = agora or time.time()
+        with self._lock:
+            estado = self._estado_alvo(alvo)
+            if mudanca:
+                estado['mudancas'] = (estado['mudancas'] + [agora])[-HISTORICO_MUDANCAS:]
+                estado['verificacoes_sem_mudanca'] = 0
+                estado['intervalo_atual'] = self.intervalo_min
+            else:
+                estado['verificacoes_sem_mudanca'] += 1
+                estado['intervalo_atual'] = self._limitar(estado['intervalo_atual'] * self.fator_recuo)
+            self._alterado = True
+            gravar = mudanca or time.monotonic() - self._ultima_gravacao >= INTERVALO_GRAVACAO
+        if gravar:
+            self.salvar()
+
+    def intervalo_medio_entre_mudancas(self, alvo: str) -> Optional[float]:
+        """Intervalo médio (segundos) entre as mudanças conhecidas do alvo"""
+        mudancas = self.estado.get(alvo, {}).get('mudancas', [])
+        if len(mudancas) < 2:
+            return None
+        return (mudancas[-1] - mudancas[0]) / (len(mudancas) - 1)
+
+    def proximo_intervalo(self, alvo: str, agora: Optional[float] = None) -> float:
+        """
+        Segundos até a próxima verificação do alvo
+
+        Returns:
+            Intervalo efetivo, já limitado a [intervalo_min, intervalo_max]
+        """
+        if not self.adaptativo:
+            return self.intervalo_base
+
+        agora = agora or time.time()
+        with self._lock:
+            intervalo = self._estado_alvo(alvo)['intervalo_atual']
+
+        # Teto pela taxa de mudança aprendida
+        medio = self.intervalo_medio_entre_mudancas(alvo)
+        if medio:
+            intervalo = min(intervalo, medio / self.amostras_por_mudanca)
+
+        intervalo = self._limitar(intervalo)
+
+        # Janelas de publicação esperada: o intervalo delas prevalece sobre o mínimo
+        # global, e uma janela próxima nunca é ultrapassada
+        for janela in self.janelas:
+            if janela['inicio'] <= agora <= janela['fim']:
+                intervalo = min(intervalo, janela['intervalo'])
+            elif agora < janela['inicio'] < agora + intervalo:
+                intervalo = max(1, janela['inicio'] - agora)
+
+        return intervalo
+
+    def resumo(self, alvo: str) -> Dict:
+        """Informações do agendamento do alvo (para o dashboard)"""
+        medio = self.intervalo_medio_entre_mudancas(alvo)
+        return {
+            'adaptativo': self.adaptativo,
+            'intervalo_efetivo_minutos': round(self.proximo_intervalo(alvo) / 60, 2),
+            'intervalo_medio_entre_mudancas_horas': round(medio / 3600, 2) if medio else None,
+            'verificacoes_sem_mudanca': self.estado.get(alvo, {}).get('verificacoes_sem_mudanca', 0)
+        }
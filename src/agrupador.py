@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Módulo de Agrupamento de Alertas
+Consolida mudanças próximas no tempo em um único alerta (janela de agrupamento e resumos periódicos)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+# Timezone de Brasília
+BRASILIA_TZ = ZoneInfo("America/Sao_Paulo")
+
+# Frequências aceitas para os inscritos
+FREQUENCIAS = ('imediato', 'horario', 'diario')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eventos_agrupados (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    canal TEXT NOT NULL,
+    alvo TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    fecha_em REAL NOT NULL,
+    consolidado INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_eventos_abertos ON eventos_agrupados (consolidado, fecha_em);
+"""
+
+
+def consolidar_eventos(eventos: List[Dict]) -> Dict:
+    """
+    Junta vários eventos de mudança de um mesmo alvo em um único alerta
+
+    Returns:
+        Dicionário com os argumentos do alerta (url, palavras_encontradas,
+        mudanca_conteudo, conteudo_resumo, detectado_em, diff, total_mudancas e,
+        se algum evento tiver, anexos)
+    """
+    palavras = []
+    trechos = []
+    anexos = {'adicionados': [], 'removidos': [], 'alterados': []}
+    for evento in eventos:
+        for chave, itens in evento.get('anexos', {}).items():
+            for item in itens:
+                if item not in anexos[chave]:
+                    anexos[chave].append(item)
+        for palavra in evento.get('palavras_encontradas', []):
+            if palavra not in palavras:
+                palavras.append(palavra)
+        if evento.get('diff'):
+            momento = datetime.fromisoformat(evento['detectado_em']).strftime('%d/%m %H:%M')
+            trechos.append(f"[{momento}]\n{evento['diff']}")
+
+    ultimo = eventos[-1]
+    alerta = {
+        'url': ultimo['url'],
+        'palavras_encontradas': palavras,
+        'mudanca_conteudo': any(evento.get('mudanca_conteudo', True) for evento in eventos),
+        'conteudo_resumo': ultimo.get('conteudo_resumo', ''),
+        'detectado_em': ultimo['detectado_em'],
+        'diff': '\n\n'.join(trechos),
+        'total_mudancas': len(eventos)
+    }
+    if any(anexos.values()):
+        alerta['anexos'] = anexos
+    return alerta
+
+
+class AgrupadorAlertas:
+    """
+    Acumula eventos de mudança e os despacha consolidados quando a janela fecha
+
+    Canais:
+        'imediato' - janela de agrupamento por alvo (a partir da primeira mudança)
+        'horario'  - resumo enviado na virada de cada hora
+        'diario'   - resumo enviado uma vez por dia, na hora configurada
+
+    Os eventos ficam no SQLite até serem consolidados, então uma janela aberta
+    sobrevive a reinícios. O despacho é feito por um callback (ex: enfileirar
+    no outbox) com uma chave estável, o que torna um redespacho após crash idempotente.
+    """
+
+    def __init__(
+        self,
+        caminho_db: str,
+        despachar: Callable[[str, str, Dict], None],
+        janela_minutos: float = 0,
+        hora_resumo_diario: int = 8,
+        log: Optional[Callable[[str, str], None]] = None,
+        compartilhado: bool = False
+    ):
+        """
+        Args:
+            caminho_db: Arquivo SQLite (pode ser o mesmo do outbox)
+            despachar: Callback despachar(canal, chave, alerta) chamado ao fechar uma janela
+            janela_minutos: Janela de agrupamento do canal 'imediato' (0 = sem agrupamento)
+            hora_resumo_diario: Hora (Brasília) do resumo diário
+            log: Função opcional log(mensagem, tipo)
+            compartilhado: Banco usado por vários nós do cluster (journal de rollback em vez
+                de WAL, que não funciona entre máquinas)
+        """
+        self.caminho_db = caminho_db
+        self.compartilhado = compartilhado
+        self.despachar = despachar
+        self.janela_minutos = janela_minutos
+        self.hora_resumo_diario = hora_resumo_diario
+        self.log = log or (lambda mensagem, tipo="INFO": print(f"[{tipo}] {mensagem}", flush=True))
+
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        conn = self._conectar()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.caminho_db, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=DELETE" if self.compartilhado else "PRAGMA journal_mode=WAL")
+        return conn
+
+    def _fechamento(self, canal: str, agora: float) -> float:
+        """Momento em que uma nova janela do canal fecha"""
+        momento = datetime.fromtimestamp(agora, BRASILIA_TZ)
+        if canal == 'horario':
+            proxima = momento.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        elif canal == 'diario':
+            proxima = momento.replace(hour=self.hora_resumo_diario, minute=0, second=0, microsecond=0)
+            if proxima <= momento:
+                proxima += timedelta(days=1)
+        else:
+            return agora + self.janela_minutos * 60
+        return proxima.timestamp()
+
+    def registrar(self, canal: str, alvo: str, evento: Dict) -> float:
+        """
+        Adiciona um evento à janela aberta do canal/alvo (ou abre uma nova)
+
+        Returns:
+            Timestamp em que a janela será despachada
+        """
+        agora = time.time()
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            aberta = conn.execute(
+                "SELECT fecha_em FROM eventos_agrupados WHERE canal = ? AND alvo = ? AND consolidado = 0 "
+                "ORDER BY id LIMIT 1",
+                (canal, alvo)
+            ).fetchone()
+            fecha_em = aberta[0] if aberta else self._fechamento(canal, agora)
+            conn.execute(
+                "INSERT INTO eventos_agrupados (canal, alvo, payload, criado_em, fecha_em) VALUES (?, ?, ?, ?, ?)",
+                (canal, alvo, json.dumps(evento, ensure_ascii=False), agora, fecha_em)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return fecha_em
+
+    def processar_vencidos(self) -> int:
+        """
+        Consolida e despacha as janelas que já fecharam
+
+        Returns:
+            Número de alertas consolidados despachados
+        """
+        conn = self._conectar()
+        despachados = 0
+        try:
+            grupos = conn.execute(
+                "SELECT DISTINCT canal, alvo FROM eventos_agrupados WHERE consolidado = 0 AND fecha_em <= ?",
+                (time.time(),)
+            ).fetchall()
+
+            for canal, alvo in grupos:
+                linhas = conn.execute(
+                    "SELECT id, payload FROM eventos_agrupados "
+                    "WHERE canal = ? AND alvo = ? AND consolidado = 0 AND fecha_em <= ? ORDER BY id",
+                    (canal, alvo, time.time())
+                ).fetchall()
+                if not linhas:
+                    continue
+
+                ids = [linha[0] for linha in linhas]
+                alerta = consolidar_eventos([json.loads(linha[1]) for linha in linhas])
+                chave = f"resumo|{canal}|{alvo}|{ids[0]}-{ids[-1]}"
+
+                # Despacha antes de marcar: se cair no meio, o redespacho usa a mesma chave
+                self.despachar(canal, chave, alerta)
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("UPDATE eventos_agrupados SET consolidado = 1 WHERE id = ?", [(i,) for i in ids])
+                conn.execute("COMMIT")
+
+                despachados += 1
+                self.log(f"Resumo '{canal}' com {len(ids)} mudança(s) despachado", "INFO")
+        finally:
+            conn.close()
+        return despachados
+
+    def iniciar(self, intervalo_segundos: float = 15):
+        """Inicia a thread que despacha janelas vencidas (idempotente)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, args=(intervalo_segundos,),
+                                        name="agrupador", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+
+    def _loop(self, intervalo_segundos: float):
+        while not self._parar.is_set():
+            try:
+                self.processar_vencidos()
+            except Exception as e:
+                self.log(f"Erro ao despachar resumos: {e}", "ERRO")
+            self._parar.wait(intervalo_segundos)
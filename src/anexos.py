@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Módulo de Anexos
+Acompanha os links de anexos (PDF) de cada alvo: links novos, removidos e arquivos
+alterados, estes revalidados por HEAD condicional em vez de baixados
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+from urllib.parse import urldefrag, urljoin
+
+import requests
+
+from src.cortesia import ControleCortesia, RequisicaoAdiada
+
+
+class RastreadorAnexos:
+    """
+    Compara os anexos de cada verificação com os da anterior
+
+    - Links que aparecem ou somem da página entram no delta como adicionados/removidos
+    - Anexos que continuam na página são revalidados com HEAD condicional (If-None-Match,
+      If-Modified-Since): 304, ou ETag/Content-Length/Last-Modified iguais, significa
+      arquivo inalterado; o PDF nunca é baixado aqui
+    - No máximo `max_revalidacoes` HEADs por verificação: primeiro os anexos novos (para
+      guardar a referência), depois os conhecidos verificados há mais tempo
+
+    Na primeira verificação de um alvo os anexos viram a referência, sem delta nem HEAD.
+    O novo estado só é gravado em `confirmar`, depois que a mudança foi enfileirada: um
+    crash no meio do caminho faz o delta ser detectado de novo (como o hash do conteúdo).
+    O estado é persistido em JSON (por alvo e por URL do anexo).
+    """
+
+    def __init__(self, caminho_estado: str, config: Optional[Dict] = None,
+                 cortesia: Optional[ControleCortesia] = None, headers: Optional[Dict] = None):
+        """
+        Args:
+            caminho_estado: Arquivo JSON com os anexos conhecidos (ex: data/anexos.json)
+            config: Seção 'anexos' do config.json
+                {
+                    'enabled': bool,                # padrão False
+                    'max_revalidacoes': int,        # HEADs de anexos já conhecidos por verificação
+                    'timeout_segundos': float
+                }
+            cortesia: Limites por host (os HEADs contam como requisições ao host)
+            headers: Headers HTTP das requisições (User-Agent do monitor)
+        """
+        config = config or {}
+        self.caminho_estado = caminho_estado
+        self.max_revalidacoes = config.get('max_revalidacoes', 10)
+        self.timeout = config.get('timeout_segundos', 15)
+        self.cortesia = cortesia
+        self.headers = headers or {}
+
+        self._lock = threading.Lock()
+        self.estado: Dict[str, Dict[str, Dict]] = self._carregar()
+        # Estado calculado por comparar() e ainda não confirmado, por alvo
+        self._pendentes: Dict[str, Dict[str, Dict]] = {}
+
+    def _carregar(self) -> Dict[str, Dict[str, Dict]]:
+        if os.path.exists(self.caminho_estado):
+            try:
+                with open(self.caminho_estado, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Erro ao carregar estado dos anexos: {e}", flush=True)
+        return {}
+
+    def _salvar(self):
+        temporario = self.caminho_estado + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.estado, f, indent=4, ensure_ascii=False)
+        os.replace(temporario, self.caminho_estado)
+
+    @staticmethod
+    def resolver(url_pagina: str, anexos: List[Dict]) -> Dict[str, str]:
+        """URLs absolutas (sem fragmento) dos anexos extraídos -> texto do link"""
+        resolvidos = {}
+        for anexo in anexos:
+            url = urldefrag(urljoin(url_pagina, anexo['href']))[0]
+            if url.startswith(('http://', 'https://')) and url not in resolvidos:
+                resolvidos[url] = anexo['texto']
+        return resolvidos
+
+    def _head(self, url: str, conhecido: Optional[Dict]) -> Optional[Dict]:
+        """
+        HEAD condicional de um anexo
+
+        Returns:
+            {'etag', 'content_length', 'last_modified', 'inalterado'} ou None se não foi
+            possível revalidar agora (erro, HEAD não suportado ou host sem vaga)
+        """
+        headers = dict(self.headers)
+        if conhecido and conhecido.get('etag'):
+            headers['If-None-Match'] = conhecido['etag']
+        if conhecido and conhecido.get('last_modified'):
+            headers['If-Modified-Since'] = conhecido['last_modified']
+        try:
+            with self.cortesia.requisicao(url) if self.cortesia else nullcontext():
+                resposta = requests.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+        except (requests.RequestException, RequisicaoAdiada):
+            return None
+
+        if resposta.status_code == 304:
+            return {'etag': conhecido.get('etag'), 'content_length': conhecido.get('content_length'),
+                    'last_modified': conhecido.get('last_modified'), 'inalterado': True}
+        if resposta.status_code >= 400:
+            return None
+        tamanho = resposta.headers.get('Content-Length', '')
+        meta = {
+            'etag': resposta.headers.get('ETag'),
+            'content_length': int(tamanho) if tamanho.isdigit() else None,
+            'last_modified': resposta.headers.get('Last-Modified'),
+            'inalterado': True
+        }
+        if conhecido:
+            # Só compara o que os dois lados têm; sem nenhum header não há como saber
+            for campo in ('etag', 'content_length', 'last_modified'):
+                if conhecido.get(campo) is not None and meta[campo] is not None and conhecido[campo] != meta[campo]:
+                    meta['inalterado'] = False
+                    break
+        return meta
+
+    def comparar(self, url_pagina: str, anexos: List[Dict]) -> Dict:
+        """
+        Calcula o delta dos anexos da verificação atual (gravado só em confirmar)
+
+        Args:
+            url_pagina: URL do alvo (base dos links relativos)
+            anexos: Lista {'href', 'texto'} extraída da página
+
+        Returns:
+            {'adicionados': [...], 'removidos': [...], 'alterados': [...]}, cada item
+            {'url', 'texto'}; listas vazias na primeira verificação do alvo
+        """
+        atuais = self.resolver(url_pagina, anexos)
+        with self._lock:
+            primeira = url_pagina not in self.estado
+            conhecidos = dict(self.estado.get(url_pagina, {}))
+
+        delta = {'adicionados': [], 'removidos': [], 'alterados': []}
+        agora = time.time()
+        novos_estado = {}
+        restantes = self.max_revalidacoes
+
+        for url, texto in atuais.items():
+            if url in conhecidos:
+                novos_estado[url] = {**conhecidos[url], 'texto': texto}
+                continue
+            novos_estado[url] = {'texto': texto, 'visto_em': agora, 'verificado_em': 0}
+            if primeira:
+                continue
+            delta['adicionados'].append({'url': url, 'texto': texto})
+            if restantes > 0:
+                restantes -= 1
+                meta = self._head(url, None)
+                if meta is not None:
+                    meta.pop('inalterado')
+                    novos_estado[url].update(meta, verificado_em=agora)
+
+        # Revalida os conhecidos verificados há mais tempo
+        permanentes = sorted((url for url in atuais if url in conhecidos),
+                             key=lambda url: conhecidos[url].get('verificado_em', 0))
+        for url in permanentes[:max(0, restantes)]:
+            meta = self._head(url, conhecidos[url])
+            if meta is None:
+                continue
+            if not meta.pop('inalterado'):
+                delta['alterados'].append({'url': url, 'texto': atuais[url]})
+            novos_estado[url].update(meta, verificado_em=agora)
+
+        for url, conhecido in conhecidos.items():
+            if url not in atuais:
+                delta['removidos'].append({'url': url, 'texto': conhecido.get('texto', '')})
+
+        with self._lock:
+            self._pendentes[url_pagina] = novos_estado
+        return delta
+
+    def confirmar(self, url_pagina: str):
+        """Grava o estado calculado na última comparação do alvo"""
+        with self._lock:
+            if url_pagina in self._pendentes:
+                self.estado[url_pagina] = self._pendentes.pop(url_pagina)
+                self._salvar()
+
+    @staticmethod
+    def total(delta: Dict) -> int:
+        return sum(len(itens) for itens in delta.values())
+
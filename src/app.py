@@ -10,16 +10,30 @@ import threading
 import json
 import os
 import sys
+import hmac
+import hashlib
+from functools import wraps
+from concurrent.futures import wait
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import time
 
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.monitor import MonitorEdital
-from src.email_notifier import EmailNotifier
+# src.monitor, src.email_notifier, src.webhook_notifier, src.extracao e src.anexos (requests,
+# BeautifulSoup, lxml, smtplib) são importados em monitor_loop: o servidor sobe sem eles
+from src.outbox import OutboxNotificacoes
+from src.agrupador import AgrupadorAlertas, FREQUENCIAS
+from src.agendador import AgendadorAdaptativo
+from src.profiler import MedidorPicoRSS, PerfilVerificacao, listar_perfis
+from src.escalonador import EscalonadorVerificacoes
+from src.cortesia import ControleCortesia, RequisicaoAdiada
+from src.coordenacao import criar_coordenador
+from src.resiliencia import RegistroDisjuntores, calcular_backoff, classificar_erro
+from src.normalizacao import config_do_alvo
+from src.similaridade import mudanca_trivial
 
 # Timezone de Brasília
 BRASILIA_TZ = ZoneInfo("America/Sao_Paulo")
@@ -35,6 +49,7 @@ LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
 STATIC_DIR = os.path.join(BASE_DIR, 'static')
+PROFILES_DIR = os.path.join(LOGS_DIR, 'profiles')
 
 # Cria diretórios se não existirem
 os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -51,6 +66,15 @@ CONFIG_FILE = os.path.join(CONFIG_DIR, 'config.json')
 SUBSCRIBERS_FILE = os.path.join(DATA_DIR, 'subscribers.json')
 HISTORICO_FILE = os.path.join(DATA_DIR, 'historico.json')
 HASH_FILE = os.path.join(DATA_DIR, 'hash_anterior.txt')
+HASHES_ALVOS_FILE = os.path.join(DATA_DIR, 'hashes_alvos.json')
+OUTBOX_DB = os.path.join(DATA_DIR, 'outbox.db')
+AGENDAMENTO_FILE = os.path.join(DATA_DIR, 'agendamento.json')
+VOLATEIS_FILE = os.path.join(DATA_DIR, 'volateis.json')
+ANEXOS_FILE = os.path.join(DATA_DIR, 'anexos.json')
+TEXTO_PDF_DIR = os.path.join(DATA_DIR, 'texto_pdf')
+SIMHASH_FILE = os.path.join(DATA_DIR, 'simhash.json')
+DETECCOES_FILE = os.path.join(DATA_DIR, 'deteccoes.json')
+CONTEUDO_DIR = os.path.join(DATA_DIR, 'conteudo_anterior')
 LOGS_MAX = 100
 
 # Estado global do monitor
@@ -64,10 +88,41 @@ monitor_state = {
     'mudancas_detectadas': 0,
     'thread': None,
     'thread_id': None,  # ID único da thread ativa
-    'monitor': None,
-    'email_notifier': None
+    'monitor': None,  # Monitor do alvo principal ('url' do config)
+    'monitores': {},  # url -> MonitorEdital de cada alvo
+    'escalonador': None,  # Heap de vencimentos de todos os alvos
+    'coordenador': None,  # Divisão dos alvos entre nós (config 'cluster')
+    'extrator': None,  # Pool de processos para o parsing (config 'extracao_processos')
+    'anexos': None,  # Links de anexos (PDF) de cada alvo (config 'anexos')
+    'texto_pdf': None,  # Pool de extração do texto dos anexos (config 'anexos.texto_pdf')
+    'significancia': {},  # url -> seção 'significancia' efetiva do alvo
+    'deteccoes': {},  # url -> número de mudanças já detectadas (compõe a chave do alerta)
+    'palavras_alvos': {},  # url -> palavras-chave da última verificação (só em memória)
+    'email_notifier': None,
+    'outbox': None,  # Fila persistente de notificações (entregue em background)
+    'agrupador': None,  # Janelas de agrupamento e resumos horário/diário
+    'webhook_notifier': None,
+    'agendador': None,  # Intervalo adaptativo por alvo
+    'intervalo_efetivo_segundos': None,
+    'disjuntores': None,  # Circuit breakers por host
+    'falhas_por_alvo': {},  # Falhas consecutivas de cada alvo (base do backoff)
+    'ultimas_verificacoes': {},  # url -> resultado da última verificação
+    'medidor_rss': MedidorPicoRSS(),  # Pico de RSS de cada verificação
+    'pico_rss_mib': None,  # Pico de RSS da última verificação do alvo principal
+    'proxima_tentativa': None,  # Retentativa agendada após erro (backoff)
+    'ultimo_erro_tipo': None,
+    'profiling_restante': 0,  # Próximas N verificações executadas sob profiler
+    'profiling_ativo': False  # Uma verificação perfilada por vez (ver reservar_perfil)
 }
 
+# Serializa leitura-modificação-escrita dos arquivos de dados (verificações rodam em paralelo)
+arquivos_lock = threading.Lock()
+profiling_lock = threading.Lock()
+
+ACESSO_NEGADO = {'error': 'Acesso negado. Esta operacao requer privilegios de administrador.'}
+PROFILING_MAX_VERIFICACOES = 20
+CHECK_NOW_TIMEOUT_MAX = 300
+
 
 def load_config() -> Dict:
     """Carrega configuração do arquivo JSON"""
@@ -123,15 +178,45 @@ def load_subscribers() -> List[str]:
     return []
 
 
-def save_subscribers(emails: List[str]):
-    """Salva lista de emails inscritos"""
+def save_subscribers(emails: List[str], frequencias: Optional[Dict[str, str]] = None):
+    """
+    Salva lista de emails inscritos
+
+    Args:
+        emails: Emails inscritos
+        frequencias: Frequência de cada email ('horario'/'diario'); se None, mantém as já salvas
+    """
+    if frequencias is None:
+        frequencias = load_frequencias()
+    emails_lower = {e.lower() for e in emails}
+    frequencias = {e: f for e, f in frequencias.items() if e in emails_lower and f != 'imediato'}
+
     with open(SUBSCRIBERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump({'emails': emails}, f, indent=4, ensure_ascii=False)
+        json.dump({'emails': emails, 'frequencias': frequencias}, f, indent=4, ensure_ascii=False)
+
+
+def load_frequencias() -> Dict[str, str]:
+    """Carrega a frequência de alertas escolhida por cada inscrito (ausente = 'imediato')"""
+    if os.path.exists(SUBSCRIBERS_FILE):
+        try:
+            with open(SUBSCRIBERS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get('frequencias', {})
+        except Exception as e:
+            print(f"Erro ao carregar frequências: {e}", flush=True)
+    return {}
+
+
+def inscritos_por_frequencia(frequencia: str) -> List[str]:
+    """Retorna os inscritos que recebem alertas na frequência indicada"""
+    frequencias = load_frequencias()
+    return [e for e in load_subscribers() if frequencias.get(e.lower(), 'imediato') == frequencia]
 
 
-def add_subscriber(email: str) -> bool:
+def add_subscriber(email: str, frequencia: str = 'imediato') -> bool:
     """Adiciona um email à lista de inscritos"""
-    if not email or '@' not in email:
+    from src.email_notifier import endereco_valido
+
+    if not endereco_valido(email) or frequencia not in FREQUENCIAS:
         return False
 
     emails = load_subscribers()
@@ -139,7 +224,9 @@ def add_subscriber(email: str) -> bool:
 
     if email_lower not in [e.lower() for e in emails]:
         emails.append(email_lower)
-        save_subscribers(emails)
+        frequencias = load_frequencias()
+        frequencias[email_lower] = frequencia
+        save_subscribers(emails, frequencias)
         add_log("Novo inscrito adicionado com sucesso", "INFO")
         return True
     return False
@@ -181,8 +268,12 @@ def save_historico(atividades: List[Dict]):
         json.dump({'atividades': atividades}, f, indent=4, ensure_ascii=False)
 
 
-def adicionar_atividade(palavras_encontradas: List[str], conteudo_resumo: str = ""):
-    """Adiciona uma nova atividade ao histórico"""
+def adicionar_atividade(palavras_encontradas: List[str], conteudo_resumo: str = "", url: Optional[str] = None,
+                        anexos: Optional[Dict] = None, similaridade: Optional[float] = None):
+    """
+    Adiciona uma nova atividade ao histórico (anexos: delta dos links de anexos, se houver;
+    similaridade: SimHash em relação à versão anterior, se conhecida)
+    """
     timestamp = get_brasilia_time().strftime("%Y-%m-%d %H:%M:%S")
 
     atividade = {
@@ -191,15 +282,22 @@ def adicionar_atividade(palavras_encontradas: List[str], conteudo_resumo: str =
         'conteudo_resumo': conteudo_resumo,
         'tipo': 'MUDANCA'
     }
+    if url:
+        atividade['url'] = url
+    if anexos:
+        atividade['anexos'] = anexos
+    if similaridade is not None:
+        atividade['similaridade'] = round(similaridade, 3)
 
-    atividades = load_historico()
-    atividades.insert(0, atividade)  # Adiciona no início
+    with arquivos_lock:
+        atividades = load_historico()
+        atividades.insert(0, atividade)  # Adiciona no início
 
-    # Limita a 50 atividades mais recentes
-    if len(atividades) > 50:
-        atividades = atividades[:50]
+        # Limita a 50 atividades mais recentes
+        if len(atividades) > 50:
+            atividades = atividades[:50]
 
-    save_historico(atividades)
+        save_historico(atividades)
 
 
 def load_hash_anterior() -> Optional[str]:
@@ -220,6 +318,86 @@ def save_hash_anterior(hash_str: str):
         f.write(hash_str)
 
 
+def load_hashes_alvos() -> Dict[str, str]:
+    """Carrega o hash anterior dos alvos adicionais (url -> hash)"""
+    if os.path.exists(HASHES_ALVOS_FILE):
+        try:
+            with open(HASHES_ALVOS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar hashes dos alvos: {e}", flush=True)
+    return {}
+
+
+def save_hash_alvo(url: str, hash_str: str):
+    """Salva o hash anterior de um alvo adicional"""
+    with arquivos_lock:
+        hashes = load_hashes_alvos()
+        hashes[url] = hash_str
+        with open(HASHES_ALVOS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(hashes, f, indent=4, ensure_ascii=False)
+
+
+def load_deteccoes() -> Dict[str, int]:
+    """Carrega o número de mudanças detectadas de cada alvo (url -> contagem)"""
+    if os.path.exists(DETECCOES_FILE):
+        try:
+            with open(DETECCOES_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar contagem de detecções: {e}", flush=True)
+    return {}
+
+
+def save_deteccao_alvo(url: str, sequencia: int):
+    """Salva o número de mudanças detectadas de um alvo"""
+    with arquivos_lock:
+        deteccoes = load_deteccoes()
+        deteccoes[url] = sequencia
+        with open(DETECCOES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(deteccoes, f, indent=4, ensure_ascii=False)
+
+
+def load_volateis() -> Dict[str, List[Dict]]:
+    """Carrega os trechos voláteis aprendidos de cada alvo (url -> trechos)"""
+    if os.path.exists(VOLATEIS_FILE):
+        try:
+            with open(VOLATEIS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar trechos voláteis: {e}", flush=True)
+    return {}
+
+
+def save_volateis_alvo(url: str, trechos: List[Dict]):
+    """Salva os trechos voláteis aprendidos de um alvo"""
+    with arquivos_lock:
+        volateis = load_volateis()
+        volateis[url] = trechos
+        with open(VOLATEIS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(volateis, f, indent=4, ensure_ascii=False)
+
+
+def load_simhashes() -> Dict[str, str]:
+    """Carrega o SimHash do último conteúdo de cada alvo (url -> impressão)"""
+    if os.path.exists(SIMHASH_FILE):
+        try:
+            with open(SIMHASH_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Erro ao carregar impressões SimHash: {e}", flush=True)
+    return {}
+
+
+def save_simhash_alvo(url: str, impressao: str):
+    """Salva o SimHash do último conteúdo de um alvo"""
+    with arquivos_lock:
+        impressoes = load_simhashes()
+        impressoes[url] = impressao
+        with open(SIMHASH_FILE, 'w', encoding='utf-8') as f:
+            json.dump(impressoes, f, indent=4, ensure_ascii=False)
+
+
 def add_log(mensagem: str, tipo: str = "INFO"):
     """Adiciona log ao estado global"""
     timestamp = get_brasilia_time().strftime("%Y-%m-%d %H:%M:%S")
@@ -238,6 +416,26 @@ def add_log(mensagem: str, tipo: str = "INFO"):
     print(f"[{timestamp}] [{tipo}] {mensagem}", flush=True)
 
 
+def requer_admin(func):
+    """
+    Decorator para endpoints administrativos
+
+    Exige o header X-Admin-Token igual ao token configurado em MONITOR_ADMIN_TOKEN
+    (variável de ambiente) ou em 'admin_token' no config.json. Sem token configurado,
+    o endpoint permanece bloqueado.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token_configurado = os.environ.get('MONITOR_ADMIN_TOKEN') or load_config().get('admin_token', '')
+        token_recebido = request.headers.get('X-Admin-Token', '')
+
+        if not token_configurado or not hmac.compare_digest(token_recebido.encode(), token_configurado.encode()):
+            return jsonify(ACESSO_NEGADO), 403
+
+        return func(*args, **kwargs)
+    return wrapper
+
+
 def iniciar_monitoramento():
     """Inicia o monitoramento (uso interno)"""
     import uuid
@@ -271,129 +469,605 @@ def parar_monitoramento():
 
     monitor_state['running'] = False
     monitor_state['thread_id'] = None
+    if monitor_state['escalonador']:
+        monitor_state['escalonador'].parar()
+    if monitor_state['coordenador']:
+        monitor_state['coordenador'].parar()
+    if monitor_state['extrator']:
+        monitor_state['extrator'].parar()
+        monitor_state['extrator'] = None
+    if monitor_state['texto_pdf']:
+        monitor_state['texto_pdf'].parar()
+        monitor_state['texto_pdf'] = None
+    if monitor_state['agendador']:
+        # Grava o aprendizado ainda pendente (as verificações sem mudança são gravadas em lote)
+        monitor_state['agendador'].salvar()
     add_log("Monitoramento parado", "ALERTA")
     return True
 
 
 def iniciar_monitoramento_automatico():
-    """Inicia o monitoramento automaticamente ao startar a aplicação"""
-    # Aguarda 2 segundos para garantir que o Flask está completamente iniciado
-    time.sleep(2)
+    """
+    Inicia o monitoramento automaticamente ao startar a aplicação
+
+    Chamada por servir() assim que o socket do servidor está aberto: conexões ao
+    dashboard já são aceitas enquanto o monitor carrega seus módulos e faz a primeira verificação.
+    """
     iniciar_monitoramento()
 
 
+def servir(host: str, porta: int, ao_iniciar: Optional[Callable[[], None]] = None):
+    """
+    Executa o servidor web
+
+    O socket é aberto antes de ao_iniciar() ser chamada (sinal de prontidão), e o
+    servidor passa a atender logo em seguida.
+    """
+    from werkzeug.serving import make_server
+
+    servidor = make_server(host, porta, app, threaded=True)
+    if ao_iniciar:
+        ao_iniciar()
+    try:
+        servidor.serve_forever()
+    finally:
+        servidor.server_close()
+
+
+def notificar_mudanca(chave_alerta: str, evento: Dict, imediato: bool = True):
+    """
+    Distribui uma mudança conforme a frequência escolhida por cada inscrito
+
+    Inscritos 'imediato' recebem o alerta na hora, ou ao fim da janela de agrupamento
+    quando 'agrupamento_minutos' está configurado. Inscritos 'horario' e 'diario'
+    recebem um resumo consolidado. Com imediato=False (mudança trivial, ver
+    'significancia') a mudança só entra nos resumos.
+    """
+    url = evento['url']
+    agrupador = monitor_state['agrupador']
+
+    imediatos = inscritos_por_frequencia('imediato') if imediato else []
+    if imediatos:
+        if agrupador.janela_minutos > 0:
+            fecha_em = agrupador.registrar('imediato', url, evento)
+            horario = datetime.fromtimestamp(fecha_em, BRASILIA_TZ).strftime("%H:%M:%S")
+            add_log(f"Mudança agrupada - alerta consolidado será enviado às {horario}", "INFO")
+        else:
+            novas = monitor_state['outbox'].enfileirar(chave_alerta, evento, imediatos)
+            add_log(f"Notificação enfileirada para {novas} inscrito(s)", "INFO")
+
+    for frequencia in ('horario', 'diario'):
+        if inscritos_por_frequencia(frequencia):
+            agrupador.registrar(frequencia, url, evento)
+
+    if not load_subscribers():
+        add_log("Mudança detectada mas nenhum email inscrito para notificar", "ALERTA")
+
+
+def despachar_resumo(canal: str, chave: str, alerta: Dict):
+    """
+    Enfileira um alerta consolidado pelo agrupador para os inscritos do canal
+
+    Em cluster, as janelas ficam no banco compartilhado e qualquer nó pode consolidá-las:
+    a chave do resumo é reivindicada no backend e só o primeiro nó a envia.
+    """
+    if monitor_state['coordenador'] and not monitor_state['coordenador'].reivindicar_notificacao(chave):
+        return
+    destinatarios = inscritos_por_frequencia(canal)
+    if destinatarios and monitor_state['outbox']:
+        novas = monitor_state['outbox'].enfileirar(chave, alerta, destinatarios)
+        add_log(f"Alerta consolidado ({alerta['total_mudancas']} mudança(s)) enfileirado para {novas} inscrito(s)", "INFO")
+
+
+def executar_verificacao(url: str) -> bool:
+    """
+    Executa uma verificação completa: busca, análise, histórico e notificação
+
+    Returns:
+        True se houve mudança no conteúdo ou nos anexos
+    """
+    # Busca e processa página
+    monitor = monitor_state['monitores'][url]
+    principal = monitor is monitor_state['monitor']
+    # (com 'extracao_processos', o parsing roda no pool de processos e só o resultado volta)
+    analise = monitor.analisar_pagina(monitor_state['extrator'])
+    conteudo = analise['conteudo']
+
+    # Verifica palavras-chave
+    palavras_encontradas = analise['palavras_encontradas']
+
+    # Verifica mudanças
+    hash_anterior = monitor.hash_anterior
+    conteudo_anterior = monitor.conteudo_anterior
+    simhash_salvo = monitor.simhash_anterior
+    mudanca_conteudo, hash_atual = monitor.verificar_mudancas(conteudo)
+    similaridade = monitor.similaridade
+
+    # Trechos que mudam a cada verificação passam a ser mascarados antes do hash
+    if monitor.volateis_novos:
+        for trecho in monitor.volateis_novos:
+            add_log(f"Trecho volátil ignorado a partir de agora: {monitor.normalizador.descrever(trecho)}", "INFO")
+        save_volateis_alvo(url, monitor.normalizador.aprendidos)
+
+    # Links de anexos novos, removidos ou com arquivo alterado (HEAD condicional)
+    delta_anexos = None
+    rastreador = monitor_state['anexos']
+    if rastreador:
+        delta = rastreador.comparar(url, analise.get('anexos', []))
+        if rastreador.total(delta):
+            delta_anexos = delta
+            add_log(f"Anexos: {len(delta['adicionados'])} novo(s), {len(delta['removidos'])} removido(s), "
+                    f"{len(delta['alterados'])} alterado(s)", "ALERTA")
+            if monitor_state['texto_pdf']:
+                buscar_palavras_anexos(monitor, delta['adicionados'] + delta['alterados'])
+    mudanca = mudanca_conteudo or delta_anexos is not None
+
+    # O hash exato decide se mudou; o SimHash diz o quanto. Mudanças triviais (acima do
+    # limiar do alvo) não disparam o alerta imediato; anexos e palavras-chave que passaram a
+    # aparecer sempre contam como significativos. Sem a verificação anterior em memória
+    # (após reiniciar), todas as palavras encontradas contam como novas.
+    palavras_anteriores = monitor_state['palavras_alvos'].get(url, [])
+    palavras_novas = [palavra for palavra in palavras_encontradas if palavra not in palavras_anteriores]
+    monitor_state['palavras_alvos'][url] = palavras_encontradas
+    trivial = delta_anexos is None and mudanca_trivial(similaridade, monitor_state['significancia'].get(url),
+                                                       palavras_novas)
+
+    # Atualiza estado com palavras encontradas (para dashboard)
+    if principal:
+        monitor_state['palavras_encontradas'] = palavras_encontradas
+
+    # Registra palavras-chave encontradas (apenas informativo)
+    if palavras_encontradas:
+        add_log(f"Palavras-chave no site: {', '.join(palavras_encontradas)}", "INFO")
+
+    # IMPORTANTE: Só envia notificação quando houver MUDANÇA REAL no conteúdo ou nos anexos
+    if mudanca:
+        monitor_state['mudancas_detectadas'] += 1
+        if mudanca_conteudo:
+            add_log("MUDANÇA NO CONTEÚDO DETECTADA!", "ALERTA")
+            if similaridade is not None:
+                add_log(f"Similaridade com a versão anterior: {similaridade:.1%}", "INFO")
+
+        # Cria resumo do conteúdo (primeiros 300 caracteres)
+        conteudo_resumo = conteudo[:300].strip() if len(conteudo) > 300 else conteudo.strip()
+
+        # Adiciona atividade ao histórico
+        adicionar_atividade(palavras_encontradas, conteudo_resumo, url if not principal else None, delta_anexos,
+                            similaridade)
+        add_log("Mudança registrada no histórico de atividades", "INFO")
+
+        evento = {
+            'url': url,
+            'palavras_encontradas': palavras_encontradas,
+            'mudanca_conteudo': mudanca_conteudo,
+            'conteudo_resumo': conteudo_resumo,
+            'detectado_em': get_brasilia_time().isoformat(),
+            'diff': monitor.gerar_diff(monitor.normalizar(conteudo_anterior), monitor.normalizar(conteudo))
+                    if mudanca_conteudo and conteudo_anterior else ''
+        }
+        deteccao = f"{url}|{hash_anterior}|{hash_atual}"
+        if delta_anexos:
+            evento['anexos'] = delta_anexos
+            # Mudanças só nos anexos mantêm o hash: o delta diferencia as chaves
+            deteccao += '|' + hashlib.sha256(json.dumps(delta_anexos, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+        # A sequência da detecção diferencia uma volta A->B->A->B (nova mudança, nova chave) do
+        # replay após um crash (mesma sequência, mesma chave: o outbox ignora a duplicata).
+        # Em cluster, a sequência fica no backend compartilhado e é incrementada na mesma
+        # transação da reivindicação: só um nó notifica, e o novo dono continua a contagem.
+        notificar = True
+        if monitor_state['coordenador']:
+            sequencia, notificar = monitor_state['coordenador'].reivindicar_deteccao(url, deteccao)
+            if not notificar:
+                add_log("Mudança já notificada por outro nó do cluster", "INFO")
+        else:
+            sequencia = monitor_state['deteccoes'].get(url, 0) + 1
+        chave_alerta = f"{deteccao}|{sequencia}"
+
+        # Enfileira notificação APENAS quando há mudança. Enfileirar antes de salvar o hash
+        # garante que um crash aqui re-detecta a mudança, e a chave idempotente evita duplicatas.
+        if notificar and monitor_state['outbox']:
+            if trivial:
+                add_log(f"Mudança trivial (similaridade {similaridade:.1%}) - sem alerta imediato, "
+                        f"apenas nos resumos", "INFO")
+            notificar_mudanca(chave_alerta, evento, imediato=not trivial)
+
+        # Webhooks recebem o evento imediatamente, em background
+        if notificar and monitor_state['webhook_notifier']:
+            monitor_state['webhook_notifier'].notificar({
+                'tipo': 'mudanca',
+                'id': hashlib.sha256(chave_alerta.encode('utf-8')).hexdigest()[:32],
+                **evento,
+                'similaridade': similaridade,
+                'significativa': not trivial
+            })
+
+        # Gravada antes do hash: um crash entre os dois repete o alerta em vez de perdê-lo
+        monitor_state['deteccoes'][url] = sequencia
+        save_deteccao_alvo(url, sequencia)
+    else:
+        add_log("Nenhuma mudança detectada - site sem alterações", "INFO")
+
+    # Salva hash atual (mesmo sem mudança, para manter sincronizado entre reinicializações)
+    if rastreador:
+        rastreador.confirmar(url)
+    if monitor.simhash_anterior != simhash_salvo:
+        save_simhash_alvo(url, monitor.simhash_anterior)
+    if principal:
+        save_hash_anterior(monitor.hash_anterior)
+    else:
+        save_hash_alvo(url, monitor.hash_anterior)
+    if monitor_state['coordenador']:
+        monitor_state['coordenador'].backend.salvar_hash(url, monitor.hash_anterior)
+
+    return mudanca
+
+
+def buscar_palavras_anexos(monitor, itens: List[Dict]):
+    """
+    Busca as palavras-chave do alvo no texto dos anexos novos ou alterados
+
+    Cada item do delta recebe 'palavras_encontradas' (ou 'erro'), que seguem para o
+    alerta e para o histórico. Anexos além do limite por verificação ficam sem análise.
+    """
+    resultados = monitor_state['texto_pdf'].processar([item['url'] for item in itens], monitor.palavras_chave)
+    for item in itens:
+        resultado = resultados.get(item['url'])
+        if resultado is None:
+            continue
+        if 'erro' in resultado:
+            item['erro'] = resultado['erro']
+            add_log(f"Não foi possível ler o anexo {item['url']}: {resultado['erro']}", "ERRO")
+        else:
+            item['palavras_encontradas'] = resultado['palavras_encontradas']
+            if resultado['palavras_encontradas']:
+                add_log(f"Palavras-chave no anexo {item['texto'] or item['url']}: "
+                        f"{', '.join(resultado['palavras_encontradas'])}", "ALERTA")
+
+
+def carregar_alvos(config: Dict) -> List[Dict]:
+    """
+    Lista de alvos monitorados
+
+    O alvo principal é o 'url' do config; a lista opcional 'alvos' acrescenta outras
+    páginas, cada uma com suas próprias 'palavras_chave' (padrão: as globais). A seção
+    'normalizacao' e 'significancia' de um alvo sobrepõem, chave a chave, as globais.
+    """
+    normalizacao = config.get('normalizacao')
+    significancia = config.get('significancia')
+    alvos = [{'url': config['url'], 'palavras_chave': config['palavras_chave'], 'normalizacao': normalizacao,
+              'significancia': significancia}]
+    vistos = {config['url']}
+    for alvo in config.get('alvos', []):
+        if alvo.get('url') and alvo['url'] not in vistos:
+            vistos.add(alvo['url'])
+            alvos.append({'url': alvo['url'], 'palavras_chave': alvo.get('palavras_chave', config['palavras_chave']),
+                          'normalizacao': config_do_alvo(normalizacao, alvo.get('normalizacao')),
+                          'significancia': config_do_alvo(significancia, alvo.get('significancia'))})
+    return alvos
+
+
+def registrar_resultado(url: str, status: str, inicio: float, **dados):
+    """Guarda o resultado da última verificação do alvo (consultado por /api/check-now)"""
+    monitor_state['ultimas_verificacoes'][url] = {
+        'url': url,
+        'status': status,
+        'verificado_em': get_brasilia_time().strftime("%Y-%m-%d %H:%M:%S"),
+        'duracao_ms': round((time.monotonic() - inicio) * 1000),
+        **dados
+    }
+
+
+def sincronizar_estado_cluster(url: str):
+    """Carrega o último hash e a sequência de detecções gravados por qualquer nó (o alvo pode ter mudado de dono)"""
+    monitor = monitor_state['monitores'][url]
+    estado = monitor_state['coordenador'].backend.carregar_estado(url)
+    if not estado:
+        return
+    if estado['sequencia'] > monitor_state['deteccoes'].get(url, 0):
+        monitor_state['deteccoes'][url] = estado['sequencia']
+        save_deteccao_alvo(url, estado['sequencia'])
+    hash_compartilhado = estado['hash']
+    if hash_compartilhado and hash_compartilhado != monitor.hash_anterior:
+        monitor.hash_anterior = hash_compartilhado
+        # O conteúdo em memória é de antes da troca de dono: não serve de base para o diff
+        monitor.conteudo_anterior = None
+        monitor.simhash_anterior = None
+
+
+def reservar_perfil() -> bool:
+    """
+    Reserva o perfil para a verificação atual, se houver perfis pendentes
+
+    Só uma verificação perfilada por vez (o cProfile do Python 3.12+ não aceita perfis
+    simultâneos): com outra em andamento, esta segue sem perfil e não consome a contagem.
+    """
+    with profiling_lock:
+        if monitor_state['profiling_restante'] <= 0 or monitor_state['profiling_ativo']:
+            return False
+        monitor_state['profiling_restante'] -= 1
+        monitor_state['profiling_ativo'] = True
+        return True
+
+
+def verificar_alvo(url: str) -> float:
+    """
+    Executa a verificação agendada de um alvo (chamada pelo escalonador)
+
+    Returns:
+        Segundos até a próxima verificação do alvo: intervalo do agendador em caso
+        de sucesso, backoff com jitter após erro, ou o fim da pausa do circuito aberto
+    """
+    principal = url == monitor_state['monitor'].url
+    disjuntores = monitor_state['disjuntores']
+    disjuntor = disjuntores.para_url(url)
+    agendador = monitor_state['agendador']
+    coordenador = monitor_state['coordenador']
+    inicio = time.monotonic()
+
+    # Em cluster, só o nó dono do alvo (com o lease) verifica; os demais reavaliam
+    # a cada heartbeat para assumir o alvo se o anel mudar
+    if coordenador:
+        if not coordenador.responsavel(url):
+            registrar_resultado(url, 'outro_no', inicio)
+            return coordenador.intervalo_heartbeat
+        sincronizar_estado_cluster(url)
+
+    # Circuito aberto: nenhuma requisição ao host até a hora da sonda
+    if not disjuntor.permitir():
+        registrar_resultado(url, 'circuito_aberto', inicio)
+        return max(5, disjuntor.segundos_ate_sonda())
+
+    try:
+        monitor_state['current_check'] += 1
+        check_num = monitor_state['current_check']
+
+        if len(monitor_state['monitores']) > 1:
+            add_log(f"Verificação #{check_num} - {url}", "INFO")
+        else:
+            add_log(f"Verificação #{check_num}", "INFO")
+        monitor_state['last_check'] = get_brasilia_time().strftime("%Y-%m-%d %H:%M:%S")
+
+        with monitor_state['medidor_rss'].medir() as memoria:
+            if reservar_perfil():
+                # Perfila esta verificação (toggle administrativo em /api/admin/profiling)
+                try:
+                    with PerfilVerificacao(PROFILES_DIR, check_num) as perfil:
+                        mudanca = executar_verificacao(url)
+                finally:
+                    with profiling_lock:
+                        monitor_state['profiling_ativo'] = False
+                if perfil.erro:
+                    add_log(f"Perfil da verificação #{check_num} não foi salvo: {perfil.erro}", "ALERTA")
+                else:
+                    add_log(f"Perfil da verificação #{check_num} salvo em logs/profiles/{perfil.nome_base}", "INFO")
+            else:
+                mudanca = executar_verificacao(url)
+
+        registrar_resultado(url, 'ok', inicio, mudanca=mudanca,
+                            hash=monitor_state['monitores'][url].hash_anterior, **memoria)
+        if principal:
+            monitor_state['pico_rss_mib'] = memoria['pico_rss_mib']
+        if monitor_state['monitores'][url].memoria_limitada:
+            add_log(f"Pico de memória do processo na verificação: {memoria['pico_rss_mib']} MiB", "INFO")
+        if monitor_state['falhas_por_alvo'].pop(url, 0):
+            add_log(f"Conexão com {disjuntor.host} restabelecida", "SUCESSO")
+        disjuntor.registrar_sucesso()
+
+        # Calcula próxima verificação
+        agendador.registrar_verificacao(url, mudanca)
+        intervalo_segundos = agendador.proximo_intervalo(url)
+
+        if principal:
+            monitor_state['proxima_tentativa'] = None
+            monitor_state['ultimo_erro_tipo'] = None
+            monitor_state['intervalo_efetivo_segundos'] = int(intervalo_segundos)
+            proxima = get_brasilia_time().timestamp() + intervalo_segundos
+            monitor_state['next_check'] = datetime.fromtimestamp(proxima, BRASILIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+            add_log(f"Próxima verificação: {monitor_state['next_check']}", "INFO")
+
+        return intervalo_segundos
+
+    except RequisicaoAdiada as e:
+        # Limite de cortesia do host: apenas reagenda, sem contar como falha do site. A
+        # requisição não foi feita, então a sonda do circuito (se era uma) fica livre
+        disjuntor.liberar_sonda()
+        add_log(str(e), "INFO")
+        registrar_resultado(url, 'adiada', inicio, erro=str(e))
+        return e.segundos
+
+    except Exception as e:
+        add_log(f"Erro: {str(e)}" if principal else f"Erro em {url}: {str(e)}", "ERRO")
+        registrar_resultado(url, 'erro', inicio, erro=str(e))
+
+        # Backoff exponencial com jitter conforme a classe do erro
+        # (contagem por alvo: o circuito é do host e zera com o sucesso de outra página dele)
+        tipo_erro = classificar_erro(e)
+        falhas = monitor_state['falhas_por_alvo'].get(url, 0) + 1
+        monitor_state['falhas_por_alvo'][url] = falhas
+        estado_antes = disjuntor.estado
+        disjuntor.registrar_falha(str(e))
+
+        if disjuntor.estado == 'aberto':
+            espera = disjuntor.segundos_ate_sonda()
+            if estado_antes != 'aberto':
+                add_log(f"Circuito aberto para {disjuntor.host} após {disjuntor.falhas_consecutivas} "
+                        f"falha(s) seguidas; nova sonda em {espera / 60:.1f} minutos", "ALERTA")
+        else:
+            espera = calcular_backoff(
+                falhas, tipo_erro,
+                maximo_segundos=disjuntores.backoff_max_segundos,
+                retry_after=getattr(e, 'retry_after', None)
+            )
+            add_log(f"Nova tentativa em {int(espera)} segundos...", "INFO")
+
+        if principal:
+            monitor_state['ultimo_erro_tipo'] = tipo_erro
+            proxima = get_brasilia_time().timestamp() + espera
+            monitor_state['proxima_tentativa'] = datetime.fromtimestamp(proxima, BRASILIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+            monitor_state['next_check'] = monitor_state['proxima_tentativa']
+
+        return espera
+
+
 def monitor_loop(thread_id):
     """Loop principal de monitoramento"""
+    from src.monitor import MonitorEdital
+    from src.email_notifier import EmailNotifier
+    from src.webhook_notifier import WebhookNotifier
+    from src.extracao import ExtratorProcessos
+    from src.anexos import RastreadorAnexos
+    from src.texto_pdf import ExtratorTextoPdf, PYPDF_DISPONIVEL
+
     config = load_config()
 
     url = config['url']
-    palavras_chave = config['palavras_chave']
     intervalo_minutos = config['intervalo_minutos']
-    intervalo_segundos = intervalo_minutos * 60
-
-    # Inicializa monitor
-    monitor_state['monitor'] = MonitorEdital(url, palavras_chave, intervalo_minutos)
+    alvos = carregar_alvos(config)
+
+    # Intervalo efetivo: fixo ou adaptativo conforme a seção 'agendamento'
+    agendador = AgendadorAdaptativo(AGENDAMENTO_FILE, intervalo_minutos, config.get('agendamento'))
+    monitor_state['agendador'] = agendador
+    monitor_state['disjuntores'] = RegistroDisjuntores(config.get('resiliencia'))
+    monitor_state['falhas_por_alvo'] = {}
+
+    # Inicializa um monitor por alvo; o principal continua em monitor_state['monitor'].
+    # Todos compartilham os limites por host (concorrência, intervalo mínimo, Retry-After)
+    cortesia = ControleCortesia(config.get('cortesia'))
+    volateis = load_volateis()
+    monitor_state['monitores'] = {
+        alvo['url']: MonitorEdital(alvo['url'], alvo['palavras_chave'], intervalo_minutos, cortesia,
+                                   config.get('memoria_limitada'), alvo['normalizacao'],
+                                   volateis.get(alvo['url']), CONTEUDO_DIR)
+        for alvo in alvos
+    }
+    monitor_state['monitor'] = monitor_state['monitores'][url]
+    monitor_state['significancia'] = {alvo['url']: alvo['significancia'] for alvo in alvos}
+    monitor_state['deteccoes'] = load_deteccoes()
+
+    # Anexos: links novos/removidos e arquivos alterados (HEAD condicional, sem baixar).
+    # Desligado por padrão: gera requisições extras aos sites monitorados
+    config_anexos = config.get('anexos', {})
+    monitor_state['anexos'] = None
+    if config_anexos.get('enabled', False):
+        monitor_state['anexos'] = RastreadorAnexos(ANEXOS_FILE, config_anexos, cortesia,
+                                                   monitor_state['monitor'].headers)
+
+        # Texto dos anexos novos ou alterados: baixados uma vez, extraídos em processos
+        # separados e guardados em cache pelo SHA-256 do arquivo
+        config_texto_pdf = config_anexos.get('texto_pdf', {})
+        if config_texto_pdf.get('enabled', False) and monitor_state['texto_pdf'] is None:
+            if PYPDF_DISPONIVEL:
+                monitor_state['texto_pdf'] = ExtratorTextoPdf(TEXTO_PDF_DIR, config_texto_pdf, cortesia,
+                                                              monitor_state['monitor'].headers)
+            else:
+                add_log("pypdf não instalado - palavras-chave não serão buscadas no texto dos anexos", "ALERTA")
 
     # Carrega hash anterior se existir (para manter histórico entre reinicializações)
     hash_salvo = load_hash_anterior()
     if hash_salvo:
         monitor_state['monitor'].hash_anterior = hash_salvo
         add_log("Hash anterior carregado - detecção de mudanças restaurada", "INFO")
+    for url_alvo, hash_alvo in load_hashes_alvos().items():
+        if url_alvo in monitor_state['monitores'] and url_alvo != url:
+            monitor_state['monitores'][url_alvo].hash_anterior = hash_alvo
+    # SimHash do último conteúdo: base da similaridade logo após reiniciar
+    for url_alvo, impressao in load_simhashes().items():
+        if url_alvo in monitor_state['monitores']:
+            monitor_state['monitores'][url_alvo].simhash_anterior = impressao
 
     # Inicializa notificador de email
     if config.get('email', {}).get('enabled', False):
         monitor_state['email_notifier'] = EmailNotifier(config['email'])
         add_log("Sistema de notificação por email ativado", "INFO")
 
-    add_log("Monitoramento iniciado", "SUCESSO")
-    add_log(f"URL: {url}", "INFO")
-    add_log(f"Intervalo: {intervalo_minutos} minutos", "INFO")
-
-    while monitor_state['running'] and monitor_state['thread_id'] == thread_id:
-        try:
-            monitor_state['current_check'] += 1
-            check_num = monitor_state['current_check']
+        # A fila sobrevive a paradas do monitor: entregas pendentes continuam em background
+        if monitor_state['outbox'] is None:
+            monitor_state['outbox'] = OutboxNotificacoes(
+                OUTBOX_DB, monitor_state['email_notifier'], log=add_log, **config.get('outbox', {})
+            )
+        else:
+            monitor_state['outbox'].notifier = monitor_state['email_notifier']
+        monitor_state['outbox'].iniciar()
+
+        if monitor_state['agrupador'] is None:
+            # Em cluster, janelas e resumos ficam ao lado do banco de coordenação: o nó que
+            # detectou a mudança e o que fecha a janela podem ser diferentes
+            config_cluster = config.get('cluster') or {}
+            caminho_agrupador = OUTBOX_DB
+            if config_cluster.get('enabled', False):
+                caminho_agrupador = config_cluster.get('caminho_agrupador_db') or os.path.join(
+                    os.path.dirname(os.path.abspath(config_cluster['caminho_db'])), 'monitor_agrupador.db')
+            monitor_state['agrupador'] = AgrupadorAlertas(
+                caminho_agrupador, despachar_resumo,
+                janela_minutos=config.get('agrupamento_minutos', 0),
+                hora_resumo_diario=config.get('hora_resumo_diario', 8),
+                log=add_log,
+                compartilhado=config_cluster.get('enabled', False)
+            )
+        else:
+            monitor_state['agrupador'].janela_minutos = config.get('agrupamento_minutos', 0)
+        monitor_state['agrupador'].iniciar()
 
-            add_log(f"Verificação #{check_num}", "INFO")
-            monitor_state['last_check'] = get_brasilia_time().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Busca e processa página
-            monitor = monitor_state['monitor']
-            soup = monitor.buscar_pagina()
-            conteudo = monitor.extrair_conteudo_relevante(soup)
-
-            # Verifica palavras-chave
-            palavras_encontradas = monitor.verificar_palavras_chave(conteudo)
-
-            # Verifica mudanças
-            mudanca_conteudo, _ = monitor.verificar_mudancas(conteudo)
-
-            # Atualiza estado com palavras encontradas (para dashboard)
-            monitor_state['palavras_encontradas'] = palavras_encontradas
-
-            # Registra palavras-chave encontradas (apenas informativo)
-            if palavras_encontradas:
-                add_log(f"Palavras-chave no site: {', '.join(palavras_encontradas)}", "INFO")
-
-            # IMPORTANTE: Só envia notificação quando houver MUDANÇA REAL no conteúdo
-            if mudanca_conteudo:
-                monitor_state['mudancas_detectadas'] += 1
-                add_log("MUDANÇA NO CONTEÚDO DETECTADA!", "ALERTA")
-
-                # Cria resumo do conteúdo (primeiros 300 caracteres)
-                conteudo_resumo = conteudo[:300].strip() if len(conteudo) > 300 else conteudo.strip()
-
-                # Adiciona atividade ao histórico
-                adicionar_atividade(palavras_encontradas, conteudo_resumo)
-                add_log("Mudança registrada no histórico de atividades", "INFO")
-
-                # Salva hash atual para persistir entre reinicializações
-                save_hash_anterior(monitor_state['monitor'].hash_anterior)
-
-                # Envia notificação por email APENAS quando há mudança
-                if monitor_state['email_notifier']:
-                    # Carrega lista de emails inscritos
-                    subscribers = load_subscribers()
-
-                    if subscribers:
-                        # Envia para todos os inscritos
-                        if monitor_state['email_notifier'].enviar_alerta(
-                            url, palavras_encontradas, mudanca_conteudo, destinatarios=subscribers,
-                            conteudo_resumo=conteudo_resumo
-                        ):
-                            add_log(f"Notificação enviada para {len(subscribers)} inscrito(s)", "SUCESSO")
-                        else:
-                            add_log("Falha ao enviar notificações", "ERRO")
-                    else:
-                        add_log("Mudança detectada mas nenhum email inscrito para notificar", "ALERTA")
-            else:
-                add_log("Nenhuma mudança detectada - site sem alterações", "INFO")
-                # Salva hash atual mesmo sem mudança (para manter sincronizado)
-                save_hash_anterior(monitor_state['monitor'].hash_anterior)
+        pendentes = monitor_state['outbox'].estatisticas()
+        if pendentes.get('pendente') or pendentes.get('enviando'):
+            add_log("Retomando entregas de notificações pendentes", "INFO")
 
-            # Calcula próxima verificação
-            proxima = get_brasilia_time().timestamp() + intervalo_segundos
-            monitor_state['next_check'] = datetime.fromtimestamp(proxima, BRASILIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+    # Inicializa notificador de webhooks
+    if config.get('webhooks', {}).get('enabled', False):
+        if monitor_state['webhook_notifier']:
+            monitor_state['webhook_notifier'].parar()
+        monitor_state['webhook_notifier'] = WebhookNotifier(config['webhooks'], log=add_log)
+        add_log(f"Webhooks ativados ({len(monitor_state['webhook_notifier'].endpoints)} endpoint(s))", "INFO")
 
-            add_log(f"Próxima verificação: {monitor_state['next_check']}", "INFO")
+    add_log("Monitoramento iniciado", "SUCESSO")
+    add_log(f"URL: {url}", "INFO")
+    if len(alvos) > 1:
+        add_log(f"Alvos adicionais: {len(alvos) - 1}", "INFO")
+    if agendador.adaptativo:
+        add_log(f"Intervalo adaptativo: {agendador.intervalo_min / 60:g} a {agendador.intervalo_max / 60:g} minutos", "INFO")
+    else:
+        add_log(f"Intervalo: {intervalo_minutos} minutos", "INFO")
+
+    # Várias instâncias podem dividir os alvos (seção 'cluster')
+    if monitor_state['coordenador']:
+        monitor_state['coordenador'].parar()
+    monitor_state['coordenador'] = criar_coordenador(config.get('cluster'), log=add_log)
+    if monitor_state['coordenador']:
+        monitor_state['coordenador'].iniciar()
+        add_log(f"Modo cluster ativo - nó {monitor_state['coordenador'].no_id}", "INFO")
+
+    memoria_limitada = config.get('memoria_limitada', {})
+    if memoria_limitada.get('enabled', False):
+        limite = memoria_limitada.get('max_bytes', 50 * 1024 * 1024) / (1024 * 1024)
+        add_log(f"Modo de memória limitada: download em partes, parsing incremental e limite de {limite:g} MiB", "INFO")
+
+    # Parsing opcional em processos separados (não segura o GIL do servidor web)
+    config_extracao = config.get('extracao_processos', {})
+    if config_extracao.get('workers', 0) > 0 and monitor_state['extrator'] is None:
+        monitor_state['extrator'] = ExtratorProcessos(
+            workers=config_extracao['workers'],
+            limite_memoria_compartilhada=config_extracao.get('limite_memoria_compartilhada_bytes', 64 * 1024)
+        )
+        add_log(f"Análise do HTML em {config_extracao['workers']} processo(s) separado(s)", "INFO")
+
+    # Uma thread de escalonamento para todos os alvos; dorme até o próximo vencimento
+    escalonador = EscalonadorVerificacoes(
+        verificar_alvo, workers=config.get('verificacoes_simultaneas', 4), log=add_log
+    )
+    monitor_state['escalonador'] = escalonador
 
-            # Aguarda intervalo - verifica thread_id a cada segundo para responder rapidamente ao stop
-            for _ in range(intervalo_segundos):
-                if monitor_state['thread_id'] != thread_id:
-                    add_log("Thread de monitoramento substituída, encerrando esta thread", "INFO")
-                    return
-                time.sleep(1)
+    # Alvos do mesmo host começam defasados ao longo de um intervalo, para não virarem rajada
+    defasagens = cortesia.defasagens([alvo['url'] for alvo in alvos], agendador.proximo_intervalo(url))
+    for alvo in alvos:
+        escalonador.agendar(alvo['url'], defasagens[alvo['url']])
 
-        except Exception as e:
-            add_log(f"Erro: {str(e)}", "ERRO")
-            add_log("Nova tentativa em 60 segundos...", "INFO")
-            # Aguarda 60 segundos em caso de erro para tentar novamente rapidamente
-            for _ in range(60):
-                if monitor_state['thread_id'] != thread_id:
-                    add_log("Thread de monitoramento substituída, encerrando esta thread", "INFO")
-                    return
-                time.sleep(1)
+    if monitor_state['thread_id'] != thread_id:
+        # Parado enquanto inicializava
+        escalonador.parar()
+        return
 
+    escalonador.executar_loop()
     add_log("Monitoramento interrompido", "ALERTA")
 
 
@@ -410,13 +1084,37 @@ def get_status():
     historico = load_historico()
     total_mudancas = len(historico)
 
+    agendamento = {'intervalo_efetivo_minutos': None}
+    if monitor_state['agendador'] and monitor_state['monitor']:
+        agendamento = monitor_state['agendador'].resumo(monitor_state['monitor'].url)
+        if monitor_state['intervalo_efetivo_segundos']:
+            # Intervalo realmente agendado para a próxima verificação
+            agendamento['intervalo_efetivo_minutos'] = round(monitor_state['intervalo_efetivo_segundos'] / 60, 2)
+
+    resiliencia = {
+        'proxima_tentativa': monitor_state['proxima_tentativa'],
+        'ultimo_erro_tipo': monitor_state['ultimo_erro_tipo'],
+        'disjuntores': {}
+    }
+    if monitor_state['disjuntores']:
+        resiliencia['disjuntores'] = monitor_state['disjuntores'].resumo()
+        for resumo in resiliencia['disjuntores'].values():
+            if resumo['aberto_ate']:
+                resumo['aberto_ate'] = datetime.fromtimestamp(resumo['aberto_ate'], BRASILIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
     return jsonify({
         'running': monitor_state['running'],
         'current_check': monitor_state['current_check'],
         'last_check': monitor_state['last_check'],
         'next_check': monitor_state['next_check'],
         'palavras_encontradas': monitor_state['palavras_encontradas'],
-        'mudancas_detectadas': total_mudancas
+        'mudancas_detectadas': total_mudancas,
+        'intervalo_efetivo_minutos': agendamento['intervalo_efetivo_minutos'],
+        'agendamento': agendamento,
+        'resiliencia': resiliencia,
+        'total_alvos': len(monitor_state['monitores']),
+        'pico_rss_mib': monitor_state['pico_rss_mib'],
+        'cluster': monitor_state['coordenador'].resumo() if monitor_state['coordenador'] else None
     })
 
 
@@ -493,18 +1191,24 @@ def add_subscriber_endpoint():
     try:
         data = request.json
         email = data.get('email', '').strip()
+        frequencia = data.get('frequencia', 'imediato')
 
         if not email:
             return jsonify({'error': 'Email não fornecido'}), 400
 
-        if '@' not in email:
+        from src.email_notifier import endereco_valido
+        if not endereco_valido(email):
             return jsonify({'error': 'Email inválido'}), 400
 
-        if add_subscriber(email):
+        if frequencia not in FREQUENCIAS:
+            return jsonify({'error': 'Frequência inválida'}), 400
+
+        if add_subscriber(email, frequencia):
             subscribers_count = len(load_subscribers())
             return jsonify({
                 'message': 'Email cadastrado com sucesso!',
                 'email': email,
+                'frequencia': frequencia,
                 'total_subscribers': subscribers_count
             })
         else:
@@ -521,9 +1225,46 @@ def remove_subscriber_endpoint(email):
 
 
 @app.route('/api/check-now', methods=['POST'])
+@requer_admin
 def check_now():
-    """Força uma verificação imediata - DESABILITADO PARA SEGURANCA"""
-    return jsonify({'error': 'Acesso negado. Esta operacao requer privilegios de administrador.'}), 403
+    """
+    Força uma verificação imediata de um alvo (ou de todos)
+
+    Body JSON (opcional):
+        url: Alvo a verificar (padrão: todos)
+        aguardar: Se true, responde só quando as verificações terminarem
+        timeout_segundos: Espera máxima com aguardar (padrão 60, máximo 300)
+
+    Pedidos simultâneos para o mesmo alvo compartilham a mesma verificação.
+    """
+    data = request.get_json(silent=True) or {}
+    escalonador = monitor_state['escalonador']
+
+    if not monitor_state['running'] or not escalonador:
+        return jsonify({'error': 'Monitor não está em execução'}), 409
+
+    url = data.get('url')
+    if url is not None and url not in monitor_state['monitores']:
+        return jsonify({'error': 'Alvo não monitorado'}), 404
+
+    try:
+        timeout = min(float(data.get('timeout_segundos', 60)), CHECK_NOW_TIMEOUT_MAX)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'timeout_segundos inválido'}), 400
+
+    futuros = escalonador.executar_agora(url)
+    if not data.get('aguardar'):
+        return jsonify({'agendadas': sorted(futuros)}), 202
+
+    concluidos, pendentes = wait(futuros.values(), timeout=timeout)
+    resultados = [
+        monitor_state['ultimas_verificacoes'].get(alvo)
+        for alvo, futuro in futuros.items() if futuro in concluidos and not futuro.cancelled()
+    ]
+    return jsonify({
+        'resultados': resultados,
+        'pendentes': sorted(alvo for alvo, futuro in futuros.items() if futuro in pendentes)
+    })
 
 
 @app.route('/api/diagnostic', methods=['GET'])
@@ -532,6 +1273,48 @@ def diagnostic():
     return jsonify({'error': 'Acesso negado. Esta operacao requer privilegios de administrador.'}), 403
 
 
+@app.route('/api/admin/profiling', methods=['GET'])
+@requer_admin
+def get_profiling():
+    """Retorna estado do profiling e perfis disponíveis para download"""
+    return jsonify({
+        'verificacoes_restantes': monitor_state['profiling_restante'],
+        'perfis': listar_perfis(PROFILES_DIR)
+    })
+
+
+@app.route('/api/admin/profiling', methods=['POST'])
+@requer_admin
+def ativar_profiling():
+    """Perfila as próximas N verificações (0 desativa)"""
+    data = request.json or {}
+    verificacoes = data.get('verificacoes', 1)
+
+    if not isinstance(verificacoes, int) or not 0 <= verificacoes <= PROFILING_MAX_VERIFICACOES:
+        return jsonify({'error': f'verificacoes deve ser um inteiro entre 0 e {PROFILING_MAX_VERIFICACOES}'}), 400
+
+    with profiling_lock:
+        monitor_state['profiling_restante'] = verificacoes
+    add_log(f"Profiling agendado para as próximas {verificacoes} verificação(ões)", "INFO")
+    return jsonify({'verificacoes_restantes': verificacoes})
+
+
+@app.route('/api/admin/profiling/<path:arquivo>', methods=['GET'])
+@requer_admin
+def download_perfil(arquivo):
+    """Download de um arquivo de perfil (.prof ou .txt)"""
+    return send_from_directory(PROFILES_DIR, arquivo, as_attachment=True)
+
+
+@app.route('/api/admin/outbox', methods=['GET'])
+@requer_admin
+def get_outbox():
+    """Retorna contagem de entregas da fila de notificações por status"""
+    if not monitor_state['outbox']:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, 'entregas': monitor_state['outbox'].estatisticas()})
+
+
 @app.route('/api/reset-hash', methods=['POST'])
 def reset_hash():
     """Reseta o hash anterior - DESABILITADO PARA SEGURANCA"""
@@ -548,9 +1331,4 @@ if __name__ == '__main__':
     print(f"Ou: http://localhost:{config['servidor_porta']}")
     print("=" * 80)
 
-    app.run(
-        host=config['servidor_host'],
-        port=config['servidor_porta'],
-        debug=False,
-        threaded=True
-    )
+    servir(config['servidor_host'], config['servidor_porta'])
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Módulo de Coordenação entre Nós
+Divide os alvos entre várias instâncias do monitor (hash consistente + leases em armazenamento compartilhado)
+"""
+
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nos (
+    no_id TEXT PRIMARY KEY,
+    heartbeat_em REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS leases (
+    alvo TEXT PRIMARY KEY,
+    no_id TEXT NOT NULL,
+    expira_em REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS estado_alvos (
+    alvo TEXT PRIMARY KEY,
+    hash TEXT,
+    atualizado_em REAL NOT NULL,
+    sequencia INTEGER NOT NULL DEFAULT 0,
+    ultima_deteccao TEXT
+);
+
+CREATE TABLE IF NOT EXISTS notificacoes_reivindicadas (
+    chave TEXT PRIMARY KEY,
+    no_id TEXT NOT NULL,
+    criado_em REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_leases_no ON leases (no_id);
+CREATE INDEX IF NOT EXISTS idx_notificacoes_criado ON notificacoes_reivindicadas (criado_em);
+"""
+
+
+class BackendCoordenacao(ABC):
+    """
+    Interface do armazenamento compartilhado entre os nós
+
+    Qualquer armazenamento com escrita atômica condicional serve (SQLite em disco
+    compartilhado, um banco SQL, Redis...). Implementações devem garantir que
+    adquirir_lease, reivindicar_deteccao e reivindicar_notificacao sejam atômicos
+    entre processos. Um backend sem algum dos métodos falha já ao ser criado.
+    """
+
+    @abstractmethod
+    def registrar_heartbeat(self, no_id: str):
+        """Marca o nó como ativo agora"""
+
+    @abstractmethod
+    def nos_ativos(self, ttl_segundos: float) -> List[str]:
+        """Nós com heartbeat nos últimos ttl_segundos, em ordem"""
+
+    @abstractmethod
+    def remover_no(self, no_id: str):
+        """Remove o nó e libera todos os leases dele"""
+
+    @abstractmethod
+    def adquirir_lease(self, alvo: str, no_id: str, lease_segundos: float) -> bool:
+        """Obtém ou renova o lease do alvo se estiver livre, expirado ou já for do nó"""
+
+    @abstractmethod
+    def liberar_lease(self, alvo: str, no_id: str):
+        """Libera o lease do alvo, se for do nó"""
+
+    @abstractmethod
+    def leases_do_no(self, no_id: str) -> List[str]:
+        """Alvos com lease do nó"""
+
+    @abstractmethod
+    def carregar_estado(self, alvo: str) -> Optional[Dict]:
+        """{'hash', 'sequencia'} do alvo (None se nenhum nó o verificou)"""
+
+    @abstractmethod
+    def salvar_hash(self, alvo: str, hash_str: str):
+        """Grava o último hash do alvo"""
+
+    @abstractmethod
+    def reivindicar_deteccao(self, alvo: str, deteccao: str, no_id: str) -> Tuple[int, bool]:
+        """Incrementa a sequência do alvo e reivindica a detecção (ver CoordenadorCluster)"""
+
+    @abstractmethod
+    def reivindicar_notificacao(self, chave: str, no_id: str) -> bool:
+        """True apenas para o primeiro nó que reivindicar a chave"""
+
+    @abstractmethod
+    def remover_notificacoes_antigas(self, antes_de: float) -> int:
+        """Remove as reivindicações anteriores a antes_de; retorna quantas"""
+
+
+class BackendCoordenacaoSQLite(BackendCoordenacao):
+    """
+    Backend em um arquivo SQLite acessível por todos os nós
+
+    Usa o journal de rollback padrão: o modo WAL depende de memória compartilhada
+    entre os processos e não funciona com nós em máquinas diferentes acessando o mesmo
+    volume. Ainda assim o volume precisa de travas de arquivo confiáveis (NFS antigo ou
+    mal configurado não serve); nesses casos, use outro backend.
+    """
+
+    def __init__(self, caminho_db: str):
+        self.caminho_db = caminho_db
+        conn = self._conectar()
+        try:
+            conn.executescript(SCHEMA)
+            # Bancos criados antes da sequência de detecções compartilhada
+            colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(estado_alvos)")}
+            if 'sequencia' not in colunas:
+                conn.execute("ALTER TABLE estado_alvos ADD COLUMN sequencia INTEGER NOT NULL DEFAULT 0")
+            if 'ultima_deteccao' not in colunas:
+                conn.execute("ALTER TABLE estado_alvos ADD COLUMN ultima_deteccao TEXT")
+        finally:
+            conn.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.caminho_db, timeout=30, isolation_level=None)
+        # Explícito: um banco criado em WAL por uma versão anterior volta ao modo de rollback
+        conn.execute("PRAGMA journal_mode=DELETE")
+        return conn
+
+    def _executar(self, sql: str, parametros: tuple = ()) -> sqlite3.Cursor:
+        conn = self._conectar()
+        try:
+            return conn.execute(sql, parametros)
+        finally:
+            conn.close()
+
+    def _consultar(self, sql: str, parametros: tuple = ()) -> list:
+        conn = self._conectar()
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def registrar_heartbeat(self, no_id: str):
+        self._executar(
+            "INSERT INTO nos (no_id, heartbeat_em) VALUES (?, ?) "
+            "ON CONFLICT(no_id) DO UPDATE SET heartbeat_em = excluded.heartbeat_em",
+            (no_id, time.time())
+        )
+
+    def nos_ativos(self, ttl_segundos: float) -> List[str]:
+        linhas = self._consultar("SELECT no_id FROM nos WHERE heartbeat_em >= ? ORDER BY no_id",
+                                 (time.time() - ttl_segundos,))
+        return [linha[0] for linha in linhas]
+
+    def remover_no(self, no_id: str):
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM nos WHERE no_id = ?", (no_id,))
+            conn.execute("DELETE FROM leases WHERE no_id = ?", (no_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def adquirir_lease(self, alvo: str, no_id: str, lease_segundos: float) -> bool:
+        # Um único UPSERT condicional: só assume o lease se estiver livre, expirado ou já for do nó
+        agora = time.time()
+        cursor = self._executar(
+            "INSERT INTO leases (alvo, no_id, expira_em) VALUES (?, ?, ?) "
+            "ON CONFLICT(alvo) DO UPDATE SET no_id = excluded.no_id, expira_em = excluded.expira_em "
+            "WHERE leases.no_id = excluded.no_id OR leases.expira_em < ?",
+            (alvo, no_id, agora + lease_segundos, agora)
+        )
+        return cursor.rowcount == 1
+
+    def liberar_lease(self, alvo: str, no_id: str):
+        self._executar("DELETE FROM leases WHERE alvo = ? AND no_id = ?", (alvo, no_id))
+
+    def leases_do_no(self, no_id: str) -> List[str]:
+        return [linha[0] for linha in self._consultar("SELECT alvo FROM leases WHERE no_id = ?", (no_id,))]
+
+    def carregar_estado(self, alvo: str) -> Optional[Dict]:
+        linhas = self._consultar("SELECT hash, sequencia FROM estado_alvos WHERE alvo = ?", (alvo,))
+        return {'hash': linhas[0][0], 'sequencia': linhas[0][1]} if linhas else None
+
+    def salvar_hash(self, alvo: str, hash_str: str):
+        self._executar(
+            "INSERT INTO estado_alvos (alvo, hash, atualizado_em) VALUES (?, ?, ?) "
+            "ON CONFLICT(alvo) DO UPDATE SET hash = excluded.hash, atualizado_em = excluded.atualizado_em",
+            (alvo, hash_str, time.time())
+        )
+
+    def reivindicar_deteccao(self, alvo: str, deteccao: str, no_id: str) -> Tuple[int, bool]:
+        # Leitura, incremento e reivindicação na mesma transação: dois nós nunca obtêm a
+        # mesma sequência, e a detecção já reivindicada (replay) devolve a sequência dela
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            linha = conn.execute("SELECT sequencia, ultima_deteccao FROM estado_alvos WHERE alvo = ?",
+                                 (alvo,)).fetchone()
+            sequencia, ultima = linha if linha else (0, None)
+            if ultima == deteccao:
+                conn.execute("COMMIT")
+                return sequencia, False
+            sequencia += 1
+            agora = time.time()
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO notificacoes_reivindicadas (chave, no_id, criado_em) VALUES (?, ?, ?)",
+                (f"{deteccao}|{sequencia}", no_id, agora)
+            )
+            conn.execute(
+                "INSERT INTO estado_alvos (alvo, atualizado_em, sequencia, ultima_deteccao) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(alvo) DO UPDATE SET sequencia = excluded.sequencia, "
+                "ultima_deteccao = excluded.ultima_deteccao, atualizado_em = excluded.atualizado_em",
+                (alvo, agora, sequencia, deteccao)
+            )
+            conn.execute("COMMIT")
+            return sequencia, cursor.rowcount == 1
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def reivindicar_notificacao(self, chave: str, no_id: str) -> bool:
+        cursor = self._executar(
+            "INSERT OR IGNORE INTO notificacoes_reivindicadas (chave, no_id, criado_em) VALUES (?, ?, ?)",
+            (chave, no_id, time.time())
+        )
+        return cursor.rowcount == 1
+
+    def remover_notificacoes_antigas(self, antes_de: float) -> int:
+        return self._executar("DELETE FROM notificacoes_reivindicadas WHERE criado_em < ?", (antes_de,)).rowcount
+
+
+# Backends disponíveis para config['cluster']['backend']
+BACKENDS = {
+    'sqlite': lambda config: BackendCoordenacaoSQLite(config['caminho_db'])
+}
+
+
+class AnelConsistente:
+    """
+    Anel de hash consistente com nós virtuais
+
+    Quando um nó entra ou sai, só os alvos dos trechos do anel dele mudam de dono.
+    """
+
+    def __init__(self, nos: List[str], replicas_virtuais: int = 64):
+        self.nos = sorted(nos)
+        pontos = sorted(
+            (self._hash(f"{no}#{i}"), no) for no in self.nos for i in range(replicas_virtuais)
+        )
+        self._pontos: List[int] = [p for p, _ in pontos]
+        self._donos: List[str] = [no for _, no in pontos]
+
+    @staticmethod
+    def _hash(chave: str) -> int:
+        return int.from_bytes(hashlib.sha256(chave.encode('utf-8')).digest()[:8], 'big')
+
+    def dono(self, alvo: str) -> Optional[str]:
+        if not self._pontos:
+            return None
+        i = bisect.bisect(self._pontos, self._hash(alvo)) % len(self._pontos)
+        return self._donos[i]
+
+
+class CoordenadorCluster:
+    """
+    Decide quais alvos este nó verifica
+
+    Cada nó publica um heartbeat no backend; os nós com heartbeat recente formam o
+    anel. Um alvo é verificado pelo dono no anel, e só depois de o dono obter o lease
+    do alvo: durante um rebalanceamento o novo dono espera o anterior liberar (ou o
+    lease expirar), então dois nós nunca verificam o mesmo alvo ao mesmo tempo.
+    """
+
+    def __init__(self, backend: BackendCoordenacao, no_id: Optional[str] = None,
+                 ttl_segundos: float = 30, intervalo_heartbeat_segundos: float = 10,
+                 lease_segundos: float = 300, replicas_virtuais: int = 64,
+                 retencao_notificacoes_segundos: float = 7 * 86400,
+                 log: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            backend: Armazenamento compartilhado
+            no_id: Identificador do nó (padrão: hostname-pid)
+            ttl_segundos: Sem heartbeat por esse tempo, o nó sai do anel
+            intervalo_heartbeat_segundos: Frequência do heartbeat e da revisão do anel
+            lease_segundos: Validade do lease obtido a cada verificação (deve cobrir uma verificação)
+            replicas_virtuais: Pontos de cada nó no anel
+            retencao_notificacoes_segundos: Reivindicações de notificação mais antigas são removidas
+            log: Função opcional log(mensagem, tipo)
+        """
+        self.backend = backend
+        self.no_id = no_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.ttl_segundos = ttl_segundos
+        self.intervalo_heartbeat = intervalo_heartbeat_segundos
+        self.lease_segundos = lease_segundos
+        self.replicas_virtuais = replicas_virtuais
+        self.retencao_notificacoes_segundos = retencao_notificacoes_segundos
+        self.log = log or (lambda mensagem, tipo="INFO": print(f"[{tipo}] {mensagem}", flush=True))
+
+        self.anel = AnelConsistente([self.no_id], replicas_virtuais)
+        self._ultima_limpeza = 0.0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def atualizar(self):
+        """Publica o heartbeat, recalcula o anel e libera leases de alvos que mudaram de dono"""
+        self.backend.registrar_heartbeat(self.no_id)
+        nos = self.backend.nos_ativos(self.ttl_segundos)
+        if self.no_id not in nos:
+            nos.append(self.no_id)
+
+        if sorted(nos) != self.anel.nos:
+            self.log(f"Cluster com {len(nos)} nó(s): {', '.join(sorted(nos))}", "INFO")
+            self.anel = AnelConsistente(nos, self.replicas_virtuais)
+
+        for alvo in self.backend.leases_do_no(self.no_id):
+            if self.anel.dono(alvo) != self.no_id:
+                self.backend.liberar_lease(alvo, self.no_id)
+
+        # As reivindicações só evitam duplicatas de uma mesma detecção (replay, troca de dono):
+        # as antigas são removidas, no máximo uma vez por hora
+        agora = time.time()
+        if agora - self._ultima_limpeza >= 3600:
+            self._ultima_limpeza = agora
+            self.backend.remover_notificacoes_antigas(agora - self.retencao_notificacoes_segundos)
+
+    def responsavel(self, alvo: str) -> bool:
+        """Indica se este nó deve verificar o alvo agora (renova o lease quando sim)"""
+        if self.anel.dono(alvo) != self.no_id:
+            return False
+        return self.backend.adquirir_lease(alvo, self.no_id, self.lease_segundos)
+
+    def reivindicar_deteccao(self, alvo: str, deteccao: str) -> Tuple[int, bool]:
+        """
+        Sequência da detecção no cluster e se este nó deve notificá-la
+
+        A sequência do alvo fica no backend, ao lado do hash: o nó que assume o alvo
+        continua a contagem do anterior. A mesma detecção (url|hash anterior|hash atual)
+        reprocessada antes de o hash ser salvo, por replay ou troca de dono, recebe a
+        sequência já reivindicada e False.
+        """
+        return self.backend.reivindicar_deteccao(alvo, deteccao, self.no_id)
+
+    def reivindicar_notificacao(self, chave: str) -> bool:
+        """True apenas para o primeiro nó que reivindicar a notificação da chave"""
+        return self.backend.reivindicar_notificacao(chave, self.no_id)
+
+    def resumo(self) -> Dict:
+        return {'no_id': self.no_id, 'nos': self.anel.nos}
+
+    def iniciar(self):
+        """Publica o primeiro heartbeat e inicia a thread de manutenção (idempotente)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.atualizar()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name='cluster', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Sai do cluster: os alvos deste nó passam para os demais sem esperar o TTL"""
+        self._parar.set()
+        try:
+            self.backend.remover_no(self.no_id)
+        except Exception as e:
+            self.log(f"Erro ao sair do cluster: {e}", "ERRO")
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo_heartbeat):
+            try:
+                self.atualizar()
+            except Exception as e:
+                self.log(f"Erro no heartbeat do cluster: {e}", "ERRO")
+
+
+def criar_coordenador(config: Dict, log: Optional[Callable[[str, str], None]] = None) -> Optional[CoordenadorCluster]:
+    """
+    Cria o coordenador a partir da seção 'cluster' do config.json (None se desativado)
+
+        {
+            'enabled': bool,
+            'backend': 'sqlite',
+            'caminho_db': str,               # arquivo em armazenamento compartilhado
+            'no_id': str,
+            'ttl_segundos': float,
+            'intervalo_heartbeat_segundos': float,
+            'lease_segundos': float,
+            'retencao_notificacoes_segundos': float,
+            'caminho_agrupador_db': str      # janelas e resumos compartilhados (padrão: ao lado de caminho_db)
+        }
+    """
+    if not config or not config.get('enabled', False):
+        return None
+    backend = BACKENDS[config.get('backend', 'sqlite')](config)
+    return CoordenadorCluster(
+        backend,
+        no_id=config.get('no_id'),
+        ttl_segundos=config.get('ttl_segundos', 30),
+        intervalo_heartbeat_segundos=config.get('intervalo_heartbeat_segundos', 10),
+        lease_segundos=config.get('lease_segundos', 300),
+        retencao_notificacoes_segundos=config.get('retencao_notificacoes_segundos', 7 * 86400),
+        log=log
+    )
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Módulo de Cortesia com os Servidores
+Limita concorrência e ritmo das requisições por host e espalha alvos do mesmo host no tempo
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+
+class RequisicaoAdiada(Exception):
+    """
+    A requisição não foi feita para respeitar os limites do host
+
+    Não é uma falha do site: quem chama deve apenas reagendar após `segundos`.
+    """
+
+    def __init__(self, mensagem: str, segundos: float):
+        super().__init__(mensagem)
+        self.segundos = segundos
+
+
+class _Host:
+    """Limites e ritmo de um host"""
+
+    def __init__(self, max_concorrencia: int, intervalo_minimo_segundos: float):
+        self.semaforo = threading.BoundedSemaphore(max(1, max_concorrencia))
+        self.intervalo_minimo = intervalo_minimo_segundos
+        self.proximo_inicio = 0.0   # monotonic: início mais cedo da próxima requisição
+        self.bloqueado_ate = 0.0    # monotonic: fim do Retry-After pedido pelo servidor
+        self.lock = threading.Lock()
+
+
+class ControleCortesia:
+    """
+    Aplica os limites de cada host a todas as requisições do processo
+
+    - No máximo `max_concorrencia_por_host` requisições simultâneas por host
+    - Pelo menos `intervalo_minimo_segundos` entre o início de duas requisições ao mesmo host
+    - Após 429/503 com Retry-After, nenhuma requisição ao host até o prazo pedido
+
+    Esperas curtas (até `espera_maxima_segundos`) são feitas ali mesmo; esperas maiores
+    levantam RequisicaoAdiada para que o escalonador reagende sem ocupar um worker.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Args:
+            config: Seção 'cortesia' do config.json
+                {
+                    'max_concorrencia_por_host': int,
+                    'intervalo_minimo_segundos': float,
+                    'espera_maxima_segundos': float,
+                    'hosts': {
+                        'exemplo.org.br': {'max_concorrencia': int, 'intervalo_minimo_segundos': float}
+                    }
+                }
+        """
+        config = config or {}
+        self.max_concorrencia = config.get('max_concorrencia_por_host', 2)
+        self.intervalo_minimo = config.get('intervalo_minimo_segundos', 2)
+        self.espera_maxima = config.get('espera_maxima_segundos', 30)
+        self.por_host = {h.lower(): c for h, c in config.get('hosts', {}).items()}
+
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_da_url(url: str) -> str:
+        return (urlparse(url).hostname or '').lower()
+
+    def _host(self, url: str) -> _Host:
+        nome = self.host_da_url(url)
+        with self._lock:
+            if nome not in self._hosts:
+                especifico = self.por_host.get(nome, {})
+                self._hosts[nome] = _Host(
+                    especifico.get('max_concorrencia', self.max_concorrencia),
+                    especifico.get('intervalo_minimo_segundos', self.intervalo_minimo)
+                )
+            return self._hosts[nome]
+
+    @contextmanager
+    def requisicao(self, url: str):
+        """
+        Reserva a vez da requisição no host da URL
+
+        Raises:
+            RequisicaoAdiada: se a espera necessária passa de espera_maxima_segundos
+        """
+        host = self._host(url)
+        nome = self.host_da_url(url)
+
+        with host.lock:
+            agora = time.monotonic()
+            if host.bloqueado_ate - agora > self.espera_maxima:
+                segundos = host.bloqueado_ate - agora
+                raise RequisicaoAdiada(f"{nome} pediu para aguardar (Retry-After); "
+                                       f"nova tentativa em {int(segundos)} segundos", segundos)
+            inicio = max(agora, host.proximo_inicio, host.bloqueado_ate)
+            if inicio - agora > self.espera_maxima:
+                raise RequisicaoAdiada(f"Fila de requisições para {nome} cheia; "
+                                       f"nova tentativa em {int(inicio - agora)} segundos", inicio - agora)
+            host.proximo_inicio = inicio + host.intervalo_minimo
+        time.sleep(inicio - agora)
+
+        if not host.semaforo.acquire(timeout=self.espera_maxima):
+            raise RequisicaoAdiada(f"Limite de conexões simultâneas com {nome} atingido",
+                                   max(host.intervalo_minimo, 5))
+        try:
+            yield
+        finally:
+            host.semaforo.release()
+
+    def registrar_retry_after(self, url: str, segundos: float):
+        """Bloqueia o host até o prazo pedido pelo servidor"""
+        host = self._host(url)
+        with host.lock:
+            host.bloqueado_ate = max(host.bloqueado_ate, time.monotonic() + segundos)
+
+    def defasagens(self, urls: Iterable[str], periodo_segundos: float) -> Dict[str, float]:
+        """
+        Atraso inicial de cada alvo para espalhar os que compartilham host
+
+        Os N alvos de um host ficam igualmente espaçados dentro do período, em vez de
+        serem verificados todos no mesmo instante a cada ciclo.
+        """
+        por_host: Dict[str, list] = {}
+        for url in urls:
+            por_host.setdefault(self.host_da_url(url), []).append(url)
+
+        atrasos = {}
+        for urls_host in por_host.values():
+            passo = periodo_segundos / len(urls_host)
+            for i, url in enumerate(urls_host):
+                atrasos[url] = i * passo
+        return atrasos
@@ -5,9 +5,14 @@ Envia alertas quando mudanças são detectadas
 """
 
 import smtplib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from email.utils import parseaddr
+from typing import List, Optional, Dict
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -19,6 +24,126 @@ def get_brasilia_time():
     return datetime.now(BRASILIA_TZ)
 
 
+def endereco_valido(endereco: str) -> bool:
+    """
+    Endereço de email simples (local@dominio), sem nome de exibição nem caracteres de
+    controle: o endereço vai direto no cabeçalho To, e um CR/LF injetaria cabeçalhos
+    """
+    if not endereco or any(ord(c) < 32 or ord(c) == 127 for c in endereco):
+        return False
+    nome, email = parseaddr(endereco)
+    local, _, dominio = email.rpartition('@')
+    return not nome and email == endereco and bool(local) and bool(dominio) and ' ' not in email
+
+
+# Erros que indicam conexão perdida - a sessão reconecta e reenvia
+ERROS_CONEXAO = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class LimitadorTaxa:
+    """Token bucket thread-safe que limita mensagens por segundo em todo o notificador"""
+
+    def __init__(self, taxa_por_segundo: float):
+        """
+        Args:
+            taxa_por_segundo: Mensagens por segundo permitidas (0 = sem limite)
+        """
+        self.taxa = taxa_por_segundo
+        self.capacidade = max(1.0, taxa_por_segundo)
+        self.tokens = self.capacidade
+        self.ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def aguardar(self):
+        """Bloqueia até haver um token disponível"""
+        if not self.taxa:
+            return
+
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self.tokens = min(self.capacidade, self.tokens + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                espera = (1 - self.tokens) / self.taxa
+            time.sleep(espera)
+
+
+class SessaoSMTP:
+    """
+    Sessão SMTP autenticada reutilizada entre vários envios
+
+    Conecta sob demanda, faz STARTTLS/login uma única vez e reutiliza a
+    conexão. Reconecta de forma transparente quando o servidor derruba a
+    conexão e renova a sessão ao atingir o limite de mensagens por conexão.
+    """
+
+    def __init__(self, notifier: 'EmailNotifier'):
+        self.notifier = notifier
+        self.server: Optional[smtplib.SMTP] = None
+        self.mensagens_na_conexao = 0
+        self.conexoes_abertas = 0
+
+    def conectar(self):
+        """Abre e autentica uma nova conexão"""
+        self.fechar()
+        server = smtplib.SMTP(self.notifier.smtp_server, self.notifier.smtp_port,
+                              timeout=self.notifier.timeout)
+        try:
+            if self.notifier.use_tls:
+                server.starttls()
+
+            if self.notifier.smtp_user and self.notifier.smtp_password:
+                server.login(self.notifier.smtp_user, self.notifier.smtp_password)
+        except Exception:
+            server.close()
+            raise
+
+        self.server = server
+        self.mensagens_na_conexao = 0
+        self.conexoes_abertas += 1
+
+    def fechar(self):
+        """Encerra a conexão atual (se houver)"""
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+        self.server = None
+
+    def enviar(self, destinatarios: List[str], dados: bytes) -> dict:
+        """
+        Envia uma mensagem já serializada, reconectando uma vez se a conexão tiver caído
+
+        Returns:
+            Dicionário de destinatários recusados (vazio se todos aceitos)
+        """
+        limite = self.notifier.max_mensagens_por_conexao
+        if self.server is None or (limite and self.mensagens_na_conexao >= limite):
+            self.conectar()
+
+        try:
+            recusados = self.server.sendmail(self.notifier.from_email, destinatarios, dados)
+        except ERROS_CONEXAO:
+            # Conexão ociosa derrubada pelo servidor: reconecta e tenta de novo
+            self.conectar()
+            recusados = self.server.sendmail(self.notifier.from_email, destinatarios, dados)
+
+        self.mensagens_na_conexao += 1
+        return recusados
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fechar()
+        return False
+
+
 class EmailNotifier:
     """Classe para envio de notificações por email"""
 
@@ -36,7 +161,13 @@ class EmailNotifier:
                     'smtp_password': str,
                     'from_email': str,
                     'to_email': str,
-                    'use_tls': bool
+                    'use_tls': bool,
+                    'timeout': int,                     # opcional, segundos
+                    'max_mensagens_por_conexao': int,   # opcional, 0 = sem limite
+                    'conexoes_simultaneas': int,        # opcional, sessões SMTP em paralelo
+                    'max_mensagens_por_segundo': float, # opcional, 0 = sem limite
+                    'modo_envio': str,                  # opcional, 'individual' ou 'bcc'
+                    'destinatarios_por_mensagem': int   # opcional, RCPT TO por mensagem no modo bcc
                 }
         """
         self.enabled = smtp_config.get('enabled', False)
@@ -47,6 +178,19 @@ class EmailNotifier:
         self.from_email = smtp_config.get('from_email', '')
         self.to_email = smtp_config.get('to_email', '')
         self.use_tls = smtp_config.get('use_tls', True)
+        self.timeout = smtp_config.get('timeout', 30)
+        # Muitos provedores limitam mensagens por conexão (ex: Gmail ~100)
+        self.max_mensagens_por_conexao = smtp_config.get('max_mensagens_por_conexao', 100)
+
+        # Pool de sessões: o limite de conexões e a taxa valem para todos os envios
+        # simultâneos deste notificador (ex: vários workers da fila)
+        self.conexoes_simultaneas = max(1, smtp_config.get('conexoes_simultaneas', 1))
+        self._semaforo_conexoes = threading.BoundedSemaphore(self.conexoes_simultaneas)
+        self._limitador = LimitadorTaxa(smtp_config.get('max_mensagens_por_segundo', 0))
+
+        # Modo bcc: uma mensagem com vários RCPT TO, sem expor os destinatários no header
+        self.modo_envio = smtp_config.get('modo_envio', 'individual')
+        self.destinatarios_por_mensagem = max(1, smtp_config.get('destinatarios_por_mensagem', 50))
 
     def enviar_alerta(
         self,
@@ -78,59 +222,190 @@ class EmailNotifier:
         if not emails_destino:
             return False
 
-        try:
-            # Envia para cada destinatário
-            enviados = 0
-            for email_destino in emails_destino:
-                if not email_destino or '@' not in email_destino:
-                    continue
-
-                # Cria mensagem
-                msg = MIMEMultipart('alternative')
-                msg['Subject'] = f'[Monitor de Editais] Alerta Detectado - {get_brasilia_time().strftime("%d/%m/%Y %H:%M")}'
-                msg['From'] = self.from_email
-                msg['To'] = email_destino
-
-                # Corpo do email
-                texto = self._criar_corpo_texto(url, palavras_encontradas, mudanca_conteudo, conteudo_resumo)
-                html = self._criar_corpo_html(url, palavras_encontradas, mudanca_conteudo, conteudo_resumo)
-
-                parte_texto = MIMEText(texto, 'plain', 'utf-8')
-                parte_html = MIMEText(html, 'html', 'utf-8')
+        resultados = self.enviar_alerta_detalhado(
+            url, palavras_encontradas, mudanca_conteudo, emails_destino, conteudo_resumo
+        )
+        return any(r['enviado'] for r in resultados.values())
 
-                msg.attach(parte_texto)
-                msg.attach(parte_html)
-
-                # Envia email
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    if self.use_tls:
-                        server.starttls()
-
-                    if self.smtp_user and self.smtp_password:
-                        server.login(self.smtp_user, self.smtp_password)
+    def enviar_alerta_detalhado(
+        self,
+        url: str,
+        palavras_encontradas: List[str],
+        mudanca_conteudo: bool,
+        destinatarios: List[str],
+        conteudo_resumo: str = "",
+        detectado_em: Optional[str] = None,
+        diff: str = "",
+        total_mudancas: int = 1,
+        anexos: Optional[Dict] = None
+    ) -> Dict[str, Dict]:
+        """
+        Envia o alerta e retorna o resultado de cada destinatário
 
-                    server.send_message(msg)
-                    enviados += 1
+        Args:
+            detectado_em: Momento da detecção em ISO 8601 (se None, usa o horário atual)
+            diff: Trechos alterados ('- removido' / '+ adicionado'), um por linha
+            total_mudancas: Quantidade de mudanças agrupadas neste alerta (resumo)
+            anexos: Delta dos links de anexos {'adicionados', 'removidos', 'alterados'}
 
-            return enviados > 0
+        Returns:
+            Dicionário {email: {'enviado': bool, 'erro': str, 'permanente': bool}}.
+            'permanente' indica falha que não deve ser retentada (ex: caixa inexistente).
+        """
+        resultados = {}
+        pendentes = []
+        for email_destino in destinatarios:
+            if not endereco_valido(email_destino):
+                resultados[email_destino] = {'enviado': False, 'erro': 'Endereço inválido', 'permanente': True}
+            else:
+                pendentes.append(email_destino)
+
+        if not pendentes:
+            return resultados
+
+        # Mensagem renderizada e serializada uma única vez; por envio só muda o To
+        momento = datetime.fromisoformat(detectado_em) if detectado_em else None
+        dados = self.renderizar_alerta(url, palavras_encontradas, mudanca_conteudo, conteudo_resumo, momento,
+                                       diff, total_mudancas, anexos)
+
+        # Unidades de envio: listas de destinatários do RCPT TO de cada mensagem
+        tamanho_lote = self.destinatarios_por_mensagem if self.modo_envio == 'bcc' else 1
+        fila = queue.Queue()
+        for i in range(0, len(pendentes), tamanho_lote):
+            fila.put(pendentes[i:i + tamanho_lote])
+
+        sessoes = min(self.conexoes_simultaneas, fila.qsize())
+        with ThreadPoolExecutor(max_workers=sessoes, thread_name_prefix='smtp') as executor:
+            for _ in range(sessoes):
+                executor.submit(self._trabalhador_envio, fila, dados, resultados)
+
+        # Se todas as sessões falharam, o que sobrou na fila é retentável
+        while not fila.empty():
+            lote = fila.get_nowait()
+            for email_destino in lote:
+                resultados[email_destino] = {'enviado': False, 'erro': 'Nenhuma sessão SMTP disponível', 'permanente': False}
+
+        return resultados
+
+    def _trabalhador_envio(self, fila: queue.Queue, dados: bytes, resultados: Dict[str, Dict]):
+        """Consome unidades de envio da fila usando uma sessão SMTP própria"""
+        with self._semaforo_conexoes, SessaoSMTP(self) as sessao:
+            while True:
+                try:
+                    lote = fila.get_nowait()
+                except queue.Empty:
+                    return
+
+                if self.modo_envio == 'bcc':
+                    cabecalho = b'To: undisclosed-recipients:;\r\n'
+                else:
+                    cabecalho = b'To: ' + lote[0].encode('utf-8') + b'\r\n'
+
+                self._limitador.aguardar()
+                try:
+                    recusados = sessao.enviar(lote, cabecalho + dados)
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Destinatários recusados não invalidam a sessão
+                    recusados = e.recipients
+                except (smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                    # Mensagem rejeitada, mas a sessão continua válida (smtplib já fez RSET)
+                    for email_destino in lote:
+                        resultados[email_destino] = {
+                            'enviado': False,
+                            'erro': f"Mensagem rejeitada ({e.smtp_code}): {e.smtp_error.decode(errors='replace')}",
+                            'permanente': e.smtp_code >= 500
+                        }
+                    continue
+                except Exception as e:
+                    # Falha da sessão: este lote pode ser retentado; as demais sessões seguem
+                    print(f"Erro ao enviar email: {str(e)}")
+                    for email_destino in lote:
+                        resultados[email_destino] = {'enviado': False, 'erro': str(e), 'permanente': False}
+                    return
+
+                for email_destino in lote:
+                    if email_destino in recusados:
+                        codigo, resposta = recusados[email_destino]
+                        resultados[email_destino] = {
+                            'enviado': False,
+                            'erro': f"Destinatário recusado ({codigo}): {resposta.decode(errors='replace')}",
+                            'permanente': codigo >= 500
+                        }
+                    else:
+                        resultados[email_destino] = {'enviado': True}
+
+    def renderizar_alerta(
+        self,
+        url: str,
+        palavras_encontradas: List[str],
+        mudanca_conteudo: bool,
+        conteudo_resumo: str = "",
+        momento: Optional[datetime] = None,
+        diff: str = "",
+        total_mudancas: int = 1,
+        anexos: Optional[Dict] = None
+    ) -> bytes:
+        """
+        Renderiza e codifica o alerta uma única vez
 
-        except Exception as e:
-            print(f"Erro ao enviar email: {str(e)}")
-            return False
+        Returns:
+            Mensagem MIME serializada (CRLF) sem o header To, pronta para receber
+            o destinatário na frente e ir direto para o SMTP
+        """
+        momento = momento or get_brasilia_time()
+
+        msg = MIMEMultipart('alternative')
+        if total_mudancas > 1:
+            msg['Subject'] = f'[Monitor de Editais] Resumo: {total_mudancas} mudanças - {momento.strftime("%d/%m/%Y %H:%M")}'
+        else:
+            msg['Subject'] = f'[Monitor de Editais] Alerta Detectado - {momento.strftime("%d/%m/%Y %H:%M")}'
+        msg['From'] = self.from_email
+
+        # Corpo do email
+        texto = self._criar_corpo_texto(url, palavras_encontradas, mudanca_conteudo, conteudo_resumo, momento,
+                                        diff, total_mudancas, anexos)
+        html = self._criar_corpo_html(url, palavras_encontradas, mudanca_conteudo, conteudo_resumo, momento,
+                                      diff, total_mudancas, anexos)
+
+        parte_texto = MIMEText(texto, 'plain', 'utf-8')
+        parte_html = MIMEText(html, 'html', 'utf-8')
+
+        msg.attach(parte_texto)
+        msg.attach(parte_html)
+
+        return msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+
+    @staticmethod
+    def _linhas_anexos(anexos: Optional[Dict]) -> List[str]:
+        """Uma linha por anexo do delta: '+' novo, '-' removido, '~' arquivo alterado"""
+        linhas = []
+        for sinal, chave in (('+', 'adicionados'), ('-', 'removidos'), ('~', 'alterados')):
+            for anexo in (anexos or {}).get(chave, []):
+                nome = anexo.get('texto') or anexo['url'].rsplit('/', 1)[-1]
+                linha = f"{sinal} {nome} ({anexo['url']})"
+                if anexo.get('palavras_encontradas'):
+                    linha += f" [palavras no anexo: {', '.join(anexo['palavras_encontradas'])}]"
+                linhas.append(linha)
+        return linhas
 
     def _criar_corpo_texto(
         self,
         url: str,
         palavras_encontradas: List[str],
         mudanca_conteudo: bool,
-        conteudo_resumo: str = ""
+        conteudo_resumo: str = "",
+        momento: Optional[datetime] = None,
+        diff: str = "",
+        total_mudancas: int = 1,
+        anexos: Optional[Dict] = None
     ) -> str:
         """Cria corpo de texto simples do email"""
+        momento = momento or get_brasilia_time()
         linhas = [
             "ALERTA DO MONITOR DE EDITAIS",
             "=" * 50,
             "",
-            f"Data/Hora: {get_brasilia_time().strftime('%d/%m/%Y %H:%M:%S')}",
+            f"Data/Hora: {momento.strftime('%d/%m/%Y %H:%M:%S')}",
             f"URL: {url}",
             ""
         ]
@@ -141,6 +416,25 @@ class EmailNotifier:
             linhas.append("não apenas porque palavras-chave foram encontradas)")
             linhas.append("")
 
+        if total_mudancas > 1:
+            linhas.append(f"Resumo de {total_mudancas} mudanças agrupadas neste alerta.")
+            linhas.append("")
+
+        if diff:
+            linhas.append("Trechos alterados:")
+            linhas.append("-" * 50)
+            linhas.append(diff)
+            linhas.append("-" * 50)
+            linhas.append("")
+
+        linhas_anexos = self._linhas_anexos(anexos)
+        if linhas_anexos:
+            linhas.append("Anexos (+ novo, - removido, ~ arquivo alterado):")
+            linhas.append("-" * 50)
+            linhas.extend(linhas_anexos)
+            linhas.append("-" * 50)
+            linhas.append("")
+
         if conteudo_resumo:
             linhas.append("Prévia do conteúdo atual:")
             linhas.append("-" * 50)
@@ -169,9 +463,14 @@ class EmailNotifier:
         url: str,
         palavras_encontradas: List[str],
         mudanca_conteudo: bool,
-        conteudo_resumo: str = ""
+        conteudo_resumo: str = "",
+        momento: Optional[datetime] = None,
+        diff: str = "",
+        total_mudancas: int = 1,
+        anexos: Optional[Dict] = None
     ) -> str:
         """Cria corpo HTML do email"""
+        momento = momento or get_brasilia_time()
         palavras_html = ""
         if palavras_encontradas:
             palavras_html = "<ul>"
@@ -191,6 +490,42 @@ class EmailNotifier:
             </div>
             """
 
+        resumo_html = ""
+        if total_mudancas > 1:
+            resumo_html = f"""
+            <div class="info-box">
+                <h3>Resumo de {total_mudancas} mudanças</h3>
+                <p>As mudanças detectadas no período foram agrupadas neste alerta.</p>
+            </div>
+            """
+
+        diff_html = ""
+        if diff:
+            diff_escapado = diff.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            diff_html = f"""
+            <div class="info-box" style="background: white; padding: 15px; margin: 15px 0; border-radius: 6px; border-left: 4px solid #e67e22;">
+                <h3 style="margin: 0 0 10px 0; color: #1a1a1a;">Trechos Alterados:</h3>
+                <div style="background: #f8f9fa; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 13px; line-height: 1.6; color: #2d3748; white-space: pre-wrap; word-wrap: break-word;">
+{diff_escapado}
+                </div>
+            </div>
+            """
+
+        anexos_html = ""
+        linhas_anexos = self._linhas_anexos(anexos)
+        if linhas_anexos:
+            itens = ''.join(
+                f"<li>{linha.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')}</li>"
+                for linha in linhas_anexos
+            )
+            anexos_html = f"""
+            <div class="info-box" style="background: white; padding: 15px; margin: 15px 0; border-radius: 6px; border-left: 4px solid #8e44ad;">
+                <h3 style="margin: 0 0 10px 0; color: #1a1a1a;">Anexos:</h3>
+                <p style="margin: 0 0 8px 0; font-size: 12px; color: #718096;">+ novo, - removido, ~ arquivo alterado</p>
+                <ul style="margin: 0; padding-left: 20px; font-size: 13px; word-break: break-all;">{itens}</ul>
+            </div>
+            """
+
         conteudo_html = ""
         if conteudo_resumo:
             # Escape HTML no resumo para evitar problemas
@@ -226,11 +561,17 @@ class EmailNotifier:
             <div class="container">
                 <div class="header">
                     <h1>Alerta do Monitor de Editais</h1>
-                    <p>{get_brasilia_time().strftime('%d/%m/%Y às %H:%M:%S')}</p>
+                    <p>{momento.strftime('%d/%m/%Y às %H:%M:%S')}</p>
                 </div>
                 <div class="content">
                     {mudanca_html}
 
+                    {resumo_html}
+
+                    {diff_html}
+
+                    {anexos_html}
+
                     {conteudo_html}
 
                     {f'<div class="info-box"><h3>Palavras-chave Encontradas:</h3>{palavras_html}</div>' if palavras_encontradas else ''}
@@ -265,12 +606,8 @@ class EmailNotifier:
             return False, "Notificações por email desabilitadas"
 
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10) as server:
-                if self.use_tls:
-                    server.starttls()
-
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
+            with SessaoSMTP(self) as sessao:
+                sessao.conectar()
 
             return True, "Conexão SMTP bem-sucedida"
 
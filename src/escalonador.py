@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Módulo de Escalonamento de Verificações
+Uma única thread mantém um heap com o próximo vencimento de cada alvo e dorme até o mais próximo
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+
+class EscalonadorVerificacoes:
+    """
+    Agenda verificações de muitos alvos com uma única thread
+
+    O heap guarda (vencimento, sequência, alvo). Reagendar um alvo apenas empilha
+    uma nova entrada; a antiga fica obsoleta e é descartada quando chega ao topo.
+    A thread dorme em um Event com timeout até o próximo vencimento, então em
+    repouso não há nenhum despertar periódico. agendar(), executar_agora() e
+    parar() acionam o Event para recalcular a espera na hora.
+
+    As verificações rodam em um pool de workers; cada alvo tem no máximo uma
+    verificação em andamento e é reagendado com o intervalo retornado por `executar`.
+
+    executar_agora() devolve um Future por alvo. Pedidos simultâneos para o mesmo
+    alvo recebem o mesmo Future: compartilham a verificação pendente ou em andamento
+    em vez de disparar uma nova.
+    """
+
+    def __init__(self, executar: Callable[[str], float], workers: int = 4,
+                 atraso_erro_segundos: float = 60, log: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            executar: Função executar(alvo) que verifica o alvo e retorna os segundos até a próxima verificação
+            workers: Verificações simultâneas
+            atraso_erro_segundos: Espera usada se `executar` levantar exceção
+            log: Função opcional log(mensagem, tipo)
+        """
+        self.executar = executar
+        self.atraso_erro_segundos = atraso_erro_segundos
+        self.log = log or (lambda mensagem, tipo="INFO": print(f"[{tipo}] {mensagem}", flush=True))
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequencia = itertools.count()
+        self._vencimentos: Dict[str, Tuple[float, int]] = {}  # alvo -> entrada válida no heap
+        self._alvos: Set[str] = set()
+        self._em_execucao: Set[str] = set()
+        self._pedidos: Dict[str, Future] = {}       # pedidos de executar_agora ainda não iniciados
+        self._em_andamento: Dict[str, Future] = {}  # Future da verificação em andamento
+        self._lock = threading.Lock()
+
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='verificacao')
+        self._thread: Optional[threading.Thread] = None
+
+    def agendar(self, alvo: str, atraso_segundos: float = 0):
+        """Agenda (ou reagenda) a próxima verificação do alvo"""
+        vence_em = time.monotonic() + max(0.0, atraso_segundos)
+        with self._lock:
+            self._alvos.add(alvo)
+            if alvo in self._em_execucao:
+                # Será reagendado ao fim da verificação em andamento
+                return
+            entrada = (vence_em, next(self._sequencia), alvo)
+            self._vencimentos[alvo] = entrada[:2]
+            heapq.heappush(self._heap, entrada)
+            self._compactar()
+            antecipou = self._heap[0][1] == entrada[1]
+        if antecipou:
+            self._acordar.set()
+
+    def remover(self, alvo: str):
+        """Remove o alvo do escalonamento (uma verificação em andamento termina normalmente)"""
+        with self._lock:
+            self._alvos.discard(alvo)
+            self._vencimentos.pop(alvo, None)
+            pedido = self._pedidos.pop(alvo, None)
+        if pedido:
+            pedido.cancel()
+
+    def executar_agora(self, alvo: Optional[str] = None) -> Dict[str, Future]:
+        """
+        Antecipa a verificação de um alvo (ou de todos)
+
+        Returns:
+            Future de cada alvo, resolvido com o atraso da próxima verificação quando a
+            verificação termina. Se o alvo já está sendo verificado, ou já tem um pedido
+            pendente, o Future existente é reaproveitado.
+        """
+        antecipar = []
+        futuros = {}
+        with self._lock:
+            alvos = [alvo] if alvo is not None else list(self._alvos)
+            for a in alvos:
+                if a not in self._alvos:
+                    continue
+                if a in self._em_execucao:
+                    futuros[a] = self._em_andamento.setdefault(a, Future())
+                elif a in self._pedidos:
+                    futuros[a] = self._pedidos[a]
+                else:
+                    futuros[a] = self._pedidos[a] = Future()
+                    antecipar.append(a)
+        for a in antecipar:
+            self.agendar(a, 0)
+        return futuros
+
+    def proximo_vencimento(self, alvo: Optional[str] = None) -> Optional[float]:
+        """Timestamp (epoch) da próxima verificação do alvo, ou do alvo mais próximo"""
+        with self._lock:
+            if alvo is not None:
+                entrada = self._vencimentos.get(alvo)
+                vence_em = entrada[0] if entrada else None
+            else:
+                vence_em = min((v[0] for v in self._vencimentos.values()), default=None)
+        if vence_em is None:
+            return None
+        return time.time() + (vence_em - time.monotonic())
+
+    def em_execucao(self, alvo: str) -> bool:
+        with self._lock:
+            return alvo in self._em_execucao
+
+    def total_alvos(self) -> int:
+        with self._lock:
+            return len(self._alvos)
+
+    def _compactar(self):
+        """Reconstrói o heap quando as entradas obsoletas passam a dominar (chamado com o lock)"""
+        if len(self._heap) > 2 * len(self._vencimentos) + 64:
+            self._heap = [(v[0], v[1], a) for a, v in self._vencimentos.items()]
+            heapq.heapify(self._heap)
+
+    def _retirar_vencidos(self) -> Tuple[List[str], Optional[float]]:
+        """Retira do heap os alvos vencidos e calcula a espera até o próximo"""
+        vencidos = []
+        with self._lock:
+            agora = time.monotonic()
+            while self._heap and self._heap[0][0] <= agora:
+                vence_em, sequencia, alvo = heapq.heappop(self._heap)
+                if self._vencimentos.get(alvo) != (vence_em, sequencia):
+                    continue  # entrada obsoleta (reagendada ou removida)
+                del self._vencimentos[alvo]
+                self._em_execucao.add(alvo)
+                if alvo in self._pedidos:
+                    self._em_andamento[alvo] = self._pedidos.pop(alvo)
+                vencidos.append(alvo)
+            espera = self._heap[0][0] - agora if self._heap else None
+        return vencidos, espera
+
+    def _executar_alvo(self, alvo: str):
+        try:
+            atraso = self.executar(alvo)
+        except Exception as e:
+            self.log(f"Erro inesperado ao verificar {alvo}: {e}", "ERRO")
+            atraso = self.atraso_erro_segundos
+
+        with self._lock:
+            self._em_execucao.discard(alvo)
+            futuro = self._em_andamento.pop(alvo, None)
+            ativo = alvo in self._alvos
+        if futuro and not futuro.done():
+            futuro.set_result(atraso)
+        if ativo and not self._parar.is_set():
+            self.agendar(alvo, atraso)
+
+    def executar_loop(self):
+        """Loop do escalonador; bloqueia até parar() ser chamado"""
+        while not self._parar.is_set():
+            # Limpa antes de ler o heap: um agendar() concorrente faz o wait retornar na hora
+            self._acordar.clear()
+            vencidos, espera = self._retirar_vencidos()
+            for alvo in vencidos:
+                try:
+                    self._executor.submit(self._executar_alvo, alvo)
+                except RuntimeError:
+                    return  # executor encerrado por parar()
+            if not vencidos:
+                self._acordar.wait(espera)
+
+    def iniciar(self):
+        """Executa o loop em uma thread própria (idempotente)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.executar_loop, name='escalonador', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Encerra o loop; verificações em andamento terminam em background"""
+        self._parar.set()
+        self._acordar.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            # Verificações na fila do executor foram descartadas: ninguém resolveria estes Futures
+            pedidos = list(self._pedidos.values()) + list(self._em_andamento.values())
+            self._pedidos.clear()
+        for pedido in pedidos:
+            pedido.cancel()
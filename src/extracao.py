@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Módulo de Extração
+Análise do HTML (parsing, extração do conteúdo relevante e palavras-chave), opcionalmente em processos separados
+"""
+
+import codecs
+import hashlib
+import io
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# Seletores genéricos usados além da seção principal e das tabelas
+SELETORES_ADICIONAIS = [
+    'div.wrapper',
+    'div.content',
+    'div.edital',
+    'div.resultado',
+    'div.main-content',
+    'article',
+    'div[class*="content"]',
+    'div[id*="content"]'
+]
+
+# Links para estes arquivos são acompanhados como anexos do alvo
+EXTENSOES_ANEXOS = ('.pdf',)
+
+
+def eh_anexo(href: str) -> bool:
+    """O link aponta para um anexo (pela extensão do caminho, ignorando query e fragmento)"""
+    return urlsplit(href).path.lower().endswith(EXTENSOES_ANEXOS)
+
+
+def extrair_anexos(soup: BeautifulSoup) -> List[Dict]:
+    """Links de anexos da página, na ordem do documento e sem repetir o mesmo href"""
+    anexos = []
+    vistos = set()
+    for link in soup.find_all('a', href=True):
+        href = link['href'].strip()
+        if eh_anexo(href) and href not in vistos:
+            vistos.add(href)
+            anexos.append({'href': href, 'texto': link.get_text(' ', strip=True)})
+    return anexos
+
+
+def extrair_blocos(soup: BeautifulSoup, ignorar_seletores: Optional[List[str]] = None) -> List[str]:
+    """
+    Extrai os blocos de texto relevantes da página, na ordem em que compõem o conteúdo
+
+    Elementos de `ignorar_seletores` (banners rotativos, contadores) são removidos antes.
+    """
+    for seletor in ignorar_seletores or []:
+        for elemento in soup.select(seletor):
+            elemento.decompose()
+
+    conteudo_total = []
+
+    # Estratégia 1: Tenta extrair seção principal (mais específico)
+    section_principal = soup.find('section', class_='slice')
+    if section_principal:
+        conteudo_total.append(section_principal.get_text(strip=True))
+
+    # Estratégia 2: Extrai todas as tabelas (dados estruturados importantes)
+    tabelas = soup.find_all('table')
+    for tabela in tabelas:
+        conteudo_total.append(tabela.get_text(strip=True))
+
+    # Estratégia 3: Seletores genéricos adicionais
+    for seletor in SELETORES_ADICIONAIS:
+        elementos = soup.select(seletor)
+        for elemento in elementos:
+            texto = elemento.get_text(strip=True)
+            # Evita duplicação: só adiciona se não estiver vazio e não for muito similar ao já coletado
+            if texto and texto not in ' '.join(conteudo_total):
+                conteudo_total.append(texto)
+
+    # Fallback: Se nada foi encontrado, usa body inteiro
+    if not conteudo_total:
+        body = soup.find('body')
+        if body:
+            conteudo_total.append(body.get_text(strip=True))
+
+    return conteudo_total
+
+
+def encontrar_palavras(conteudo: str, palavras_chave: List[str]) -> List[str]:
+    """Palavras-chave (já em minúsculas) presentes no conteúdo"""
+    conteudo_lower = conteudo.lower()
+    return [palavra for palavra in palavras_chave if palavra in conteudo_lower]
+
+
+def decodificar_html(html: Union[bytes, memoryview, str]) -> str:
+    """Decodifica o corpo da resposta como UTF-8 (mesmo critério de response.text com encoding forçado)"""
+    if isinstance(html, str):
+        return html
+    return str(html, 'utf-8', 'replace')
+
+
+def _hash_bloco(texto: str) -> str:
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:16]
+
+
+def analisar_html(html: Union[bytes, memoryview, str], palavras_chave: List[str],
+                  ignorar_seletores: Optional[List[str]] = None) -> Dict:
+    """
+    Parsing, extração e palavras-chave de uma página
+
+    Returns:
+        Resultado compacto: {'conteudo', 'palavras_encontradas', 'hashes_blocos', 'anexos'}
+    """
+    soup = BeautifulSoup(decodificar_html(html), 'lxml')
+    blocos = extrair_blocos(soup, ignorar_seletores)
+    conteudo = ' '.join(blocos)
+    return {
+        'conteudo': conteudo,
+        'palavras_encontradas': encontrar_palavras(conteudo, palavras_chave),
+        'hashes_blocos': [_hash_bloco(b) for b in blocos],
+        # Depois de extrair_blocos: links dentro de elementos ignorados já foram removidos
+        'anexos': extrair_anexos(soup)
+    }
+
+
+def _compilar_seletor(seletor: str) -> Callable[[str, Dict], bool]:
+    """
+    Converte um seletor (de SELETORES_ADICIONAIS ou ignorado) em um teste sobre (tag, atributos)
+
+    Suporta as formas usadas na lista: 'tag', 'tag.classe' e 'tag[atributo*="valor"]'.
+    """
+    casamento = re.match(r'^(\w+)(?:\.([\w-]+)|\[(\w+)\*="([^"]*)"\])?$', seletor)
+    if not casamento:
+        raise ValueError(f"Seletor não suportado na análise incremental: {seletor}")
+    tag, classe, atributo, trecho = casamento.groups()
+    if classe:
+        return lambda t, attrs: t == tag and classe in attrs.get('class', '').split()
+    if atributo:
+        return lambda t, attrs: t == tag and trecho in ' '.join(attrs.get(atributo, '').split())
+    return lambda t, attrs: t == tag
+
+
+class _Bloco:
+    """Elemento cujo texto compõe um bloco (seção principal, tabela, seletor ou body)"""
+
+    def __init__(self, ordem: int, estrategias: List):
+        self.ordem = ordem
+        self.estrategias = estrategias
+        self.texto = io.StringIO()
+
+
+class AnalisadorIncremental:
+    """
+    Análise de uma página com memória limitada, alimentada em pedaços durante o download
+
+    Produz o mesmo resultado de analisar_html sem montar a árvore inteira: o parser
+    pull do lxml emite eventos de início/fim de elemento e cada subárvore é descartada
+    assim que o texto dela foi repassado. Só os elementos abertos (e o último irmão já
+    fechado de cada um) ficam em memória; o texto vai direto para os blocos abertos que
+    o contêm (seção principal, tabelas, seletores de SELETORES_ADICIONAIS e o body,
+    este só enquanto nenhum outro bloco apareceu). O hash de cada bloco é calculado
+    quando o elemento fecha. Elementos ignorados e tudo dentro deles não contam, como
+    se tivessem sido removidos da árvore.
+
+    Uso:
+        analisador = AnalisadorIncremental(palavras_chave)
+        for pedaco in pedacos:
+            analisador.alimentar(pedaco)
+        resultado = analisador.finalizar()
+    """
+
+    # Texto dentro destes elementos não entra no get_text() do BeautifulSoup
+    TAGS_SEM_TEXTO = {'script', 'style', 'template'}
+
+    def __init__(self, palavras_chave: List[str], ignorar_seletores: Optional[List[str]] = None):
+        self.palavras_chave = palavras_chave
+        self._seletores = [_compilar_seletor(s) for s in SELETORES_ADICIONAIS]
+        self._ignorar = [_compilar_seletor(s) for s in ignorar_seletores or []]
+        self._parser = etree.HTMLPullParser(events=('start', 'end'))
+        self._decodificador = codecs.getincrementaldecoder('utf-8')('replace')
+
+        self._pilha: List[Dict] = []        # elementos abertos: {'elemento', 'bloco', 'tag', 'texto_lido'}
+        self._blocos_abertos: List[_Bloco] = []
+        self._sem_texto = 0                 # script/style/template abertos
+        self._ignorados = 0                 # elementos ignorados abertos
+        self._ordem = 0
+        self._slice_visto = False
+        self._algum_bloco = False           # já existe bloco que dispensa o fallback do body
+
+        self._secao: Optional[Tuple[int, str]] = None
+        self._tabelas: List[Tuple[int, str]] = []
+        self._por_seletor: List[List[Tuple[int, str]]] = [[] for _ in SELETORES_ADICIONAIS]
+        self._body: Optional[str] = None
+        self._hashes: Dict[int, str] = {}
+        self._anexos: List[Dict] = []
+        self._hrefs_vistos = set()
+        self._links_abertos: List[Tuple[Dict, List[str]]] = []    # anexo e pedaços do texto do link
+
+    def alimentar(self, pedaco: bytes):
+        self._parser.feed(self._decodificador.decode(pedaco))
+        self._processar_eventos()
+
+    def finalizar(self) -> Dict:
+        """Encerra o parsing e monta {'conteudo', 'palavras_encontradas', 'hashes_blocos', 'anexos'}"""
+        resto = self._decodificador.decode(b'', final=True)
+        if resto:
+            self._parser.feed(resto)
+        self._parser.close()
+        self._processar_eventos()
+
+        # Mesma ordem e deduplicação de extrair_blocos
+        blocos: List[Tuple[int, str]] = []
+        if self._secao:
+            blocos.append(self._secao)
+        blocos.extend(sorted(self._tabelas))
+        for encontrados in self._por_seletor:
+            for ordem, texto in sorted(encontrados):
+                if texto and texto not in ' '.join(t for _, t in blocos):
+                    blocos.append((ordem, texto))
+        if not blocos and self._body is not None:
+            blocos.append((-1, self._body))
+
+        conteudo = ' '.join(texto for _, texto in blocos)
+        return {
+            'conteudo': conteudo,
+            'palavras_encontradas': encontrar_palavras(conteudo, self.palavras_chave),
+            'hashes_blocos': [self._hashes.get(ordem) or _hash_bloco(texto) for ordem, texto in blocos],
+            'anexos': self._anexos
+        }
+
+    def _texto(self, texto: Optional[str]):
+        """Repassa um trecho de texto a todos os blocos abertos"""
+        if texto and not self._sem_texto and not self._ignorados:
+            texto = texto.strip()
+            if texto:
+                for bloco in self._blocos_abertos:
+                    bloco.texto.write(texto)
+                for _, partes in self._links_abertos:
+                    partes.append(texto)
+
+    def _consumir_filhos(self, topo: Dict, ate=None):
+        """Repassa o texto do elemento e as caudas dos filhos já fechados, descartando-os"""
+        elemento = topo['elemento']
+        if not topo['texto_lido']:
+            self._texto(elemento.text)
+            topo['texto_lido'] = True
+        for filho in list(elemento):
+            if filho is ate:
+                break
+            # Comentários e instruções de processamento só contribuem com a cauda
+            self._texto(filho.tail)
+            elemento.remove(filho)
+
+    def _processar_eventos(self):
+        for evento, elemento in self._parser.read_events():
+            if evento == 'start':
+                self._iniciar(elemento)
+            else:
+                self._encerrar(elemento)
+
+    def _iniciar(self, elemento):
+        if self._pilha:
+            self._consumir_filhos(self._pilha[-1], ate=elemento)
+
+        tag = elemento.tag if isinstance(elemento.tag, str) else ''
+        atributos = elemento.attrib
+        ignorado = self._ignorados > 0 or any(casa(tag, atributos) for casa in self._ignorar)
+        if ignorado:
+            # Nada dentro de um elemento ignorado vira bloco nem contribui com texto
+            self._ignorados += 1
+            self._pilha.append({'elemento': elemento, 'bloco': None, 'tag': tag, 'texto_lido': False,
+                                'ignorado': True, 'link': False})
+            return
+
+        estrategias = []
+        if tag == 'section' and not self._slice_visto and 'slice' in elemento.get('class', '').split():
+            self._slice_visto = True
+            estrategias.append('secao')
+        if tag == 'table':
+            estrategias.append('tabela')
+        for i, casa in enumerate(self._seletores):
+            if casa(tag, atributos):
+                estrategias.append(i)
+        # Seção principal e tabelas sempre entram no conteúdo: o fallback do body não será usado
+        if ('secao' in estrategias or 'tabela' in estrategias):
+            self._descartar_body()
+        if tag == 'body' and not self._algum_bloco:
+            estrategias.append('body')
+
+        bloco = None
+        if estrategias:
+            self._ordem += 1
+            bloco = _Bloco(self._ordem, estrategias)
+            self._blocos_abertos.append(bloco)
+        # Links de anexos: a vaga é reservada na abertura (ordem do documento), o texto vem no fechamento
+        link = False
+        href = (atributos.get('href') or '').strip()
+        if tag == 'a' and href and eh_anexo(href) and href not in self._hrefs_vistos:
+            self._hrefs_vistos.add(href)
+            anexo = {'href': href, 'texto': ''}
+            self._anexos.append(anexo)
+            self._links_abertos.append((anexo, []))
+            link = True
+        self._pilha.append({'elemento': elemento, 'bloco': bloco, 'tag': tag, 'texto_lido': False,
+                            'ignorado': False, 'link': link})
+        if tag in self.TAGS_SEM_TEXTO:
+            self._sem_texto += 1
+
+    def _descartar_body(self):
+        if self._algum_bloco:
+            return
+        self._algum_bloco = True
+        for bloco in self._blocos_abertos:
+            if bloco.estrategias == ['body']:
+                self._blocos_abertos.remove(bloco)
+                break
+
+    def _encerrar(self, elemento):
+        topo = self._pilha[-1]
+        self._consumir_filhos(topo)
+        if topo['ignorado']:
+            self._ignorados -= 1
+        elif topo['tag'] in self.TAGS_SEM_TEXTO:
+            self._sem_texto -= 1
+        self._pilha.pop()
+        if topo['link']:
+            anexo, partes = self._links_abertos.pop()
+            anexo['texto'] = ' '.join(partes)
+
+        bloco = topo['bloco']
+        if bloco is None or bloco not in self._blocos_abertos:
+            return
+        self._blocos_abertos.remove(bloco)
+        texto = bloco.texto.getvalue()
+        bloco.texto.close()
+        for estrategia in bloco.estrategias:
+            if estrategia == 'secao':
+                self._secao = (bloco.ordem, texto)
+            elif estrategia == 'tabela':
+                self._tabelas.append((bloco.ordem, texto))
+            elif estrategia == 'body':
+                self._body = texto
+            else:
+                self._por_seletor[estrategia].append((bloco.ordem, texto))
+                if texto:
+                    self._descartar_body()
+        if texto:
+            self._hashes[bloco.ordem] = _hash_bloco(texto)
+
+
+def _analisar_memoria_compartilhada(nome: str, tamanho: int, palavras_chave: List[str],
+                                   ignorar_seletores: Optional[List[str]] = None) -> Dict:
+    """Executada no processo worker: lê a página direto do bloco de memória compartilhada"""
+    memoria = shared_memory.SharedMemory(name=nome)
+    visao = memoria.buf[:tamanho]
+    try:
+        return analisar_html(visao, palavras_chave, ignorar_seletores)
+    finally:
+        visao.release()
+        memoria.close()
+
+
+class ExtratorProcessos:
+    """
+    Pool de processos para a análise do HTML
+
+    O parsing com BeautifulSoup/lxml segura o GIL; em processos separados, uma página
+    grande não trava as threads do Flask e vários alvos usam vários núcleos.
+    Páginas acima de `limite_memoria_compartilhada` são copiadas uma única vez para
+    um bloco de memória compartilhada e decodificadas direto dele pelo worker (sem
+    serializar os bytes pelo pipe); só o resultado compacto volta ao processo principal.
+    """
+
+    def __init__(self, workers: int = 2, limite_memoria_compartilhada: int = 64 * 1024):
+        """
+        Args:
+            workers: Número de processos
+            limite_memoria_compartilhada: Tamanho (bytes) a partir do qual a página vai por memória compartilhada
+        """
+        self.workers = workers
+        self.limite_memoria_compartilhada = limite_memoria_compartilhada
+        # 'spawn': o processo principal tem várias threads, e fork com threads ativas não é seguro
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def analisar(self, html: bytes, palavras_chave: List[str], ignorar_seletores: Optional[List[str]] = None) -> Dict:
+        """Analisa a página em um processo worker (bloqueia até o resultado)"""
+        if len(html) < self.limite_memoria_compartilhada:
+            return self._executor.submit(analisar_html, html, palavras_chave, ignorar_seletores).result()
+
+        memoria = shared_memory.SharedMemory(create=True, size=len(html))
+        try:
+            memoria.buf[:len(html)] = html
+            return self._executor.submit(
+                _analisar_memoria_compartilhada, memoria.name, len(html), palavras_chave, ignorar_seletores
+            ).result()
+        finally:
+            memoria.close()
+            memoria.unlink()
+
+    def parar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
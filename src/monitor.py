@@ -2,19 +2,64 @@
 """
 Módulo de Monitoramento de Editais
 Contém a lógica principal de monitoramento
+
+Também pode ser executado como verificação única em lote (cron, CI): cada alvo do
+arquivo é verificado uma vez, em paralelo, e o resultado sai em NDJSON.
+
+Uso:
+    python3 -m src.monitor alvos.txt
+    python3 -m src.monitor alvos.json --workers 32 --estado hashes.json > resultados.ndjson
 """
 
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from bs4 import BeautifulSoup
 import hashlib
-from typing import Optional, Set, List
+import difflib
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional, Set, List
 from datetime import datetime
 
+from src.anexos import RastreadorAnexos
+from src.cortesia import ControleCortesia, RequisicaoAdiada
+from src.extracao import (AnalisadorIncremental, ExtratorProcessos, analisar_html, decodificar_html,
+                          encontrar_palavras, extrair_blocos)
+from src.normalizacao import NormalizadorConteudo, aparar_comuns, config_do_alvo
+from src.resiliencia import ler_retry_after
+from src.similaridade import similaridade, simhash
+
+
+class ErroBuscaPagina(Exception):
+    """
+    Falha ao buscar a página
+
+    Attributes:
+        tipo: Classe do erro ('timeout', 'conexao', 'http_5xx', 'http_429', 'http_4xx', 'tamanho_excedido', 'outro')
+        status_http: Status HTTP da resposta, quando houver
+        retry_after: Segundos pedidos pelo servidor no header Retry-After, quando houver
+    """
+
+    def __init__(self, mensagem: str, tipo: str = 'outro', status_http: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(mensagem)
+        self.tipo = tipo
+        self.status_http = status_http
+        self.retry_after = retry_after
+
 
 class MonitorEdital:
     """Classe para monitoramento de editais públicos"""
 
-    def __init__(self, url: str, palavras_chave: List[str], intervalo_minutos: int = 10):
+    def __init__(self, url: str, palavras_chave: List[str], intervalo_minutos: int = 10,
+                 cortesia: Optional[ControleCortesia] = None, memoria_limitada: Optional[Dict] = None,
+                 normalizacao: Optional[Dict] = None, volateis_aprendidos: Optional[List[Dict]] = None,
+                 diretorio_conteudo: Optional[str] = None):
         """
         Inicializa o monitor de edital
 
@@ -22,105 +67,493 @@ class MonitorEdital:
             url: URL da página do edital a ser monitorada
             palavras_chave: Lista de palavras-chave para buscar
             intervalo_minutos: Intervalo entre checagens em minutos
+            cortesia: Limites por host compartilhados entre monitores (None = sem limites)
+            memoria_limitada: Seção 'memoria_limitada' do config.json
+                {
+                    'enabled': bool,
+                    'max_bytes': int,               # páginas maiores são abortadas no download
+                    'bloco_leitura_bytes': int      # tamanho dos pedaços lidos e analisados
+                }
+            normalizacao: Seção 'normalizacao' do config.json (ou do alvo), ver NormalizadorConteudo
+            volateis_aprendidos: Trechos voláteis aprendidos em execuções anteriores
+            diretorio_conteudo: Onde guardar o conteúdo da última verificação (None = em memória)
         """
         self.url = url
         self.palavras_chave = [palavra.lower() for palavra in palavras_chave]
         self.intervalo_segundos = intervalo_minutos * 60
+        self.cortesia = cortesia
+        memoria_limitada = memoria_limitada or {}
+        # Download em partes e parsing incremental, com limite de tamanho
+        self.memoria_limitada = memoria_limitada.get('enabled', False)
+        self.max_bytes: Optional[int] = None
+        if self.memoria_limitada:
+            self.max_bytes = memoria_limitada.get('max_bytes', 50 * 1024 * 1024)
+        self.bloco_leitura_bytes = memoria_limitada.get('bloco_leitura_bytes', 64 * 1024)
+        # Máscaras de trechos voláteis aplicadas antes do hash (None = conteúdo como extraído)
+        self.normalizador: Optional[NormalizadorConteudo] = None
+        self.ignorar_seletores: List[str] = []
+        if normalizacao and normalizacao.get('enabled', False):
+            self.normalizador = NormalizadorConteudo(normalizacao, volateis_aprendidos)
+            self.ignorar_seletores = self.normalizador.ignorar_seletores
+        # Trechos aprendidos na última verificação (o app registra no log e persiste)
+        self.volateis_novos: List[Dict] = []
         self.hash_anterior: Optional[str] = None
+        # Conteúdo da última verificação (base do diff), em disco quando há diretório: a
+        # memória não cresce com o número de alvos. O arquivo de uma execução anterior é
+        # descartado, pois pode ser mais novo que o hash salvo (crash entre os dois)
+        self._conteudo_anterior: Optional[str] = None
+        self._caminho_conteudo: Optional[str] = None
+        if diretorio_conteudo:
+            os.makedirs(diretorio_conteudo, exist_ok=True)
+            nome = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+            self._caminho_conteudo = os.path.join(diretorio_conteudo, f"{nome}.txt")
+            self.conteudo_anterior = None
+        # SimHash do conteúdo normalizado (persistido pelo app) e similaridade da última mudança
+        self.simhash_anterior: Optional[str] = None
+        self.similaridade: Optional[float] = None
         # Headers simplificados - requests lida automaticamente com gzip/deflate
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
                          '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         }
 
+    @property
+    def conteudo_anterior(self) -> Optional[str]:
+        if self._caminho_conteudo is None:
+            return self._conteudo_anterior
+        try:
+            with open(self._caminho_conteudo, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @conteudo_anterior.setter
+    def conteudo_anterior(self, conteudo: Optional[str]):
+        if self._caminho_conteudo is None:
+            self._conteudo_anterior = conteudo
+        elif conteudo is None:
+            if os.path.exists(self._caminho_conteudo):
+                os.remove(self._caminho_conteudo)
+        else:
+            temporario = self._caminho_conteudo + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(conteudo)
+            os.replace(temporario, self._caminho_conteudo)
+
     def calcular_hash(self, conteudo: str) -> str:
         """Calcula hash SHA-256 do conteúdo"""
         return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
 
+    @contextmanager
+    def _resposta(self, stream: bool = False) -> Iterator[requests.Response]:
+        """
+        Requisição à página dentro dos limites de cortesia do host
+
+        Com stream=True o corpo é lido por quem usa a resposta, ainda dentro da vaga do
+        host. Erros da requisição (inclusive durante a leitura do corpo) viram ErroBuscaPagina.
+
+        Raises:
+            ErroBuscaPagina: falha na requisição
+            RequisicaoAdiada: limites de cortesia do host impedem a requisição agora
+        """
+        try:
+            with self.cortesia.requisicao(self.url) if self.cortesia else nullcontext():
+                response = requests.get(self.url, headers=self.headers, timeout=30, stream=stream)
+                try:
+                    response.raise_for_status()
+                    yield response
+                finally:
+                    response.close()
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status == 429:
+                tipo = 'http_429'
+            elif status is not None and status >= 500:
+                tipo = 'http_5xx'
+            else:
+                tipo = 'http_4xx'
+            retry_after = ler_retry_after(e.response.headers.get('Retry-After')) if e.response is not None else None
+            if retry_after and status in (429, 503) and self.cortesia:
+                self.cortesia.registrar_retry_after(self.url, retry_after)
+            raise ErroBuscaPagina(f"Erro ao buscar página: {str(e)}", tipo, status, retry_after)
+        except requests.exceptions.Timeout as e:
+            raise ErroBuscaPagina(f"Erro ao buscar página: {str(e)}", 'timeout')
+        except requests.exceptions.ConnectionError as e:
+            raise ErroBuscaPagina(f"Erro ao buscar página: {str(e)}", 'conexao')
+        except requests.exceptions.RequestException as e:
+            raise ErroBuscaPagina(f"Erro ao buscar página: {str(e)}")
+
+    def _ler_em_partes(self, response: requests.Response) -> Iterator[bytes]:
+        """
+        Lê o corpo em pedaços, abortando assim que o tamanho passa de max_bytes
+
+        Raises:
+            ErroBuscaPagina: página maior que max_bytes (tipo 'tamanho_excedido')
+        """
+        limite_mib = self.max_bytes / (1024 * 1024)
+        declarado = response.headers.get('Content-Length', '')
+        if declarado.isdigit() and int(declarado) > self.max_bytes:
+            raise ErroBuscaPagina(f"Página com {int(declarado) / (1024 * 1024):.1f} MiB excede o limite "
+                                  f"de {limite_mib:.1f} MiB", 'tamanho_excedido')
+        lidos = 0
+        for pedaco in response.iter_content(chunk_size=self.bloco_leitura_bytes):
+            lidos += len(pedaco)
+            if lidos > self.max_bytes:
+                raise ErroBuscaPagina(f"Página excede o limite de {limite_mib:.1f} MiB "
+                                      f"(download interrompido)", 'tamanho_excedido')
+            yield pedaco
+
+    def baixar_pagina(self) -> bytes:
+        """
+        Baixa o corpo da página
+
+        Returns:
+            Bytes da resposta
+
+        Raises:
+            ErroBuscaPagina: falha na requisição ou página maior que max_bytes
+            RequisicaoAdiada: limites de cortesia do host impedem a requisição agora
+        """
+        if self.max_bytes is None:
+            with self._resposta() as response:
+                return response.content
+        with self._resposta(stream=True) as response:
+            return b''.join(self._ler_em_partes(response))
+
     def buscar_pagina(self) -> Optional[BeautifulSoup]:
         """
         Busca o conteúdo da página
 
         Returns:
             Objeto BeautifulSoup com o conteúdo ou None em caso de erro
+
+        Raises:
+            ErroBuscaPagina: falha na requisição
+            RequisicaoAdiada: limites de cortesia do host impedem a requisição agora
         """
-        try:
-            response = requests.get(self.url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+        # Decodifica como UTF-8 para garantir caracteres corretos
+        return BeautifulSoup(decodificar_html(self.baixar_pagina()), 'lxml')
+
+    def analisar_pagina(self, extrator: Optional[ExtratorProcessos] = None) -> Dict:
+        """
+        Baixa e analisa a página (parsing, conteúdo relevante e palavras-chave)
 
-            # Força encoding UTF-8 para garantir caracteres corretos
-            response.encoding = 'utf-8'
+        No modo de memória limitada, cada pedaço do download vai direto para o parser
+        incremental (o extrator não é usado): nem o HTML inteiro nem a árvore ficam em memória.
 
-            # Usa response.text ao invés de response.content para respeitar o encoding
-            return BeautifulSoup(response.text, 'lxml')
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Erro ao buscar página: {str(e)}")
+        Args:
+            extrator: Pool de processos para o parsing; None analisa neste processo
+
+        Returns:
+            {'conteudo', 'palavras_encontradas', 'hashes_blocos'}
+        """
+        if self.memoria_limitada:
+            analisador = AnalisadorIncremental(self.palavras_chave, self.ignorar_seletores)
+            with self._resposta(stream=True) as response:
+                for pedaco in self._ler_em_partes(response):
+                    analisador.alimentar(pedaco)
+            return analisador.finalizar()
+
+        html = self.baixar_pagina()
+        if extrator:
+            return extrator.analisar(html, self.palavras_chave, self.ignorar_seletores)
+        return analisar_html(html, self.palavras_chave, self.ignorar_seletores)
 
     def extrair_conteudo_relevante(self, soup: BeautifulSoup) -> str:
         """Extrai conteúdo relevante da página"""
-        conteudo_total = []
-
-        # Estratégia 1: Tenta extrair seção principal (mais específico)
-        section_principal = soup.find('section', class_='slice')
-        if section_principal:
-            conteudo_total.append(section_principal.get_text(strip=True))
-
-        # Estratégia 2: Extrai todas as tabelas (dados estruturados importantes)
-        tabelas = soup.find_all('table')
-        for tabela in tabelas:
-            conteudo_total.append(tabela.get_text(strip=True))
-
-        # Estratégia 3: Seletores genéricos adicionais
-        seletores_adicionais = [
-            'div.wrapper',
-            'div.content',
-            'div.edital',
-            'div.resultado',
-            'div.main-content',
-            'article',
-            'div[class*="content"]',
-            'div[id*="content"]'
-        ]
-
-        for seletor in seletores_adicionais:
-            elementos = soup.select(seletor)
-            for elemento in elementos:
-                texto = elemento.get_text(strip=True)
-                # Evita duplicação: só adiciona se não estiver vazio e não for muito similar ao já coletado
-                if texto and texto not in ' '.join(conteudo_total):
-                    conteudo_total.append(texto)
-
-        # Fallback: Se nada foi encontrado, usa body inteiro
-        if not conteudo_total:
-            body = soup.find('body')
-            if body:
-                conteudo_total.append(body.get_text(strip=True))
-
-        return ' '.join(conteudo_total)
+        return ' '.join(extrair_blocos(soup, self.ignorar_seletores))
 
     def verificar_palavras_chave(self, conteudo: str) -> List[str]:
         """Verifica palavras-chave no conteúdo"""
-        conteudo_lower = conteudo.lower()
-        palavras_encontradas = []
-
-        for palavra in self.palavras_chave:
-            if palavra in conteudo_lower:
-                palavras_encontradas.append(palavra)
+        return encontrar_palavras(conteudo, self.palavras_chave)
 
-        return palavras_encontradas
+    def normalizar(self, conteudo: str) -> str:
+        """Conteúdo com os trechos voláteis mascarados (o próprio conteúdo sem normalização)"""
+        if self.normalizador is None:
+            return conteudo
+        return self.normalizador.normalizar(conteudo)
 
     def verificar_mudancas(self, conteudo: str) -> tuple:
         """
         Verifica se houve mudanças no conteúdo
 
+        Com normalização, o hash é do conteúdo normalizado. As máscaras podem mudar entre
+        duas verificações (trecho recém-aprendido, config alterado): com o conteúdo anterior
+        em memória, as duas versões são comparadas com as máscaras atuais; sem ele (logo
+        após reiniciar), um hash anterior igual ao do conteúdo bruto também conta como
+        sem mudança (hash salvo antes de a normalização ser ativada).
+
+        O hash exato continua sendo o primeiro filtro: o SimHash só é calculado quando há
+        mudança (ou ainda não existe), e `self.similaridade` recebe a similaridade com a
+        versão anterior (None sem mudança ou sem impressão anterior).
+
         Returns:
             Tupla (mudanca_detectada: bool, hash_atual: str)
         """
-        hash_atual = self.calcular_hash(conteudo)
+        normalizado = self.normalizar(conteudo)
+        anterior = None
+        self.volateis_novos = []
+        conteudo_anterior = self.conteudo_anterior if self.normalizador else None
+        if conteudo_anterior is not None:
+            anterior = self.normalizar(conteudo_anterior)
+            self.volateis_novos = self.normalizador.observar(anterior, normalizado)
+            if self.volateis_novos:
+                anterior = self.normalizar(conteudo_anterior)
+                normalizado = self.normalizar(conteudo)
+
+        hash_atual = self.calcular_hash(normalizado)
         mudanca = False
 
         if self.hash_anterior is not None and hash_atual != self.hash_anterior:
             mudanca = True
+            if anterior is not None:
+                mudanca = anterior != normalizado
+            elif self.normalizador and self.calcular_hash(conteudo) == self.hash_anterior:
+                mudanca = False
+
+        self.similaridade = None
+        if mudanca or self.simhash_anterior is None:
+            impressao = simhash(normalizado)
+            if mudanca and self.simhash_anterior is not None:
+                self.similaridade = similaridade(self.simhash_anterior, impressao)
+            self.simhash_anterior = impressao
 
         self.hash_anterior = hash_atual
+        self.conteudo_anterior = conteudo
         return mudanca, hash_atual
+
+    def gerar_diff(self, conteudo_antigo: str, conteudo_novo: str,
+                   max_trechos: int = 20, max_caracteres: int = 200, max_palavras: int = 5000) -> str:
+        """
+        Gera um diff resumido, palavra a palavra, entre duas versões do conteúdo
+
+        O conteúdo extraído não preserva quebras de linha, então o diff é feito
+        sobre palavras e cada trecho alterado vira uma linha '- removido' / '+ adicionado'.
+        O início e o fim em comum são descartados em tempo linear; só o trecho do meio
+        vai ao SequenceMatcher (custo quadrático no pior caso). Se esse trecho passar de
+        max_palavras em um dos lados, o diff vira um resumo com o começo de cada versão.
+
+        Returns:
+            Texto com até max_trechos linhas de alterações
+        """
+        palavras_antigas = conteudo_antigo.split()
+        palavras_novas = conteudo_novo.split()
+
+        inicio, fim = aparar_comuns(palavras_antigas, palavras_novas)
+        palavras_antigas = palavras_antigas[inicio:len(palavras_antigas) - fim]
+        palavras_novas = palavras_novas[inicio:len(palavras_novas) - fim]
+
+        if max(len(palavras_antigas), len(palavras_novas)) > max_palavras:
+            linhas = []
+            if palavras_antigas:
+                linhas.append('- ' + ' '.join(palavras_antigas[:max_trechos * 10])[:max_caracteres])
+            if palavras_novas:
+                linhas.append('+ ' + ' '.join(palavras_novas[:max_trechos * 10])[:max_caracteres])
+            linhas.append(f"(trecho alterado extenso: {len(palavras_antigas)} palavra(s) removida(s), "
+                          f"{len(palavras_novas)} adicionada(s); diff detalhado omitido)")
+            return '\n'.join(linhas)
+
+        matcher = difflib.SequenceMatcher(None, palavras_antigas, palavras_novas)
+
+        linhas = []
+        for operacao, i1, i2, j1, j2 in matcher.get_opcodes():
+            if operacao == 'equal':
+                continue
+            if i2 > i1:
+                linhas.append('- ' + ' '.join(palavras_antigas[i1:i2])[:max_caracteres])
+            if j2 > j1:
+                linhas.append('+ ' + ' '.join(palavras_novas[j1:j2])[:max_caracteres])
+            if len(linhas) >= max_trechos:
+                linhas = linhas[:max_trechos]
+                linhas.append('(diff truncado)')
+                break
+
+        return '\n'.join(linhas)
+
+
+# Palavras-chave usadas em lote quando nem o alvo nem a linha de comando definem outras
+PALAVRAS_CHAVE_PADRAO = ['Resultado', 'Resultado Final', 'Resultado Preliminar',
+                         'Homologação', 'Classificados', 'Notas']
+
+
+def carregar_arquivo_alvos(caminho: str, palavras_chave: List[str]) -> List[Dict]:
+    """
+    Lê os alvos da verificação em lote
+
+    Formatos aceitos:
+        - .json: lista de {'url', 'palavras_chave', 'normalizacao'} ou um config.json
+          ('url' + 'alvos', com a seção 'normalizacao' global)
+        - texto: uma URL por linha, opcionalmente seguida de '| palavra1, palavra2';
+          linhas vazias e iniciadas por '#' são ignoradas
+        - '-': texto lido da entrada padrão
+
+    Returns:
+        Lista de {'url', 'palavras_chave', 'normalizacao'} sem URLs repetidas
+    """
+    if caminho == '-':
+        texto = sys.stdin.read()
+    else:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            texto = f.read()
+
+    normalizacao = None
+    if caminho.endswith('.json'):
+        dados = json.loads(texto)
+        if isinstance(dados, dict):
+            palavras_chave = dados.get('palavras_chave', palavras_chave)
+            normalizacao = dados.get('normalizacao')
+            principal = [{'url': dados['url']}] if dados.get('url') else []
+            dados = principal + dados.get('alvos', [])
+        entradas = [(alvo.get('url'), alvo.get('palavras_chave'), alvo.get('normalizacao')) for alvo in dados]
+    else:
+        entradas = []
+        for linha in texto.splitlines():
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+            url, _, palavras = linha.partition('|')
+            entradas.append((url.strip(), [p.strip() for p in palavras.split(',') if p.strip()] or None, None))
+
+    alvos = []
+    vistos = set()
+    for url, palavras, normalizacao_alvo in entradas:
+        if url and url not in vistos:
+            vistos.add(url)
+            alvos.append({'url': url, 'palavras_chave': palavras or palavras_chave,
+                          'normalizacao': config_do_alvo(normalizacao, normalizacao_alvo)})
+    return alvos
+
+
+def verificar_uma_vez(monitor: MonitorEdital, hash_anterior: Optional[str] = None,
+                      extrator: Optional[ExtratorProcessos] = None) -> Dict:
+    """
+    Verifica o alvo uma única vez, sem levantar exceções
+
+    Args:
+        monitor: Monitor do alvo
+        hash_anterior: Hash da execução anterior (None = "mudanca" fica null)
+        extrator: Pool de processos para o parsing; None analisa neste processo
+
+    Returns:
+        Resultado serializável em JSON: status ('ok', 'erro' ou 'adiado'), hash,
+        palavras encontradas, links de anexos, tamanho e tempos em ms (download, análise e total)
+    """
+    resultado = {'url': monitor.url, 'status': 'ok', 'hash': None, 'mudanca': None,
+                 'palavras_encontradas': [], 'anexos': [], 'bytes': None,
+                 'tempos_ms': {'download': None, 'analise': None, 'total': None},
+                 'verificado_em': datetime.now().astimezone().isoformat(timespec='seconds')}
+    inicio = time.perf_counter()
+    try:
+        html = monitor.baixar_pagina()
+        resultado['tempos_ms']['download'] = round((time.perf_counter() - inicio) * 1000, 1)
+        inicio_analise = time.perf_counter()
+        if extrator:
+            analise = extrator.analisar(html, monitor.palavras_chave, monitor.ignorar_seletores)
+        else:
+            analise = analisar_html(html, monitor.palavras_chave, monitor.ignorar_seletores)
+        resultado['tempos_ms']['analise'] = round((time.perf_counter() - inicio_analise) * 1000, 1)
+        resultado['bytes'] = len(html)
+        resultado['hash'] = monitor.calcular_hash(monitor.normalizar(analise['conteudo']))
+        resultado['palavras_encontradas'] = analise['palavras_encontradas']
+        resultado['anexos'] = [{'url': url, 'texto': texto} for url, texto in
+                               RastreadorAnexos.resolver(monitor.url, analise['anexos']).items()]
+        if hash_anterior is not None:
+            resultado['mudanca'] = resultado['hash'] != hash_anterior
+    except ErroBuscaPagina as e:
+        resultado.update({'status': 'erro', 'erro_tipo': e.tipo, 'status_http': e.status_http, 'erro': str(e)})
+    except RequisicaoAdiada as e:
+        resultado.update({'status': 'adiado', 'erro': str(e), 'retry_segundos': round(e.segundos, 1)})
+    except Exception as e:
+        # Uma página que quebra a análise não derruba o lote
+        resultado.update({'status': 'erro', 'erro_tipo': 'outro', 'erro': f"{type(e).__name__}: {e}"})
+    resultado['tempos_ms']['total'] = round((time.perf_counter() - inicio) * 1000, 1)
+    return resultado
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Verificação única em lote: todos os alvos em paralelo, uma linha NDJSON por alvo
+
+    Returns:
+        Código de saída: 0 se todos os alvos foram verificados, 1 se algum falhou ou foi adiado
+    """
+    parser = argparse.ArgumentParser(
+        prog='python3 -m src.monitor',
+        description='Verifica uma vez, em paralelo, os alvos de um arquivo e emite NDJSON')
+    parser.add_argument('alvos', help="Arquivo de alvos (.json ou uma URL por linha; '-' lê da entrada padrão)")
+    parser.add_argument('--palavras-chave', help='Palavras-chave padrão, separadas por vírgula')
+    parser.add_argument('--workers', type=int, default=16, help='Verificações simultâneas')
+    parser.add_argument('--processos', type=int,
+                        help='Processos para o parsing (padrão: um por núcleo; 0 analisa nas próprias threads)')
+    parser.add_argument('--max-por-host', type=int, default=4, help='Requisições simultâneas por host')
+    parser.add_argument('--intervalo-por-host', type=float, default=0,
+                        help='Segundos mínimos entre requisições ao mesmo host')
+    parser.add_argument('--estado', help='Arquivo JSON com o hash anterior de cada URL: '
+                                         'preenche "mudanca" e é atualizado ao final')
+    parser.add_argument('--saida', help='Grava o NDJSON neste arquivo (padrão: saída padrão)')
+    args = parser.parse_args(argv)
+
+    palavras_chave = PALAVRAS_CHAVE_PADRAO
+    if args.palavras_chave:
+        palavras_chave = [p.strip() for p in args.palavras_chave.split(',') if p.strip()]
+    alvos = carregar_arquivo_alvos(args.alvos, palavras_chave)
+
+    hashes: Dict[str, str] = {}
+    if args.estado and os.path.exists(args.estado):
+        with open(args.estado, 'r', encoding='utf-8') as f:
+            hashes = json.load(f)
+
+    # Sem intervalo mínimo por padrão: o lote é pontual, mas um host ainda não recebe
+    # mais que --max-por-host conexões de uma vez
+    cortesia = ControleCortesia({
+        'max_concorrencia_por_host': args.max_por_host,
+        'intervalo_minimo_segundos': args.intervalo_por_host,
+        'espera_maxima_segundos': 120
+    })
+
+    # O parsing segura o GIL: com vários núcleos, vai para processos separados
+    processos = args.processos
+    if processos is None:
+        processos = os.cpu_count() or 1
+        if processos == 1:
+            processos = 0
+    extrator = ExtratorProcessos(processos) if processos > 0 else None
+
+    saida = open(args.saida, 'w', encoding='utf-8') if args.saida else sys.stdout
+    lock = threading.Lock()
+    contagem = {'ok': 0, 'erro': 0, 'adiado': 0}
+    inicio = time.perf_counter()
+
+    def verificar(alvo: Dict):
+        monitor = MonitorEdital(alvo['url'], alvo['palavras_chave'], cortesia=cortesia,
+                                normalizacao=alvo['normalizacao'])
+        resultado = verificar_uma_vez(monitor, hashes.get(alvo['url']), extrator)
+        # Cada resultado sai assim que fica pronto, uma linha inteira por vez
+        with lock:
+            contagem[resultado['status']] += 1
+            if resultado['hash']:
+                hashes[alvo['url']] = resultado['hash']
+            saida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+            saida.flush()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            for futuro in [executor.submit(verificar, alvo) for alvo in alvos]:
+                futuro.result()
+    finally:
+        if extrator:
+            extrator.parar()
+        if args.saida:
+            saida.close()
+
+    if args.estado:
+        with open(args.estado, 'w', encoding='utf-8') as f:
+            json.dump(hashes, f, indent=4, ensure_ascii=False)
+
+    print(f"{len(alvos)} alvos em {time.perf_counter() - inicio:.1f} s: {contagem['ok']} ok, "
+          f"{contagem['erro']} com erro, {contagem['adiado']} adiados", file=sys.stderr)
+    return 0 if contagem['ok'] == len(alvos) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
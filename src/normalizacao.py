@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Módulo de Normalização do Conteúdo
+Mascara trechos voláteis (contadores, horários de geração, tokens) antes do hash,
+para que só mudanças reais do edital sejam detectadas
+"""
+
+import difflib
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Texto que substitui cada trecho mascarado
+MARCADOR = '[*]'
+
+# Máscaras prontas, ativadas por nome em 'predefinidas'. Datas e horários soltos não
+# entram aqui de propósito: num edital, uma data que muda costuma ser mudança real.
+# Os rótulos não exigem início de palavra: o texto extraído junta elementos vizinhos
+# sem espaço ("...conectadasAtualizado em 19/10/2026").
+MASCARAS_PREDEFINIDAS = {
+    # "Visitas: 12.345", "1234 acessos"
+    'contador': r'(?i)(?:visitas|visitantes|acessos|visualiza[çc][õo]es|views)\s*:?\s*\d[\d.,]*'
+                r'|\b\d[\d.,]*\s*(?:visitas|visitantes|acessos|visualiza[çc][õo]es|views)\b(?!\s*:)',
+    # "Atualizado em 15/03/2025 às 14:32", "Página gerada em 14:32:05"
+    'geracao': r'(?i)(?:atualizad[oa]|gerad[oa]|última atualização|ultima atualizacao)'
+               r'(?:\s*(?:em|às|as|:|-))*\s*\d{1,2}[/:.-]\d{1,2}(?:[/:.\sàsh,-]*\d+){0,5}',
+    # "csrf_token: 9f86d081884c7d65...", "nonce=YWJjZGVm...": só o valor logo após um rótulo
+    # csrf/xsrf/token/nonce, em hexadecimal ou base64. Sequências longas sem rótulo não são
+    # mascaradas: linhas de tabela extraídas sem espaço ("18Classificado3178652548Gabriela")
+    # seriam engolidas e a troca de uma inscrição passaria despercebida.
+    'token': r'(?i)(?<![a-z])(?:csrf|xsrf|token|nonce)[\w-]{0,20}?\s*[:=]\s*["\']?'
+             r'(?=[a-z0-9+/_-]*\d)[a-z0-9+/_-]{16,}={0,2}',
+    # Horários soltos (14:32, 14:32:05); desligado por padrão, o horário de uma prova é relevante
+    'horario': r'\b\d{1,2}:\d{2}(?::\d{2})?\b',
+}
+
+# Aprendizado de trechos voláteis
+PALAVRAS_CONTEXTO = 3           # máximo de palavras fixas antes e depois que ancoram o trecho
+MAX_PALAVRAS_VOLATEIS = 3       # trechos maiores nunca são aprendidos
+MAX_PALAVRAS_OBSERVADAS = 300   # trecho alterado maior: a observação é descartada sem diff
+
+
+def config_do_alvo(config_global: Optional[Dict], config_alvo: Optional[Dict]) -> Optional[Dict]:
+    """Seção 'normalizacao' efetiva de um alvo: as chaves do alvo sobrepõem as globais"""
+    if not config_global and not config_alvo:
+        return None
+    return {**(config_global or {}), **(config_alvo or {})}
+
+
+def aparar_comuns(palavras_antigas: List[str], palavras_novas: List[str]) -> Tuple[int, int]:
+    """
+    Tamanho do início e do fim em comum entre duas listas de palavras, em tempo linear
+
+    Returns:
+        Tupla (inicio, fim): o trecho alterado é [inicio:len - fim] em cada lista
+    """
+    inicio = 0
+    limite = min(len(palavras_antigas), len(palavras_novas))
+    while inicio < limite and palavras_antigas[inicio] == palavras_novas[inicio]:
+        inicio += 1
+    fim = 0
+    while fim < limite - inicio and palavras_antigas[-1 - fim] == palavras_novas[-1 - fim]:
+        fim += 1
+    return inicio, fim
+
+
+def _ancora(palavras) -> List[str]:
+    """Palavras vizinhas até a primeira com dígitos (números não servem de âncora, podem mudar)"""
+    ancora = []
+    for palavra in palavras:
+        if any(c.isdigit() for c in palavra) or palavra == MARCADOR:
+            break
+        ancora.append(palavra)
+    return ancora
+
+
+class NormalizadorConteudo:
+    """
+    Normaliza o conteúdo extraído de um alvo antes do cálculo do hash
+
+    Etapas, nesta ordem:
+        - Máscaras predefinidas e expressões regulares do config (cada trecho vira [*])
+        - Trechos voláteis aprendidos: posições (ancoradas pelas palavras vizinhas) que
+          mudaram em `limiar_aprendizado` verificações seguidas, sempre com números
+
+    Elementos ignorados por seletor CSS ('ignorar_seletores') são removidos antes, na
+    extração; aqui só chega o texto.
+
+    O aprendizado só considera trocas curtas (até MAX_PALAVRAS_VOLATEIS palavras) em que
+    todas as palavras, antes e depois, têm dígitos: contadores e carimbos de tempo. Texto
+    novo, linhas inseridas ou removidas e trocas de palavras nunca são aprendidos. Basta
+    uma verificação sem mudança na posição para a contagem recomeçar.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, aprendidos: Optional[List[Dict]] = None):
+        """
+        Args:
+            config: Seção 'normalizacao' do config.json (ou do alvo)
+                {
+                    'enabled': bool,
+                    'predefinidas': ['contador', 'geracao'],      # 'token' e 'horario' opcionais
+                    'mascaras': [str],              # expressões regulares adicionais
+                    'ignorar_seletores': [str],     # aplicados na extração
+                    'aprender_volateis': bool,
+                    'limiar_aprendizado': int       # verificações seguidas com a posição mudando
+                }
+            aprendidos: Trechos voláteis já aprendidos (persistidos pelo app)
+        """
+        config = config or {}
+        self.ignorar_seletores: List[str] = config.get('ignorar_seletores', [])
+        self.aprender_volateis = config.get('aprender_volateis', True)
+        self.limiar_aprendizado = max(1, config.get('limiar_aprendizado', 3))
+
+        padroes = []
+        for nome in config.get('predefinidas', ['contador', 'geracao']):
+            if nome not in MASCARAS_PREDEFINIDAS:
+                raise ValueError(f"Máscara predefinida desconhecida: {nome}")
+            padroes.append(MASCARAS_PREDEFINIDAS[nome])
+        padroes.extend(config.get('mascaras', []))
+        self._mascaras = [re.compile(padrao) for padrao in padroes]
+
+        self.aprendidos: List[Dict] = []
+        self._aprendidos_re: List[Tuple[re.Pattern, str]] = []
+        for trecho in aprendidos or []:
+            self._adicionar_aprendido(trecho)
+
+        # Posição ancorada -> verificações seguidas em que mudou (apenas em memória)
+        self._observacoes: Dict[Tuple[str, str], int] = {}
+
+    def normalizar(self, conteudo: str) -> str:
+        """Conteúdo com os trechos voláteis substituídos por [*]"""
+        for mascara in self._mascaras:
+            conteudo = mascara.sub(MARCADOR, conteudo)
+        for padrao, substituicao in self._aprendidos_re:
+            conteudo = padrao.sub(substituicao, conteudo)
+        return conteudo
+
+    def observar(self, anterior: str, atual: str) -> List[Dict]:
+        """
+        Registra as posições que mudaram entre duas versões normalizadas consecutivas
+
+        O início e o fim em comum são descartados em tempo linear e só o trecho do meio
+        vai ao SequenceMatcher. Se esse trecho passar de MAX_PALAVRAS_OBSERVADAS palavras
+        (texto novo, página reorganizada), nada é observado e as contagens recomeçam.
+
+        Returns:
+            Trechos aprendidos nesta observação (vazio na maioria das vezes)
+        """
+        if not self.aprender_volateis:
+            return []
+        if anterior == atual:
+            self._observacoes.clear()
+            return []
+
+        palavras_antigas = anterior.split()
+        palavras_novas = atual.split()
+        inicio, fim = aparar_comuns(palavras_antigas, palavras_novas)
+        meio_antigo = palavras_antigas[inicio:len(palavras_antigas) - fim]
+        meio_novo = palavras_novas[inicio:len(palavras_novas) - fim]
+        if max(len(meio_antigo), len(meio_novo)) > MAX_PALAVRAS_OBSERVADAS:
+            self._observacoes.clear()
+            return []
+        matcher = difflib.SequenceMatcher(None, meio_antigo, meio_novo, autojunk=False)
+
+        observadas = {}
+        for operacao, i1, i2, j1, j2 in matcher.get_opcodes():
+            if operacao != 'replace':
+                continue
+            # Posições relativas ao trecho do meio -> posições na página inteira (as âncoras
+            # podem estar no início ou no fim em comum)
+            i1, i2, j1, j2 = i1 + inicio, i2 + inicio, j1 + inicio, j2 + inicio
+            trocadas = palavras_antigas[i1:i2] + palavras_novas[j1:j2]
+            if (i2 - i1 > MAX_PALAVRAS_VOLATEIS or j2 - j1 > MAX_PALAVRAS_VOLATEIS
+                    or not all(any(c.isdigit() for c in palavra) for palavra in trocadas)):
+                continue
+            antes = ' '.join(_ancora(reversed(palavras_antigas[max(0, i1 - PALAVRAS_CONTEXTO):i1]))[::-1])
+            depois = ' '.join(_ancora(palavras_antigas[i2:i2 + PALAVRAS_CONTEXTO]))
+            # Sem âncora dos dois lados a posição não é identificável
+            if not antes or not depois:
+                continue
+            chave = (antes, depois)
+            observadas[chave] = self._observacoes.get(chave, 0) + 1
+
+        # Posições que não mudaram desta vez recomeçam a contagem
+        self._observacoes = observadas
+
+        novos = []
+        for (antes, depois), vezes in list(observadas.items()):
+            if vezes >= self.limiar_aprendizado:
+                trecho = {'antes': antes, 'depois': depois,
+                          'aprendido_em': datetime.now().astimezone().isoformat(timespec='seconds')}
+                self._adicionar_aprendido(trecho)
+                novos.append(trecho)
+                del self._observacoes[(antes, depois)]
+        return novos
+
+    def _adicionar_aprendido(self, trecho: Dict):
+        if any(t['antes'] == trecho['antes'] and t['depois'] == trecho['depois'] for t in self.aprendidos):
+            return
+        self.aprendidos.append(trecho)
+        # Até MAX_PALAVRAS_VOLATEIS palavras entre as âncoras viram [*]
+        padrao = re.compile(
+            r'(?<!\S)' + re.escape(trecho['antes']) + r'\s+\S+(?:\s+\S+){0,%d}?(?=\s+%s(?!\S))'
+            % (MAX_PALAVRAS_VOLATEIS - 1, re.escape(trecho['depois']))
+        )
+        self._aprendidos_re.append((padrao, trecho['antes'].replace('\\', '\\\\') + ' ' + MARCADOR))
+
+    @staticmethod
+    def descrever(trecho: Dict) -> str:
+        """Trecho aprendido em forma legível para o log"""
+        return f"... {trecho['antes']} {MARCADOR} {trecho['depois']} ..."
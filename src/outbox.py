@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Módulo de Outbox de Notificações
+Fila persistente (SQLite) desacoplando a detecção de mudanças da entrega dos emails
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alertas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chave TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    criado_em REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS entregas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alerta_id INTEGER NOT NULL REFERENCES alertas(id),
+    destinatario TEXT NOT NULL,
+    chave_idempotencia TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima_tentativa REAL NOT NULL,
+    reservado_ate REAL,
+    ultimo_erro TEXT,
+    enviado_em REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_entregas_fila ON entregas (status, proxima_tentativa);
+CREATE INDEX IF NOT EXISTS idx_entregas_alerta ON entregas (alerta_id, status);
+"""
+
+
+def chave_idempotencia(chave_alerta: str, destinatario: str) -> str:
+    """Chave única de uma entrega: o mesmo alerta nunca é enfileirado duas vezes para o mesmo email"""
+    return hashlib.sha256(f"{chave_alerta}|{destinatario.lower()}".encode('utf-8')).hexdigest()
+
+
+class OutboxNotificacoes:
+    """
+    Fila durável de notificações com workers de entrega em background
+
+    O monitor apenas enfileira (rápido, independente do número de inscritos).
+    Workers reservam lotes de entregas com um lease, enviam pelo notificador e
+    registram o resultado de cada destinatário. Falhas temporárias são
+    retentadas com backoff exponencial; entregas reservadas por um processo
+    que caiu voltam para a fila quando o lease expira, então um restart
+    retoma exatamente as entregas que não foram confirmadas.
+    """
+
+    def __init__(
+        self,
+        caminho_db: str,
+        notifier,
+        workers: int = 2,
+        tamanho_lote: int = 50,
+        max_tentativas: int = 8,
+        backoff_base_segundos: float = 30,
+        backoff_max_segundos: float = 3600,
+        lease_segundos: float = 300,
+        log: Optional[Callable[[str, str], None]] = None
+    ):
+        """
+        Args:
+            caminho_db: Arquivo SQLite da fila (ex: data/outbox.db)
+            notifier: Notificador com método enviar_alerta_detalhado (ex: EmailNotifier)
+            workers: Número de threads de entrega
+            tamanho_lote: Máximo de destinatários reservados por vez
+            max_tentativas: Tentativas antes de marcar a entrega como falha definitiva
+            backoff_base_segundos: Espera após a primeira falha (dobra a cada tentativa)
+            backoff_max_segundos: Teto da espera entre tentativas
+            lease_segundos: Tempo que um lote fica reservado para um worker
+            log: Função opcional log(mensagem, tipo)
+        """
+        self.caminho_db = caminho_db
+        self.notifier = notifier
+        self.workers = workers
+        self.tamanho_lote = tamanho_lote
+        self.max_tentativas = max_tentativas
+        self.backoff_base_segundos = backoff_base_segundos
+        self.backoff_max_segundos = backoff_max_segundos
+        self.lease_segundos = lease_segundos
+        self.log = log or (lambda mensagem, tipo="INFO": print(f"[{tipo}] {mensagem}", flush=True))
+
+        self._threads: List[threading.Thread] = []
+        self._parar = threading.Event()
+        self._novo_trabalho = threading.Event()
+
+        conn = self._conectar()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Abre uma conexão própria (sqlite3 não compartilha conexões entre threads)"""
+        conn = sqlite3.connect(self.caminho_db, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def enfileirar(self, chave_alerta: str, alerta: Dict, destinatarios: List[str]) -> int:
+        """
+        Registra um alerta e uma entrega por destinatário
+
+        Args:
+            chave_alerta: Identificador estável da detecção (ex: url + hashes + sequência da mudança)
+            alerta: Argumentos do alerta (url, palavras_encontradas, mudanca_conteudo, conteudo_resumo)
+            destinatarios: Emails a notificar
+
+        Returns:
+            Número de entregas novas (entregas já enfileiradas são ignoradas)
+        """
+        agora = time.time()
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR IGNORE INTO alertas (chave, payload, criado_em) VALUES (?, ?, ?)",
+                (chave_alerta, json.dumps(alerta, ensure_ascii=False), agora)
+            )
+            alerta_id = conn.execute("SELECT id FROM alertas WHERE chave = ?", (chave_alerta,)).fetchone()[0]
+
+            antes = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO entregas (alerta_id, destinatario, chave_idempotencia, proxima_tentativa) "
+                "VALUES (?, ?, ?, ?)",
+                [(alerta_id, d, chave_idempotencia(chave_alerta, d), agora) for d in destinatarios]
+            )
+            novas = conn.total_changes - antes
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self._novo_trabalho.set()
+        return novas
+
+    def iniciar(self):
+        """Inicia os workers de entrega (idempotente)"""
+        if any(t.is_alive() for t in self._threads):
+            return
+
+        self._parar.clear()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"outbox-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def parar(self, timeout: float = 10):
+        """Sinaliza os workers para encerrar após o lote atual"""
+        self._parar.set()
+        self._novo_trabalho.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contagem de entregas por status"""
+        conn = self._conectar()
+        try:
+            linhas = conn.execute("SELECT status, COUNT(*) FROM entregas GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return {status: total for status, total in linhas}
+
+    def _reservar_lote(self, conn: sqlite3.Connection):
+        """
+        Reserva entregas vencidas de um mesmo alerta
+
+        Returns:
+            Tupla (alerta_id, payload, [(entrega_id, destinatario, tentativas)]) ou None
+        """
+        agora = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            primeira = conn.execute(
+                "SELECT alerta_id FROM entregas "
+                "WHERE (status = 'pendente' AND proxima_tentativa <= ?) "
+                "   OR (status = 'enviando' AND reservado_ate < ?) "
+                "ORDER BY id LIMIT 1",
+                (agora, agora)
+            ).fetchone()
+            if primeira is None:
+                conn.execute("COMMIT")
+                return None
+
+            alerta_id = primeira[0]
+            entregas = conn.execute(
+                "SELECT id, destinatario, tentativas FROM entregas "
+                "WHERE alerta_id = ? AND ((status = 'pendente' AND proxima_tentativa <= ?) "
+                "   OR (status = 'enviando' AND reservado_ate < ?)) "
+                "ORDER BY id LIMIT ?",
+                (alerta_id, agora, agora, self.tamanho_lote)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE entregas SET status = 'enviando', reservado_ate = ? WHERE id = ?",
+                [(agora + self.lease_segundos, entrega_id) for entrega_id, _, _ in entregas]
+            )
+            payload = conn.execute("SELECT payload FROM alertas WHERE id = ?", (alerta_id,)).fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return alerta_id, json.loads(payload), entregas
+
+    def _calcular_backoff(self, tentativas: int) -> float:
+        """Backoff exponencial com jitter"""
+        espera = min(self.backoff_max_segundos, self.backoff_base_segundos * (2 ** (tentativas - 1)))
+        return random.uniform(espera / 2, espera)
+
+    def _registrar_resultados(self, conn: sqlite3.Connection, entregas, resultados: Dict[str, Dict]):
+        """Grava o resultado de cada entrega do lote"""
+        agora = time.time()
+        atualizacoes = []
+        for entrega_id, destinatario, tentativas in entregas:
+            resultado = resultados.get(destinatario, {'enviado': False, 'erro': 'Sem resultado', 'permanente': False})
+            tentativas += 1
+
+            if resultado['enviado']:
+                atualizacoes.append(('enviado', tentativas, agora, None, agora, entrega_id))
+            elif resultado.get('permanente') or tentativas >= self.max_tentativas:
+                atualizacoes.append(('falhou', tentativas, agora, resultado.get('erro'), None, entrega_id))
+            else:
+                proxima = agora + self._calcular_backoff(tentativas)
+                atualizacoes.append(('pendente', tentativas, proxima, resultado.get('erro'), None, entrega_id))
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "UPDATE entregas SET status = ?, tentativas = ?, proxima_tentativa = ?, "
+            "ultimo_erro = ?, enviado_em = ?, reservado_ate = NULL WHERE id = ?",
+            atualizacoes
+        )
+        conn.execute("COMMIT")
+
+    def _verificar_conclusao(self, conn: sqlite3.Connection, alerta_id: int):
+        """Registra no log quando todas as entregas de um alerta foram finalizadas"""
+        contagem = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM entregas WHERE alerta_id = ? GROUP BY status", (alerta_id,)
+        ).fetchall())
+
+        if contagem.get('pendente') or contagem.get('enviando'):
+            return
+
+        enviados = contagem.get('enviado', 0)
+        falhas = contagem.get('falhou', 0)
+        if falhas:
+            self.log(f"Alerta #{alerta_id}: notificação enviada para {enviados} inscrito(s), {falhas} falha(s)", "ALERTA")
+        else:
+            self.log(f"Alerta #{alerta_id}: notificação enviada para {enviados} inscrito(s)", "SUCESSO")
+
+    def _proxima_espera(self, conn: sqlite3.Connection) -> float:
+        """Segundos até a próxima entrega agendada (limitado para reavaliar leases)"""
+        proxima = conn.execute(
+            "SELECT MIN(COALESCE(reservado_ate, proxima_tentativa)) FROM entregas "
+            "WHERE status IN ('pendente', 'enviando')"
+        ).fetchone()[0]
+        if proxima is None:
+            return 60
+        return max(0.1, min(60, proxima - time.time()))
+
+    def _processar_proximo_lote(self, conn: sqlite3.Connection):
+        """Reserva, entrega e registra um lote; sem entregas vencidas, espera a próxima"""
+        lote = self._reservar_lote(conn)
+        if lote is None:
+            self._novo_trabalho.wait(self._proxima_espera(conn))
+            return
+
+        alerta_id, alerta, entregas = lote
+        destinatarios = [destinatario for _, destinatario, _ in entregas]
+        try:
+            resultados = self.notifier.enviar_alerta_detalhado(destinatarios=destinatarios, **alerta)
+        except Exception as e:
+            resultados = {d: {'enviado': False, 'erro': str(e), 'permanente': False} for d in destinatarios}
+
+        self._registrar_resultados(conn, entregas, resultados)
+        self._verificar_conclusao(conn, alerta_id)
+
+    def _worker(self):
+        """Loop de um worker de entrega"""
+        conn = self._conectar()
+        try:
+            while not self._parar.is_set():
+                # Limpa antes de reservar: um enfileiramento posterior acorda o worker
+                self._novo_trabalho.clear()
+                try:
+                    self._processar_proximo_lote(conn)
+                except Exception as e:
+                    # Nenhum erro encerra o worker: entregas reservadas voltam à fila quando o lease expira
+                    self.log(f"Outbox: erro no worker de entrega: {type(e).__name__}: {e}", "ERRO")
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    self._parar.wait(5)
+        finally:
+            conn.close()
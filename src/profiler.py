@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Módulo de Profiling de Verificações
+Perfila verificações individuais com cProfile e tracemalloc sob demanda
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import resource
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Optional
+
+# tracemalloc é global ao processo: ligado pelo primeiro usuário e desligado pelo último
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_usuarios = 0
+_tracemalloc_externo = False
+
+
+def _iniciar_tracemalloc():
+    global _tracemalloc_usuarios, _tracemalloc_externo
+    with _tracemalloc_lock:
+        if _tracemalloc_usuarios == 0:
+            # Não interfere se o tracemalloc já estiver ativo por outro motivo
+            _tracemalloc_externo = tracemalloc.is_tracing()
+            if not _tracemalloc_externo:
+                tracemalloc.start(25)
+                tracemalloc.reset_peak()
+        _tracemalloc_usuarios += 1
+
+
+def _encerrar_tracemalloc(medir: bool = True):
+    """Snapshot, memória atual e pico (None sem medir); desliga o rastreamento se for o último usuário"""
+    global _tracemalloc_usuarios
+    with _tracemalloc_lock:
+        try:
+            if not medir:
+                return None
+            snapshot = tracemalloc.take_snapshot()
+            atual, pico = tracemalloc.get_traced_memory()
+            return snapshot, atual, pico
+        finally:
+            _tracemalloc_usuarios -= 1
+            if _tracemalloc_usuarios == 0 and not _tracemalloc_externo:
+                tracemalloc.stop()
+
+
+class PerfilVerificacao:
+    """
+    Context manager que executa um bloco sob cProfile e tracemalloc
+
+    Ao sair, grava em `diretorio`:
+        <nome_base>.prof - estatísticas cProfile (abrir com pstats/snakeviz)
+        <nome_base>.txt  - resumo legível com funções mais custosas e top de alocações
+
+    Um perfil por vez (quem chama garante; o app reserva o perfil sob uma trava): a partir do Python
+    3.12 o cProfile usa sys.monitoring, global ao processo, e um segundo enable()
+    simultâneo falha. O tracemalloc também é global: memória e pico incluem as outras
+    verificações em andamento. Falhas ao ligar ou gravar o perfil ficam em `erro` e são
+    apenas registradas: nunca viram erro da verificação.
+    """
+
+    def __init__(self, diretorio: str, check_num: int, top_n: int = 30):
+        """
+        Args:
+            diretorio: Diretório onde os perfis serão salvos
+            check_num: Número da verificação perfilada
+            top_n: Quantidade de linhas nos rankings de funções e alocações
+        """
+        self.diretorio = diretorio
+        self.check_num = check_num
+        self.top_n = top_n
+        self.nome_base = f"check_{check_num}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self._profiler = cProfile.Profile()
+        self._ativo = False
+        self.erro: Optional[str] = None
+
+    def __enter__(self):
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            _iniciar_tracemalloc()
+        except Exception as e:
+            self.erro = f"{type(e).__name__}: {e}"
+            return self
+        try:
+            self._profiler.enable()
+        except Exception as e:
+            # Outro profiler ativo (sys.monitoring no 3.12+): a verificação segue sem perfil
+            _encerrar_tracemalloc(medir=False)
+            self.erro = f"{type(e).__name__}: {e}"
+            return self
+        self._ativo = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self._ativo:
+            return False
+        self._ativo = False
+        try:
+            try:
+                self._profiler.disable()
+            finally:
+                snapshot, atual, pico = _encerrar_tracemalloc()
+            self._gravar(snapshot, atual, pico, exc_type, exc)
+        except Exception as e:
+            self.erro = f"{type(e).__name__}: {e}"
+            print(f"Erro ao gravar perfil da verificação #{self.check_num}: {self.erro}", flush=True)
+
+        # Não suprime exceções da verificação
+        return False
+
+    def _gravar(self, snapshot, atual: int, pico: int, exc_type, exc):
+        caminho_prof = os.path.join(self.diretorio, f"{self.nome_base}.prof")
+        caminho_txt = os.path.join(self.diretorio, f"{self.nome_base}.txt")
+
+        self._profiler.dump_stats(caminho_prof)
+
+        saida = io.StringIO()
+        saida.write(f"Perfil da verificação #{self.check_num}\n")
+        if exc_type is not None:
+            saida.write(f"Verificação terminou com erro: {exc_type.__name__}: {exc}\n")
+        saida.write(f"Memória alocada ao final: {atual / 1024:.1f} KiB\n")
+        saida.write(f"Pico de memória alocada: {pico / 1024:.1f} KiB\n")
+        saida.write("\n" + "=" * 80 + "\nFUNÇÕES (ordenadas por tempo cumulativo)\n" + "=" * 80 + "\n")
+
+        stats = pstats.Stats(self._profiler, stream=saida)
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+
+        saida.write("=" * 80 + "\nTOP ALOCAÇÕES (por linha)\n" + "=" * 80 + "\n")
+        filtros = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        ]
+        for stat in snapshot.filter_traces(filtros).statistics('lineno')[:self.top_n]:
+            saida.write(f"{stat}\n")
+
+        with open(caminho_txt, 'w', encoding='utf-8') as f:
+            f.write(saida.getvalue())
+
+
+def _ler_status_memoria() -> Dict[str, int]:
+    """VmRSS e VmHWM (bytes) de /proc/self/status; vazio fora do Linux"""
+    valores = {}
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for linha in f:
+                if linha.startswith(('VmRSS:', 'VmHWM:')):
+                    nome, valor = linha.split(':', 1)
+                    valores[nome] = int(valor.split()[0]) * 1024
+    except OSError:
+        pass
+    return valores
+
+
+class MedidorPicoRSS:
+    """
+    Pico de RSS do processo durante cada verificação
+
+    No Linux lê o VmHWM de /proc/self/status, zerado (via /proc/self/clear_refs) no
+    início da medição. O pico é do processo inteiro: com verificações simultâneas, o
+    contador só é zerado quando nenhuma outra medição está em andamento, então o valor
+    de cada uma cobre pelo menos o período dela. Sem /proc, usa ru_maxrss (pico desde
+    o início do processo).
+
+    Uso:
+        with medidor.medir() as medicao:
+            ...
+        medicao['pico_rss_mib']
+    """
+
+    def __init__(self):
+        self._ativas = 0
+        self._pode_zerar = True
+        self._lock = threading.Lock()
+
+    def _zerar_pico(self):
+        if not self._pode_zerar:
+            return
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+        except OSError:
+            self._pode_zerar = False
+
+    @staticmethod
+    def _pico_bytes() -> Optional[int]:
+        pico = _ler_status_memoria().get('VmHWM')
+        if pico is None:
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            pico = maxrss if sys.platform == 'darwin' else maxrss * 1024
+        return pico
+
+    def medir(self):
+        return _MedicaoRSS(self)
+
+
+class _MedicaoRSS(dict):
+    """Context manager de MedidorPicoRSS; ao sair contém 'pico_rss_mib' e 'rss_final_mib'"""
+
+    def __init__(self, medidor: MedidorPicoRSS):
+        super().__init__()
+        self._medidor = medidor
+
+    def __enter__(self):
+        with self._medidor._lock:
+            if self._medidor._ativas == 0:
+                self._medidor._zerar_pico()
+            self._medidor._ativas += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._medidor._lock:
+            self._medidor._ativas -= 1
+            pico = self._medidor._pico_bytes()
+        final = _ler_status_memoria().get('VmRSS')
+        self['pico_rss_mib'] = round(pico / (1024 * 1024), 1) if pico else None
+        self['rss_final_mib'] = round(final / (1024 * 1024), 1) if final else None
+        return False
+
+
+def listar_perfis(diretorio: str) -> List[Dict]:
+    """Lista os arquivos de perfil salvos, mais recentes primeiro"""
+    if not os.path.isdir(diretorio):
+        return []
+
+    arquivos = []
+    for nome in os.listdir(diretorio):
+        if not nome.endswith(('.prof', '.txt')):
+            continue
+        caminho = os.path.join(diretorio, nome)
+        arquivos.append({
+            'arquivo': nome,
+            'tamanho_bytes': os.path.getsize(caminho),
+            'modificado_em': datetime.fromtimestamp(os.path.getmtime(caminho)).strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+    arquivos.sort(key=lambda a: a['modificado_em'], reverse=True)
+    return arquivos
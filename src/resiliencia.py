@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Módulo de Resiliência
+Backoff exponencial com jitter por classe de erro e circuit breaker por host
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Espera base (segundos) da primeira retentativa por classe de erro
+BACKOFF_BASE_POR_ERRO = {
+    'timeout': 30,
+    'conexao': 60,
+    'http_5xx': 60,
+    'http_429': 300,   # servidor pediu para desacelerar
+    'http_4xx': 600,   # erro de cliente raramente se resolve sozinho
+    'tamanho_excedido': 600,  # página acima de memoria_limitada.max_bytes
+    'outro': 60,
+}
+
+
+def ler_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Converte o header Retry-After (segundos ou data HTTP) em segundos"""
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        momento = parsedate_to_datetime(valor)
+        return max(0.0, (momento - datetime.now(momento.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def classificar_erro(erro: Exception) -> str:
+    """
+    Classifica uma falha de verificação
+
+    Usa os atributos de ErroBuscaPagina (tipo/status_http) quando disponíveis.
+    """
+    tipo = getattr(erro, 'tipo', None)
+    if tipo in BACKOFF_BASE_POR_ERRO:
+        return tipo
+    return 'outro'
+
+
+def calcular_backoff(tentativa: int, tipo_erro: str, maximo_segundos: float = 3600,
+                     minimo_segundos: float = 5, retry_after: Optional[float] = None) -> float:
+    """
+    Backoff exponencial com "full jitter": uniforme entre o mínimo e base * 2^(tentativa-1)
+
+    O jitter espalha as retentativas de vários alvos que falharam juntos, evitando
+    que todos voltem ao mesmo servidor no mesmo segundo.
+
+    Args:
+        tentativa: Número de falhas consecutivas (1 = primeira falha)
+        tipo_erro: Classe retornada por classificar_erro
+        maximo_segundos: Teto da espera
+        minimo_segundos: Piso da espera
+        retry_after: Espera pedida pelo servidor (Retry-After), respeitada como mínimo
+
+    Returns:
+        Segundos até a próxima tentativa
+    """
+    base = BACKOFF_BASE_POR_ERRO.get(tipo_erro, BACKOFF_BASE_POR_ERRO['outro'])
+    teto = min(maximo_segundos, base * (2 ** max(0, tentativa - 1)))
+    espera = random.uniform(minimo_segundos, max(minimo_segundos, teto))
+    if retry_after:
+        espera = max(espera, min(retry_after, maximo_segundos))
+    return espera
+
+
+class DisjuntorHost:
+    """
+    Circuit breaker de um host
+
+    Estados:
+        'fechado'    - requisições normais
+        'aberto'     - após `limiar_falhas` falhas seguidas; nenhuma requisição até o fim da pausa
+        'semiaberto' - pausa encerrada; uma única requisição de sonda é liberada.
+                       Sucesso fecha o circuito; falha reabre com pausa dobrada.
+    """
+
+    def __init__(self, host: str, limiar_falhas: int = 5, pausa_segundos: float = 300,
+                 pausa_max_segundos: float = 3600):
+        self.host = host
+        self.limiar_falhas = limiar_falhas
+        self.pausa_inicial = pausa_segundos
+        self.pausa_max = pausa_max_segundos
+
+        self.estado = 'fechado'
+        self.falhas_consecutivas = 0
+        self.pausa_atual = pausa_segundos
+        self.aberto_ate: Optional[float] = None
+        self.ultimo_erro: Optional[str] = None
+        self._sonda_em_andamento = False
+        self._lock = threading.Lock()
+
+    def permitir(self) -> bool:
+        """Indica se uma requisição ao host pode ser feita agora"""
+        with self._lock:
+            if self.estado == 'fechado':
+                return True
+            if self.estado == 'aberto' and time.time() >= self.aberto_ate:
+                self.estado = 'semiaberto'
+            if self.estado == 'semiaberto' and not self._sonda_em_andamento:
+                self._sonda_em_andamento = True
+                return True
+            return False
+
+    def segundos_ate_sonda(self) -> float:
+        """Tempo até o circuito liberar a próxima sonda (0 se fechado)"""
+        if self.estado != 'aberto' or self.aberto_ate is None:
+            return 0
+        return max(0.0, self.aberto_ate - time.time())
+
+    def liberar_sonda(self):
+        """
+        Devolve a sonda liberada por permitir() sem registrar sucesso nem falha
+
+        Para requisições que não chegaram a ser feitas (ex: adiadas pelos limites de
+        cortesia): sem isso a sonda ficaria presa e o circuito nunca mais seria testado.
+        """
+        with self._lock:
+            self._sonda_em_andamento = False
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self.estado = 'fechado'
+            self.falhas_consecutivas = 0
+            self.pausa_atual = self.pausa_inicial
+            self.aberto_ate = None
+            self.ultimo_erro = None
+            self._sonda_em_andamento = False
+
+    def registrar_falha(self, erro: str = ''):
+        with self._lock:
+            self.falhas_consecutivas += 1
+            self.ultimo_erro = erro[:200] if erro else None
+
+            if self.estado == 'semiaberto':
+                # Sonda falhou: reabre com pausa maior
+                self.pausa_atual = min(self.pausa_max, self.pausa_atual * 2)
+                self._abrir()
+            elif self.estado == 'fechado' and self.falhas_consecutivas >= self.limiar_falhas:
+                self._abrir()
+
+    def _abrir(self):
+        # Jitter na pausa para que hosts que caíram juntos não sejam sondados juntos
+        self.estado = 'aberto'
+        self.aberto_ate = time.time() + random.uniform(0.8, 1.2) * self.pausa_atual
+        self._sonda_em_andamento = False
+
+    def resumo(self) -> Dict:
+        """Estado atual para o dashboard"""
+        return {
+            'host': self.host,
+            'estado': self.estado,
+            'falhas_consecutivas': self.falhas_consecutivas,
+            'aberto_ate': self.aberto_ate if self.estado == 'aberto' else None,
+            'ultimo_erro': self.ultimo_erro
+        }
+
+
+class RegistroDisjuntores:
+    """Mantém um DisjuntorHost por host, compartilhado por todos os alvos do mesmo host"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Args:
+            config: Seção 'resiliencia' do config.json
+                {
+                    'limiar_falhas': int,
+                    'pausa_circuito_segundos': float,
+                    'pausa_circuito_max_segundos': float,
+                    'backoff_max_segundos': float
+                }
+        """
+        config = config or {}
+        self.limiar_falhas = config.get('limiar_falhas', 5)
+        self.pausa_segundos = config.get('pausa_circuito_segundos', 300)
+        self.pausa_max_segundos = config.get('pausa_circuito_max_segundos', 3600)
+        self.backoff_max_segundos = config.get('backoff_max_segundos', 3600)
+        self._disjuntores: Dict[str, DisjuntorHost] = {}
+        self._lock = threading.Lock()
+
+    def para_url(self, url: str) -> DisjuntorHost:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._disjuntores:
+                self._disjuntores[host] = DisjuntorHost(
+                    host, self.limiar_falhas, self.pausa_segundos, self.pausa_max_segundos
+                )
+            return self._disjuntores[host]
+
+    def resumo(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {host: d.resumo() for host, d in self._disjuntores.items()}
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Módulo de Similaridade do Conteúdo
+Impressão digital SimHash do conteúdo de cada alvo, para medir o tamanho de uma mudança
+"""
+
+import hashlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+BITS_SIMHASH = 128
+PALAVRAS_SHINGLE = 3        # cada shingle é uma sequência de 3 palavras
+LIMIAR_SIMILARIDADE = 0.99  # calibrado no corpus de editais (scripts/verificar_deteccao.py)
+
+
+def simhash(conteudo: str, palavras_shingle: int = PALAVRAS_SHINGLE) -> str:
+    """
+    SimHash de 128 bits do conteúdo, sobre shingles de palavras (em hexadecimal)
+
+    Cada shingle recebe um hash de 128 bits (BLAKE2b, estável entre processos e
+    execuções); cada bit da impressão é o voto, ponderado pela repetição do shingle,
+    dos bits na mesma posição. Conteúdos parecidos têm impressões com poucos bits diferentes.
+    """
+    palavras = conteudo.lower().split()
+    if len(palavras) < palavras_shingle:
+        shingles = Counter([' '.join(palavras)])
+    else:
+        shingles = Counter(' '.join(palavras[i:i + palavras_shingle])
+                           for i in range(len(palavras) - palavras_shingle + 1))
+
+    # Votos contados por byte: um Counter por posição de byte e depois 8 bits por valor,
+    # em vez de percorrer os 128 bits de cada shingle
+    bytes_hash = BITS_SIMHASH // 8
+    por_byte = [Counter() for _ in range(bytes_hash)]
+    for shingle, peso in shingles.items():
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=bytes_hash).digest()
+        for posicao, valor in enumerate(digest):
+            por_byte[posicao][valor] += peso
+
+    total = sum(shingles.values())
+    impressao = 0
+    for posicao, contagem in enumerate(por_byte):
+        for bit in range(8):
+            ligados = sum(peso for valor, peso in contagem.items() if valor >> bit & 1)
+            if 2 * ligados > total:
+                impressao |= 1 << (posicao * 8 + bit)
+    return f"{impressao:0{BITS_SIMHASH // 4}x}"
+
+
+def similaridade(impressao_a: str, impressao_b: str) -> float:
+    """Fração de bits iguais entre duas impressões (1.0 = conteúdo equivalente)"""
+    diferentes = bin(int(impressao_a, 16) ^ int(impressao_b, 16)).count('1')
+    return 1 - diferentes / BITS_SIMHASH
+
+
+def mudanca_trivial(valor_similaridade: Optional[float], config: Optional[Dict],
+                    palavras_novas: Optional[List[str]] = None) -> bool:
+    """
+    Indica se a mudança é pequena demais para o alerta imediato
+
+    Em uma página de resultado com milhares de palavras, dezenas de linhas novas ainda
+    ficam perto de 0.95 (documentos sem relação ficam em torno de 0.5); por isso o padrão
+    só considera triviais as edições acima de 0.99. Uma palavra-chave que passou a aparecer
+    nunca é trivial, qualquer que seja a similaridade.
+
+    Args:
+        valor_similaridade: Similaridade com a versão anterior (None = desconhecida)
+        config: Seção 'significancia' do config.json (ou do alvo)
+            {
+                'enabled': bool,
+                'limiar_similaridade': float    # a partir deste valor a mudança é trivial
+            }
+        palavras_novas: Palavras-chave encontradas agora e ausentes na verificação anterior
+    """
+    if not config or not config.get('enabled', False) or valor_similaridade is None or palavras_novas:
+        return False
+    return valor_similaridade >= config.get('limiar_similaridade', LIMIAR_SIMILARIDADE)
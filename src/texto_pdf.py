@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Módulo de Texto dos Anexos PDF
+Baixa anexos novos ou alterados, extrai o texto em processos separados e guarda o
+resultado em cache pelo hash do conteúdo
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+import requests
+
+from src.cortesia import ControleCortesia, RequisicaoAdiada
+from src.extracao import encontrar_palavras
+
+# Dependência opcional (requirements.txt): sem ela o texto dos PDFs não é analisado
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+PYPDF_DISPONIVEL = PdfReader is not None
+
+
+def _extrair_texto(dados: bytes, max_paginas: int) -> str:
+    """Executada no processo worker: texto de cada página, separado por quebras de linha"""
+    leitor = PdfReader(io.BytesIO(dados))
+    paginas = []
+    for pagina in leitor.pages[:max_paginas]:
+        paginas.append(pagina.extract_text() or '')
+    return '\n'.join(paginas)
+
+
+class ExtratorTextoPdf:
+    """
+    Texto e palavras-chave dos anexos PDF
+
+    Cada anexo é baixado uma vez (dentro dos limites de cortesia do host) e identificado
+    pelo SHA-256 do conteúdo. O texto extraído fica em `diretorio_cache/<sha256>.txt`:
+    o mesmo arquivo, ainda que republicado em outra URL, nunca é processado de novo, e
+    as palavras-chave são sempre buscadas no texto em cache (mudar as palavras não exige
+    reprocessar). A extração (pypdf, CPU) roda em um pool de processos, vários anexos
+    em paralelo, sem segurar o GIL do servidor web.
+    """
+
+    def __init__(self, diretorio_cache: str, config: Optional[Dict] = None,
+                 cortesia: Optional[ControleCortesia] = None, headers: Optional[Dict] = None):
+        """
+        Args:
+            diretorio_cache: Diretório do cache de texto (ex: data/texto_pdf)
+            config: Subseção 'texto_pdf' da seção 'anexos' do config.json
+                {
+                    'enabled': bool,            # padrão False
+                    'workers': int,             # processos de extração
+                    'max_bytes': int,           # anexos maiores não são baixados
+                    'max_por_verificacao': int, # downloads por verificação de um alvo
+                    'max_paginas': int,
+                    'max_entradas_cache': int
+                }
+            cortesia: Limites por host (os downloads contam como requisições ao host)
+            headers: Headers HTTP das requisições (User-Agent do monitor)
+        """
+        config = config or {}
+        self.diretorio_cache = diretorio_cache
+        self.workers = config.get('workers', 2)
+        self.max_bytes = config.get('max_bytes', 20 * 1024 * 1024)
+        self.max_por_verificacao = config.get('max_por_verificacao', 10)
+        self.max_paginas = config.get('max_paginas', 500)
+        self.max_entradas_cache = config.get('max_entradas_cache', 500)
+        self.cortesia = cortesia
+        self.headers = headers or {}
+        os.makedirs(diretorio_cache, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 'spawn': o processo principal tem várias threads, e fork com threads ativas não é seguro
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+
+    def _caminho(self, sha256: str) -> str:
+        return os.path.join(self.diretorio_cache, f"{sha256}.txt")
+
+    def _baixar(self, url: str) -> bytes:
+        """
+        Baixa o anexo, abortando acima de max_bytes
+
+        Raises:
+            ValueError: anexo maior que max_bytes
+            requests.RequestException, RequisicaoAdiada: falha ou host sem vaga
+        """
+        with self.cortesia.requisicao(url) if self.cortesia else nullcontext():
+            with requests.get(url, headers=self.headers, timeout=60, stream=True) as resposta:
+                resposta.raise_for_status()
+                partes = []
+                lidos = 0
+                for pedaco in resposta.iter_content(chunk_size=64 * 1024):
+                    lidos += len(pedaco)
+                    if lidos > self.max_bytes:
+                        raise ValueError(f"anexo maior que {self.max_bytes / (1024 * 1024):g} MiB")
+                    partes.append(pedaco)
+        return b''.join(partes)
+
+    def _salvar_cache(self, sha256: str, texto: str):
+        temporario = self._caminho(sha256) + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        os.replace(temporario, self._caminho(sha256))
+
+        # Descarta as entradas usadas há mais tempo
+        with self._lock:
+            entradas = [os.path.join(self.diretorio_cache, nome) for nome in os.listdir(self.diretorio_cache)
+                        if nome.endswith('.txt')]
+            if len(entradas) > self.max_entradas_cache:
+                entradas.sort(key=os.path.getmtime)
+                for caminho in entradas[:len(entradas) - self.max_entradas_cache]:
+                    os.remove(caminho)
+
+    def _ler_cache(self, sha256: str) -> Optional[str]:
+        caminho = self._caminho(sha256)
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, 'r', encoding='utf-8') as f:
+            texto = f.read()
+        os.utime(caminho)
+        return texto
+
+    def processar(self, urls: List[str], palavras_chave: List[str]) -> Dict[str, Dict]:
+        """
+        Baixa, extrai (ou lê do cache) e busca as palavras-chave em cada anexo
+
+        Args:
+            urls: Anexos novos ou alterados (só os primeiros max_por_verificacao são baixados)
+            palavras_chave: Palavras-chave já em minúsculas
+
+        Returns:
+            url -> {'sha256', 'palavras_encontradas', 'em_cache'} ou {'erro'} (com 'sha256'
+            se o download funcionou)
+        """
+        resultados: Dict[str, Dict] = {}
+        pendentes = []
+
+        # Downloads nesta thread; cada extração vai para o pool assim que o arquivo chega
+        for url in urls[:self.max_por_verificacao]:
+            try:
+                dados = self._baixar(url)
+            except (requests.RequestException, RequisicaoAdiada, ValueError) as e:
+                resultados[url] = {'erro': f"download: {e}"}
+                continue
+            sha256 = hashlib.sha256(dados).hexdigest()
+            texto = self._ler_cache(sha256)
+            if texto is not None:
+                resultados[url] = {'sha256': sha256, 'em_cache': True,
+                                   'palavras_encontradas': encontrar_palavras(texto, palavras_chave)}
+            else:
+                pendentes.append((url, sha256, self._executor.submit(_extrair_texto, dados, self.max_paginas)))
+
+        for url, sha256, futuro in pendentes:
+            try:
+                texto = futuro.result()
+            except Exception as e:
+                # PDF corrompido ou protegido
+                resultados[url] = {'sha256': sha256, 'erro': f"extração: {type(e).__name__}: {e}"}
+                continue
+            self._salvar_cache(sha256, texto)
+            resultados[url] = {'sha256': sha256, 'em_cache': False,
+                               'palavras_encontradas': encontrar_palavras(texto, palavras_chave)}
+        return resultados
+
+    def parar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Módulo de Notificação por Webhook
+Envia eventos de mudança para sistemas internos (bots de chat, filas) via HTTP
+"""
+
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.resiliencia import ler_retry_after
+
+# Status HTTP que valem nova tentativa
+STATUS_RETENTAVEIS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def assinar_payload(segredo: str, timestamp: str, corpo: bytes) -> str:
+    """
+    Assinatura HMAC-SHA256 de um payload
+
+    O receptor recalcula HMAC(segredo, "<timestamp>." + corpo) e compara com o header
+    X-Monitor-Assinatura; o timestamp assinado impede replay de requisições antigas.
+    """
+    mensagem = timestamp.encode('ascii') + b'.' + corpo
+    return 'sha256=' + hmac.new(segredo.encode('utf-8'), mensagem, hashlib.sha256).hexdigest()
+
+
+class _Endpoint:
+    """Estado de um endpoint: configuração, limite de concorrência e buffer de lote"""
+
+    def __init__(self, config: Dict):
+        self.url = config['url']
+        self.segredo = config.get('segredo', '')
+        self.headers = config.get('headers', {})
+        self.max_concorrencia = max(1, config.get('max_concorrencia', 4))
+        self.modo_lote = config.get('modo_lote', False)
+        self.tamanho_lote = max(1, config.get('tamanho_lote', 20))
+        self.intervalo_lote_segundos = config.get('intervalo_lote_segundos', 5)
+
+        self.semaforo = threading.BoundedSemaphore(self.max_concorrencia)
+        self.buffer: List[Dict] = []
+        self.buffer_desde: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class WebhookNotifier:
+    """Classe para envio de notificações por webhook"""
+
+    def __init__(self, webhook_config: dict, log: Optional[Callable[[str, str], None]] = None):
+        """
+        Inicializa o notificador de webhooks
+
+        Args:
+            webhook_config: Dicionário com configurações
+                {
+                    'enabled': bool,
+                    'timeout': int,                  # segundos por requisição
+                    'max_tentativas': int,
+                    'backoff_base_segundos': float,
+                    'backoff_max_segundos': float,
+                    'workers': int,                  # requisições simultâneas no total
+                    'endpoints': [
+                        {
+                            'url': str,
+                            'segredo': str,          # chave HMAC (opcional)
+                            'headers': dict,         # headers extras (opcional)
+                            'max_concorrencia': int, # requisições simultâneas neste endpoint
+                            'modo_lote': bool,       # envia vários eventos por requisição
+                            'tamanho_lote': int,
+                            'intervalo_lote_segundos': float
+                        }
+                    ]
+                }
+            log: Função opcional log(mensagem, tipo)
+        """
+        self.enabled = webhook_config.get('enabled', False)
+        self.timeout = webhook_config.get('timeout', 10)
+        self.max_tentativas = max(1, webhook_config.get('max_tentativas', 5))
+        self.backoff_base_segundos = webhook_config.get('backoff_base_segundos', 1)
+        self.backoff_max_segundos = webhook_config.get('backoff_max_segundos', 60)
+        self.endpoints = [_Endpoint(e) for e in webhook_config.get('endpoints', []) if e.get('url')]
+        self.log = log or (lambda mensagem, tipo="INFO": print(f"[{tipo}] {mensagem}", flush=True))
+
+        workers = webhook_config.get('workers', sum(e.max_concorrencia for e in self.endpoints) or 1)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='webhook')
+        self._futuros: Set[Future] = set()
+        self._futuros_lock = threading.Lock()
+
+        # Conexões keep-alive reutilizadas; o pool comporta a concorrência de cada host
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=max(1, len(self.endpoints)), pool_maxsize=workers)
+        self.session.mount('http://', adaptador)
+        self.session.mount('https://', adaptador)
+
+        self._parar = threading.Event()
+        self._thread_lotes: Optional[threading.Thread] = None
+        if any(e.modo_lote for e in self.endpoints):
+            self._thread_lotes = threading.Thread(target=self._loop_lotes, name='webhook-lotes', daemon=True)
+            self._thread_lotes.start()
+
+    def notificar(self, evento: Dict):
+        """
+        Entrega um evento a todos os endpoints sem bloquear quem chama
+
+        Em endpoints com modo_lote, o evento vai para o buffer e é enviado junto
+        com outros quando o lote enche ou o intervalo do lote expira.
+        """
+        if not self.enabled:
+            return
+
+        for endpoint in self.endpoints:
+            if not endpoint.modo_lote:
+                self._submeter(endpoint, evento)
+                continue
+
+            with endpoint.lock:
+                endpoint.buffer.append(evento)
+                if endpoint.buffer_desde is None:
+                    endpoint.buffer_desde = time.monotonic()
+                cheio = len(endpoint.buffer) >= endpoint.tamanho_lote
+            if cheio:
+                self._despachar_lote(endpoint)
+
+    def _despachar_lote(self, endpoint: _Endpoint):
+        """Retira até tamanho_lote eventos do buffer e agenda a entrega"""
+        with endpoint.lock:
+            lote = endpoint.buffer[:endpoint.tamanho_lote]
+            endpoint.buffer = endpoint.buffer[endpoint.tamanho_lote:]
+            endpoint.buffer_desde = time.monotonic() if endpoint.buffer else None
+        if lote:
+            self._submeter(endpoint, {'eventos': lote})
+
+    def _submeter(self, endpoint: _Endpoint, payload: Dict):
+        """Agenda a entrega, acompanhando-a até terminar (parar() espera as pendentes)"""
+        futuro = self._executor.submit(self._entregar, endpoint, payload)
+        with self._futuros_lock:
+            self._futuros.add(futuro)
+        futuro.add_done_callback(self._descartar_futuro)
+
+    def _descartar_futuro(self, futuro: Future):
+        with self._futuros_lock:
+            self._futuros.discard(futuro)
+
+    def _loop_lotes(self):
+        """Envia lotes parciais cujo intervalo expirou"""
+        while not self._parar.wait(0.5):
+            agora = time.monotonic()
+            for endpoint in self.endpoints:
+                if (endpoint.modo_lote and endpoint.buffer_desde is not None
+                        and agora - endpoint.buffer_desde >= endpoint.intervalo_lote_segundos):
+                    self._despachar_lote(endpoint)
+
+    def _calcular_espera(self, tentativa: int, resposta: Optional[requests.Response]) -> float:
+        """Backoff exponencial com jitter, respeitando Retry-After quando informado"""
+        if resposta is not None:
+            retry_after = ler_retry_after(resposta.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(self.backoff_max_segundos, retry_after)
+        espera = min(self.backoff_max_segundos, self.backoff_base_segundos * (2 ** (tentativa - 1)))
+        return random.uniform(0, espera)
+
+    def _entregar(self, endpoint: _Endpoint, payload: Dict) -> bool:
+        """
+        Envia um payload (evento ou lote) para o endpoint com retentativas
+
+        Returns:
+            True se o endpoint respondeu 2xx
+        """
+        corpo = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        eventos = payload.get('eventos', [payload])
+
+        tentativas = 0
+        for tentativa in range(1, self.max_tentativas + 1):
+            if self._parar.is_set() and tentativa > 1:
+                break
+            tentativas = tentativa
+
+            timestamp = str(int(time.time()))
+            headers = {
+                'Content-Type': 'application/json',
+                'User-Agent': 'MonitorEditais-Webhook/1.0',
+                'X-Monitor-Timestamp': timestamp,
+                'X-Monitor-Eventos': ','.join(str(e.get('id', '')) for e in eventos),
+                **endpoint.headers
+            }
+            if endpoint.segredo:
+                headers['X-Monitor-Assinatura'] = assinar_payload(endpoint.segredo, timestamp, corpo)
+
+            resposta = None
+            try:
+                with endpoint.semaforo:
+                    resposta = self.session.post(endpoint.url, data=corpo, headers=headers, timeout=self.timeout)
+                if 200 <= resposta.status_code < 300:
+                    return True
+                if resposta.status_code not in STATUS_RETENTAVEIS:
+                    self.log(f"Webhook {endpoint.url} recusou o evento (HTTP {resposta.status_code})", "ERRO")
+                    return False
+                erro = f"HTTP {resposta.status_code}"
+            except requests.exceptions.RequestException as e:
+                erro = str(e)
+
+            if tentativa < self.max_tentativas:
+                self._parar.wait(self._calcular_espera(tentativa, resposta))
+
+        interrompido = ' (retentativas interrompidas pelo encerramento)' if tentativas < self.max_tentativas else ''
+        self.log(f"Webhook {endpoint.url} falhou após {tentativas} tentativa(s){interrompido}: {erro}", "ERRO")
+        return False
+
+    def parar(self, timeout: float = 10):
+        """
+        Envia lotes pendentes e encerra o notificador
+
+        Cada entrega pendente ainda faz a tentativa em andamento (ou a primeira), mas não
+        espera o backoff das seguintes; parar() retorna em até `timeout` segundos.
+        """
+        for endpoint in self.endpoints:
+            while endpoint.buffer:
+                self._despachar_lote(endpoint)
+        self._parar.set()
+        with self._futuros_lock:
+            pendentes = set(self._futuros)
+        wait(pendentes, timeout=timeout)
+        self._executor.shutdown(wait=False)
+        if self._thread_lotes:
+            self._thread_lotes.join(timeout)
+        self.session.close()
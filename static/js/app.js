@@ -169,6 +169,7 @@ async function subscribeEmail(event) {
 
     const emailInput = document.getElementById('subscribeEmailInput');
     const email = emailInput.value.trim();
+    const frequencia = document.getElementById('subscribeFrequencyInput').value;
 
     if (!email) {
         showNotification('Por favor, digite um email', 'error');
@@ -179,7 +180,7 @@ async function subscribeEmail(event) {
         const response = await fetch('/api/subscribers', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ email })
+            body: JSON.stringify({ email, frequencia })
         });
 
         const data = await response.json();
@@ -228,11 +229,41 @@ async function updateStatus() {
             document.getElementById('nextCheckTime').textContent = status.next_check;
         }
 
+        updateSiteHealth(status.resiliencia);
+
     } catch (error) {
         console.error('Erro ao atualizar status:', error);
     }
 }
 
+// Update site health card (backoff and circuit breaker)
+function updateSiteHealth(resiliencia) {
+    const card = document.getElementById('siteHealthCard');
+    const value = document.getElementById('siteHealthStatus');
+    if (!resiliencia) return;
+
+    const disjuntores = Object.values(resiliencia.disjuntores || {});
+    const aberto = disjuntores.find(d => d.estado !== 'fechado');
+    const falhas = disjuntores.reduce((total, d) => total + d.falhas_consecutivas, 0);
+
+    card.classList.remove('success', 'accent', 'alert');
+    if (aberto) {
+        card.classList.add('alert');
+        value.textContent = aberto.aberto_ate
+            ? `Circuito aberto até ${aberto.aberto_ate}`
+            : 'Testando conexão...';
+        value.title = aberto.ultimo_erro || '';
+    } else if (falhas > 0) {
+        card.classList.add('accent');
+        value.textContent = `${falhas} falha(s) - nova tentativa ${resiliencia.proxima_tentativa || ''}`;
+        value.title = disjuntores.map(d => d.ultimo_erro).filter(Boolean).join('\n');
+    } else {
+        card.classList.add('success');
+        value.textContent = disjuntores.length ? 'Normal' : '-';
+        value.title = '';
+    }
+}
+
 // Update logs
 async function updateLogs() {
     try {
@@ -300,13 +331,29 @@ async function updateActivityFeed() {
                    </div>`
                 : '';
 
+            // Anexos novos (+), removidos (-) e com arquivo alterado (~)
+            const anexos = atividade.anexos || {};
+            const anexosItens = [['+', 'adicionados'], ['-', 'removidos'], ['~', 'alterados']]
+                .flatMap(([sinal, chave]) => (anexos[chave] || []).map(anexo =>
+                    `<li>${sinal} <a href="${escapeHtml(anexo.url)}" target="_blank" rel="noopener">${escapeHtml(anexo.texto || anexo.url)}</a>` +
+                    ((anexo.palavras_encontradas || []).length > 0
+                        ? ` <span class="activity-anexo-palavras">${anexo.palavras_encontradas.map(escapeHtml).join(', ')}</span>`
+                        : '') + `</li>`));
+            const anexosHtml = anexosItens.length > 0
+                ? `<ul class="activity-anexos">${anexosItens.join('')}</ul>`
+                : '';
+
             html += `
                 <div class="activity-item">
                     <div class="activity-content">
                         <div class="activity-header">
                             <span class="activity-time">${atividade.timestamp}</span>
+                            ${atividade.similaridade !== undefined
+                                ? `<span class="activity-similaridade" title="Similaridade com a versão anterior (SimHash)">${(atividade.similaridade * 100).toFixed(1)}% igual</span>`
+                                : ''}
                         </div>
                         ${palavrasHtml}
+                        ${anexosHtml}
                     </div>
                 </div>
             `;